@@ -1,12 +1,33 @@
 """Cross Word Generator Package
 
 This package provides functionality to generate crossword puzzles.
+
+Public names are imported on first access, so command line clients (see
+cross_word.client) start without loading the layout engine.
 """
 
-from .cross_words import build_grid
-from .utils import render_grid
+from importlib import import_module
+
+_EXPORTS = {
+    "CacheStats": ".cache",
+    "DenseGrid": ".dense_grid",
+    "LayoutCache": ".cache",
+    "build_grid": ".cross_words",
+    "build_grids": ".cross_words",
+    "render_grid": ".utils",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = [
-    "build_grid",
-    "render_grid",
-]
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_EXPORTS])
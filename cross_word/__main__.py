@@ -1,5 +1,36 @@
-from cross_word.cross_words import build_grid
-from cross_word.utils import render_grid
+import json
+import sys
+from collections.abc import Iterator
+from itertools import tee
+from typing import TYPE_CHECKING, NamedTuple, TextIO
+
+from cross_word.client import MAX_FRAME_SIZE, DaemonError, connect_daemon
+
+# The layout engine is imported where it is used, so that --phrase answered by
+# a running daemon does not pay for loading it
+if TYPE_CHECKING:
+    from cross_word.cross_words import Layout
+
+EXAMPLES = [
+    "Циферки — самое важное",
+    "Я крайне разочарован",
+    "Живи здесь сейчас",
+    "Лови момент жизни",
+    "Истина где-то между строк отчета",
+    "Развлекаюсь, наблюдая за хаосом",
+    "Мой сарказм — щит от реальности",
+    "ааааа ббвбд гвггг зздзз",
+    "Оптимизм давно вышел в отпуск",
+    "Смех — мой скрытый протест",
+    "Смешно? А мне нет",
+    "Смешно тебе? А мне нет",
+    "Смешно? Только если плакать",
+    "Время лечит, но редко",
+    "Смысл потерян в деталях",
+    "Люди с голубыми глазами видят лучше слепых",
+    "Эйнштейн не мог говорить до рождения",
+    "Лошадь может дожить до конца своей жизни",
+]
 
 
 def construct_parser(num_of_examples: int):
@@ -20,17 +51,71 @@ def construct_parser(num_of_examples: int):
         action="store_true",
         help="Do not run generator, just print phrase",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes used with --all and --input (0 means one per CPU)",
+    )
+    parser.add_argument(
+        "-i",
+        "--input",
+        nargs="?",
+        const="-",
+        help="Stream phrases line by line from a file (stdin if omitted or '-')",
+    )
+    parser.add_argument(
+        "--input-format",
+        choices=["text", "jsonl"],
+        default="text",
+        help='Format of --input lines: plain phrases or {"id": ..., "phrase": ...} objects',
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=["text", "json"],
+        default="text",
+        help="Format of --input results: rendered grids or one JSON record per line",
+    )
+    parser.add_argument(
+        "-S",
+        "--socket",
+        help="Socket of the daemon laying out --phrase (default: $CROSS_WORD_SOCKET, "
+        "$XDG_RUNTIME_DIR/cross_word.sock or /tmp/cross_word-UID/cross_word.sock)",
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Lay out --phrase in this process even if a daemon is running",
+    )
+    parser.add_argument(
+        "--flush-every",
+        type=int,
+        default=100,
+        help="Flush the output after this many --input results",
+    )
 
     def parse_args():
         args = parser.parse_args()
         provided_args = sum(
-            [args.all, args.position is not None, args.phrase is not None]
+            [
+                args.all,
+                args.position is not None,
+                args.phrase is not None,
+                args.input is not None,
+            ]
         )
 
         if provided_args != 1:
             parser.error(
-                "Exactly one of --all, position or --phrase [PHRASE] must be provided"
+                "Exactly one of --all, position, --phrase [PHRASE] or --input [FILE] must be provided"
             )
+        if args.jobs < 0:
+            parser.error("--jobs must not be negative")
+        if args.flush_every < 1:
+            parser.error("--flush-every must be positive")
+        if args.dry and args.input is not None:
+            parser.error("--dry cannot be used with --input")
 
         return args
 
@@ -38,6 +123,9 @@ def construct_parser(num_of_examples: int):
 
 
 def run_on_string(phrase: str, dry: bool):
+    from cross_word.cross_words import build_grid
+    from cross_word.utils import render_grid
+
     print(f"Phrase: {phrase}")
 
     if not dry:
@@ -47,34 +135,167 @@ def run_on_string(phrase: str, dry: bool):
     print("---")
 
 
-if __name__ == "__main__":
-    examples = [
-        "Циферки — самое важное",
-        "Я крайне разочарован",
-        "Живи здесь сейчас",
-        "Лови момент жизни",
-        "Истина где-то между строк отчета",
-        "Развлекаюсь, наблюдая за хаосом",
-        "Мой сарказм — щит от реальности",
-        "ааааа ббвбд гвггг зздзз",
-        "Оптимизм давно вышел в отпуск",
-        "Смех — мой скрытый протест",
-        "Смешно? А мне нет",
-        "Смешно тебе? А мне нет",
-        "Смешно? Только если плакать",
-        "Время лечит, но редко",
-        "Смысл потерян в деталях",
-        "Люди с голубыми глазами видят лучше слепых",
-        "Эйнштейн не мог говорить до рождения",
-        "Лошадь может дожить до конца своей жизни",
-    ]
+def run_on_daemon(phrase: str, socket_path: str | None = None) -> bool:
+    """
+    Print the result for a phrase laid out by a running daemon.
+
+    Returns:
+        False, without printing, if the daemon cannot lay out the phrase: none
+        listens on the socket, the phrase does not fit in a request, or the
+        daemon fails, hangs or closes the connection
+    """
+    if len(phrase.encode("utf-8")) > MAX_FRAME_SIZE:
+        return False
+
+    client = connect_daemon(socket_path)
+    if client is None:
+        return False
+
+    try:
+        with client:
+            rendered = client.render(phrase)
+    except (OSError, ValueError, DaemonError):
+        return False
+
+    print(f"Phrase: {phrase}")
+    print(rendered)
+    print("---")
+    return True
+
+
+def print_result(phrase: str, result: "Layout | Exception", file: TextIO | None = None):
+    from cross_word.utils import write_grid
+
+    print(f"Phrase: {phrase}", file=file)
+
+    if isinstance(result, Exception):
+        print(f"Error: {result!r}", file=file)
+    else:
+        write_grid(result[0], file or sys.stdout)
+        print(file=file)
+
+    print("---", file=file)
+
 
+class InputRecord(NamedTuple):
+    """
+    Phrase read from an --input line.
+
+    Attributes:
+        id: Record id, the line number unless given by a JSONL record
+        phrase: Phrase to lay out, the raw line if it is malformed
+        error: Why the line could not be read, None for valid lines
+    """
+
+    id: object
+    phrase: str
+    error: ValueError | None = None
+
+
+def read_phrases(stream: TextIO, input_format: str) -> Iterator[InputRecord]:
+    """
+    Yield records from text or JSONL lines, skipping blank lines.
+
+    Malformed JSONL lines are yielded with an error instead of stopping the
+    whole input.
+    """
+    for line_number, line in enumerate(stream, 1):
+        line = line.rstrip("\r\n")
+        if not line.strip():
+            continue
+
+        if input_format == "text":
+            yield InputRecord(line_number, line)
+            continue
+
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as error:
+            yield InputRecord(
+                line_number,
+                line,
+                ValueError(f"Line {line_number}: invalid JSON ({error})"),
+            )
+            continue
+
+        if isinstance(record, str):
+            yield InputRecord(line_number, record)
+        elif isinstance(record, dict) and isinstance(record.get("phrase"), str):
+            yield InputRecord(record.get("id", line_number), record["phrase"])
+        else:
+            yield InputRecord(
+                line_number,
+                line,
+                ValueError(
+                    f'Line {line_number}: expected a string or {{"phrase": ...}}'
+                ),
+            )
+
+
+def format_json_record(
+    record_id: object, phrase: str, result: "Layout | Exception"
+) -> str:
+    from cross_word.utils import render_grid
+
+    record = {"id": record_id, "phrase": phrase}
+
+    if isinstance(result, Exception):
+        record["error"] = repr(result)
+    else:
+        grid = result[0]
+        record["cells"] = [
+            [row, col, character] for (row, col), character in grid.items()
+        ]
+        record["rendered"] = render_grid(grid)
+
+    return json.dumps(record, ensure_ascii=False)
+
+
+def stream_phrases(
+    stream: TextIO,
+    out: TextIO,
+    input_format: str = "text",
+    output_format: str = "text",
+    jobs: int | None = 1,
+    flush_every: int = 100,
+):
+    """
+    Lay out phrases read line by line and write each result as soon as it is ready.
+
+    Only the phrases in flight are kept in memory, so arbitrarily long inputs
+    can be piped through a single process.
+    """
+    from cross_word.cross_words import iter_build_grids
+
+    records, valid_records = tee(read_phrases(stream, input_format))
+    results = iter_build_grids(
+        (record.phrase for record in valid_records if record.error is None),
+        jobs=jobs,
+    )
+
+    for count, (record_id, phrase, error) in enumerate(records, 1):
+        result = error if error is not None else next(results)
+        if output_format == "json":
+            out.write(format_json_record(record_id, phrase, result) + "\n")
+        else:
+            out.write(f"{record_id}: ")
+            print_result(phrase, result, file=out)
+
+        if count % flush_every == 0:
+            out.flush()
+
+    out.flush()
+
+
+if __name__ == "__main__":
+    examples = EXAMPLES
     examples_count = len(examples)
     parse = construct_parser(examples_count)
     args = parse()
 
     if args.phrase:
-        run_on_string(args.phrase, args.dry)
+        if args.dry or args.no_daemon or not run_on_daemon(args.phrase, args.socket):
+            run_on_string(args.phrase, args.dry)
 
     elif args.position is not None:
         error_to_raise = IndexError(
@@ -91,7 +312,29 @@ if __name__ == "__main__":
         except IndexError:
             raise error_to_raise
 
-    elif args.all:
+    elif args.input is not None:
+        input_stream = (
+            sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+        )
+        with input_stream:
+            stream_phrases(
+                input_stream,
+                sys.stdout,
+                args.input_format,
+                args.output_format,
+                args.jobs or None,
+                args.flush_every,
+            )
+
+    elif args.all and args.dry:
         for index, ph in enumerate(examples):
             print(f"{index+1}:", end=" ")
             run_on_string(ph, args.dry)
+
+    elif args.all:
+        from cross_word.cross_words import build_grids
+
+        results = build_grids(examples, jobs=args.jobs or None)
+        for index, (ph, result) in enumerate(zip(examples, results)):
+            print(f"{index+1}:", end=" ")
+            print_result(ph, result)
@@ -0,0 +1,169 @@
+"""Batch export of grids to NumPy arrays.
+
+Needs the optional numpy dependency:
+
+    pip install "cross-word[numpy]"
+
+Many grids are packed into one zero-padded array of alphabet codes, with a
+table of grid origins and shapes:
+
+    batch = export_grids(build_grids(phrases))
+    batch.codes[i, :rows, :cols]   # grid i, rows, cols = batch.shapes[i]
+
+Cells are gathered with C-level iteration and scattered into the array with a
+single fancy-indexing assignment, so no Python code runs per cell.
+"""
+
+from collections.abc import Iterable, Sequence
+from itertools import chain
+from typing import TYPE_CHECKING, NamedTuple
+
+from cross_word.cross_words import Layout
+from cross_word.utils import Grid
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "Array export requires numpy, "
+            'install it with pip install "cross-word[numpy]"'
+        ) from None
+    return numpy
+
+
+class GridBatch(NamedTuple):
+    """Grids exported as one padded array of alphabet codes."""
+
+    # (grids, rows, columns) alphabet codes, 0 marks an empty cell
+    codes: "np.ndarray"
+    # (grids, 2) grid coordinates of the top left cell of every grid
+    origins: "np.ndarray"
+    # (grids, 2) rows and columns of every grid, (0, 0) for empty grids
+    shapes: "np.ndarray"
+    # Character of every code, alphabet[0] is "" for empty cells
+    alphabet: tuple[str, ...]
+
+
+def _encode_characters(
+    np, codepoints: "np.ndarray", alphabet: Sequence[str] | None
+) -> tuple["np.ndarray", tuple[str, ...]]:
+    """Map code points to alphabet codes, building the alphabet if not given."""
+    if alphabet is None:
+        unique, inverse = np.unique(codepoints, return_inverse=True)
+        return inverse.reshape(-1) + 1, ("", *map(chr, unique.tolist()))
+
+    alphabet = tuple(alphabet)
+    if not alphabet or alphabet[0] != "":
+        raise ValueError('alphabet[0] must be "" (the empty cell)')
+    if len(codepoints) and len(alphabet) == 1:
+        raise ValueError("Alphabet has no characters")
+
+    table = np.array([ord(character) for character in alphabet[1:]], dtype=np.uint32)
+    order = np.argsort(table)
+    sorted_table = table[order]
+    positions = np.minimum(
+        np.searchsorted(sorted_table, codepoints), max(len(table) - 1, 0)
+    )
+    missing = sorted_table[positions] != codepoints if len(codepoints) else []
+    if np.any(missing):
+        character = chr(int(codepoints[np.argmax(missing)]))
+        raise ValueError(f"Character {character!r} is not in the alphabet")
+    return order[positions] + 1, alphabet
+
+
+def export_grids(
+    grids: Iterable[Grid | Layout], alphabet: Sequence[str] | None = None
+) -> GridBatch:
+    """
+    Export grids into one padded NumPy array of alphabet codes.
+
+    Args:
+        grids: Grids, or (merged_grid, individual_blocks) tuples as returned
+            by build_grid and build_grids. Cells must hold single characters
+        alphabet: Characters of the codes, with alphabet[0] == "". Built from
+            the characters of the grids (sorted by code point) if omitted;
+            pass the alphabet of a previous batch to keep codes consistent
+            across batches
+
+    Returns:
+        Exported batch
+
+    Raises:
+        ValueError: If a cell does not hold a single character, or holds one
+            missing from the given alphabet
+    """
+    np = _import_numpy()
+
+    grids = [grid[0] if isinstance(grid, tuple) else grid for grid in grids]
+    count = len(grids)
+    sizes = np.fromiter(map(len, grids), dtype=np.int64, count=count)
+    total = int(sizes.sum())
+
+    # Flattened (row, column) pairs and characters of every cell, grid by grid
+    coordinates = np.fromiter(
+        chain.from_iterable(chain.from_iterable(grids)),
+        dtype=np.int64,
+        count=2 * total,
+    ).reshape(total, 2)
+    text = "".join(chain.from_iterable(grid.values() for grid in grids))
+    if len(text) != total:
+        raise ValueError("Grid cells must hold single characters")
+    codepoints = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+    cell_codes, alphabet = _encode_characters(np, codepoints, alphabet)
+
+    origins = np.zeros((count, 2), dtype=np.int64)
+    shapes = np.zeros((count, 2), dtype=np.int64)
+    if total:
+        occupied = sizes > 0
+        # Cells of empty grids are absent, so every segment is one grid
+        starts = (np.cumsum(sizes) - sizes)[occupied]
+        origins[occupied] = np.minimum.reduceat(coordinates, starts, axis=0)
+        shapes[occupied] = (
+            np.maximum.reduceat(coordinates, starts, axis=0) - origins[occupied] + 1
+        )
+
+    height, width = shapes.max(axis=0, initial=0)
+    dtype = np.uint16 if len(alphabet) <= 0x10000 else np.uint32
+    codes = np.zeros((count, height, width), dtype=dtype)
+
+    grid_indices = np.repeat(np.arange(count), sizes)
+    local = coordinates - origins[grid_indices]
+    codes[grid_indices, local[:, 0], local[:, 1]] = cell_codes
+
+    return GridBatch(codes, origins, shapes, alphabet)
+
+
+def import_grids(batch: GridBatch) -> list[Grid]:
+    """
+    Convert an exported batch back to grids.
+
+    Cells of every grid are in row-major order, which may differ from the
+    insertion order of the exported grids.
+
+    Args:
+        batch: Batch returned by export_grids
+
+    Returns:
+        List of grids, one per exported grid
+    """
+    np = _import_numpy()
+
+    grid_indices, rows, cols = np.nonzero(batch.codes)
+    characters = np.array(batch.alphabet, dtype=object)[
+        batch.codes[grid_indices, rows, cols]
+    ]
+    rows = (rows + batch.origins[grid_indices, 0]).tolist()
+    cols = (cols + batch.origins[grid_indices, 1]).tolist()
+    characters = characters.tolist()
+
+    bounds = np.searchsorted(grid_indices, np.arange(len(batch.codes) + 1)).tolist()
+    return [
+        dict(zip(zip(rows[start:end], cols[start:end]), characters[start:end]))
+        for start, end in zip(bounds, bounds[1:])
+    ]
@@ -0,0 +1,257 @@
+"""Benchmarks for the layout pipeline.
+
+Times every stage of the pipeline on the CLI examples and on synthetic corpora
+of growing size, saves the samples as JSON and compares them with a stored
+baseline:
+
+    python -m cross_word.bench --output bench.json
+    python -m cross_word.bench --baseline bench.json
+"""
+
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+from collections.abc import Callable
+from time import perf_counter
+from typing import NamedTuple
+
+from cross_word.__main__ import EXAMPLES
+from cross_word.cross_words import (
+    build_block_at,
+    build_grid,
+    merge_blocks,
+)
+from cross_word.utils import render_grid, tokenize_with_end_punct
+
+BENCH_FORMAT_VERSION = 1
+
+# Welch t statistic above which a slowdown is considered significant
+SIGNIFICANCE_T = 3.0
+
+SYNTHETIC_ALPHABET = "АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ"
+SYNTHETIC_PUNCTUATION = [",", "—", ".", "!", "?", ";", ":"]
+
+
+class Comparison(NamedTuple):
+    """Result of comparing one benchmark against the baseline."""
+
+    name: str
+    baseline_mean: float
+    current_mean: float
+    ratio: float
+    t_statistic: float
+    regression: bool
+
+
+def synthetic_corpus(size: int, seed: int = 0) -> list[str]:
+    """Generate reproducible random phrases of 2-12 words with punctuation."""
+    rng = random.Random(seed)
+    phrases = []
+
+    for _ in range(size):
+        words = []
+        for _ in range(rng.randint(2, 12)):
+            length = rng.randint(1, 10)
+            words.append("".join(rng.choices(SYNTHETIC_ALPHABET, k=length)))
+            if rng.random() < 0.15:
+                words.append(rng.choice(SYNTHETIC_PUNCTUATION))
+        phrases.append(" ".join(words))
+
+    return phrases
+
+
+def build_all_blocks(tokens: list[str]) -> list:
+    """Split tokens into blocks with build_block_at."""
+    blocks = []
+    index = 0
+    while index < len(tokens):
+        block, index = build_block_at(tokens, index)
+        blocks.append(block)
+    return blocks
+
+
+def pipeline_benchmarks(phrases: list[str]) -> dict[str, Callable[[], object]]:
+    """Create one callable per pipeline stage, each processing the whole corpus."""
+    tokens = [tokenize_with_end_punct(phrase) for phrase in phrases]
+    blocks = [build_all_blocks(phrase_tokens) for phrase_tokens in tokens]
+    grids = [merge_blocks(phrase_blocks) for phrase_blocks in blocks]
+
+    return {
+        "tokenize_with_end_punct": lambda: [
+            tokenize_with_end_punct(phrase) for phrase in phrases
+        ],
+        "build_single_block": lambda: [
+            build_all_blocks(phrase_tokens) for phrase_tokens in tokens
+        ],
+        "merge_blocks": lambda: [
+            merge_blocks(phrase_blocks) for phrase_blocks in blocks
+        ],
+        "render_grid": lambda: [render_grid(grid) for grid in grids],
+        "build_grid": lambda: [build_grid(phrase) for phrase in phrases],
+    }
+
+
+def time_callable(function: Callable[[], object], repeat: int) -> list[float]:
+    """Run function once to warm up, then return repeat wall-clock samples."""
+    function()
+    samples = []
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        samples.append(perf_counter() - start)
+    return samples
+
+
+def run_benchmarks(sizes: list[int], repeat: int = 7) -> dict:
+    """
+    Run all pipeline benchmarks.
+
+    Args:
+        sizes: Sizes of the synthetic corpora
+        repeat: Number of timed samples per benchmark
+
+    Returns:
+        JSON serializable report with samples per "corpus/stage" benchmark
+    """
+    corpora = {"examples": EXAMPLES}
+    corpora.update({f"synthetic-{size}": synthetic_corpus(size) for size in sizes})
+
+    results = {}
+    for corpus_name, phrases in corpora.items():
+        for stage, function in pipeline_benchmarks(phrases).items():
+            results[f"{corpus_name}/{stage}"] = {
+                "phrases": len(phrases),
+                "samples": time_callable(function, repeat),
+            }
+
+    return {
+        "version": BENCH_FORMAT_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def welch_t_statistic(baseline: list[float], current: list[float]) -> float:
+    """Welch t statistic of current vs baseline means (positive when slower)."""
+    if len(baseline) < 2 or len(current) < 2:
+        return 0.0
+
+    variance = statistics.variance(baseline) / len(baseline) + statistics.variance(
+        current
+    ) / len(current)
+    difference = statistics.fmean(current) - statistics.fmean(baseline)
+
+    if variance == 0:
+        return math.copysign(math.inf, difference) if difference else 0.0
+    return difference / math.sqrt(variance)
+
+
+def compare_reports(
+    baseline: dict, current: dict, threshold: float = 0.1
+) -> list[Comparison]:
+    """
+    Compare benchmarks present in both reports.
+
+    A benchmark is flagged as a regression when it is more than threshold
+    slower on average and the slowdown is significant (Welch t statistic
+    above SIGNIFICANCE_T).
+    """
+    if baseline.get("version") != BENCH_FORMAT_VERSION:
+        raise ValueError(f"Unsupported baseline version {baseline.get('version')!r}")
+
+    comparisons = []
+    for name, result in current["results"].items():
+        base_result = baseline["results"].get(name)
+        if base_result is None:
+            continue
+
+        base_samples, samples = base_result["samples"], result["samples"]
+        base_mean, mean = statistics.fmean(base_samples), statistics.fmean(samples)
+        ratio = mean / base_mean if base_mean else math.inf
+        t_statistic = welch_t_statistic(base_samples, samples)
+
+        comparisons.append(
+            Comparison(
+                name,
+                base_mean,
+                mean,
+                ratio,
+                t_statistic,
+                ratio > 1 + threshold and t_statistic > SIGNIFICANCE_T,
+            )
+        )
+
+    return comparisons
+
+
+def format_report(report: dict) -> str:
+    lines = [f"{'benchmark':<45} {'phrases':>8} {'median, ms':>12} {'us/phrase':>10}"]
+    for name, result in report["results"].items():
+        median = statistics.median(result["samples"])
+        per_phrase = median / result["phrases"] * 1e6
+        lines.append(
+            f"{name:<45} {result['phrases']:>8} {median * 1e3:>12.3f} {per_phrase:>10.2f}"
+        )
+    return "\n".join(lines)
+
+
+def format_comparisons(comparisons: list[Comparison]) -> str:
+    lines = [f"{'benchmark':<45} {'ratio':>7} {'t':>8}"]
+    for comparison in comparisons:
+        marker = "  REGRESSION" if comparison.regression else ""
+        lines.append(
+            f"{comparison.name:<45} {comparison.ratio:>7.3f} "
+            f"{comparison.t_statistic:>8.2f}{marker}"
+        )
+    return "\n".join(lines)
+
+
+def construct_parser():
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser("cross_word.bench")
+    parser.add_argument(
+        "-s",
+        "--sizes",
+        type=int,
+        nargs="*",
+        default=[100, 1000, 5000],
+        help="Sizes of the synthetic corpora",
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=7, help="Timed samples per benchmark"
+    )
+    parser.add_argument("-o", "--output", help="Save results as JSON to this file")
+    parser.add_argument("-b", "--baseline", help="Compare results with this JSON file")
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative slowdown tolerated before flagging a regression",
+    )
+    return parser
+
+
+if __name__ == "__main__":
+    args = construct_parser().parse_args()
+    report = run_benchmarks(args.sizes, args.repeat)
+    print(format_report(report))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        comparisons = compare_reports(baseline, report, args.threshold)
+        print()
+        print(format_comparisons(comparisons))
+        if any(comparison.regression for comparison in comparisons):
+            sys.exit(1)
@@ -0,0 +1,113 @@
+import copy
+from collections import OrderedDict
+from threading import Lock
+from typing import NamedTuple
+
+from cross_word.cross_words import Layout, build_grid_from_tokens
+from cross_word.placement import CompactLayout
+from cross_word.utils import TokenList, tokenize_with_end_punct
+
+
+class CacheStats(NamedTuple):
+    """Snapshot of LayoutCache counters."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+
+def copy_layout(layout: Layout) -> Layout:
+    """Copy a (merged_grid, individual_blocks) tuple so it can be mutated safely."""
+    grid, blocks = layout
+    return copy.copy(grid), [copy.copy(block) for block in blocks]
+
+
+class LayoutCache:
+    """
+    Size-bounded LRU cache of build_grid results.
+
+    Entries are keyed on the tokens produced by tokenize_with_end_punct, so
+    phrases differing only in case or whitespace share one entry. Results are
+    copied on the way in and out, callers may freely mutate what they get.
+
+    With compact=True entries are stored as CompactLayout, an order of
+    magnitude smaller, and unpacked (blocks re-merged) on every hit.
+
+    Thread-safe; a layout missing from the cache may be computed by several
+    threads at once, the last one stored wins.
+    """
+
+    def __init__(self, maxsize: int = 1024, compact: bool = False):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+
+        self.maxsize = maxsize
+        self.compact = compact
+        self._entries: OrderedDict[tuple[str, ...], Layout | CompactLayout] = (
+            OrderedDict()
+        )
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def build_grid(self, phrase: str) -> Layout:
+        """Cached equivalent of cross_words.build_grid."""
+        return self.build_grid_from_tokens(tokenize_with_end_punct(phrase))
+
+    def build_grid_from_tokens(self, tokens: TokenList) -> Layout:
+        """Cached equivalent of cross_words.build_grid_from_tokens."""
+        key = tuple(tokens)
+
+        with self._lock:
+            layout = self._entries.get(key)
+            if layout is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+            else:
+                self._misses += 1
+
+        if layout is not None:
+            if isinstance(layout, CompactLayout):
+                return layout.to_layout()
+            return copy_layout(layout)
+
+        layout = build_grid_from_tokens(list(tokens))
+        stored = CompactLayout(layout) if self.compact else copy_layout(layout)
+
+        with self._lock:
+            self._entries[key] = stored
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+        return layout
+
+    @property
+    def stats(self) -> CacheStats:
+        """Current hit/miss/eviction counters."""
+        with self._lock:
+            return CacheStats(
+                self._hits,
+                self._misses,
+                self._evictions,
+                len(self._entries),
+                self.maxsize,
+            )
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, phrase: object) -> bool:
+        if not isinstance(phrase, str):
+            return False
+        return tuple(tokenize_with_end_punct(phrase)) in self._entries
@@ -0,0 +1,138 @@
+"""Client of the layout daemon (see cross_word.daemon).
+
+Only imports the standard library modules it needs, so short-lived processes
+can hand phrases to a warm daemon without loading the layout engine.
+
+Protocol: every message is a frame, a 4-byte big-endian payload length
+followed by the payload. A request payload is a UTF-8 phrase. A response
+payload is a status byte (STATUS_OK or STATUS_ERROR) followed by the UTF-8
+rendered grid or error message. Requests are limited to MAX_FRAME_SIZE bytes,
+responses to MAX_RESPONSE_SIZE. A connection carries any number of requests,
+answered in order.
+"""
+
+import os
+import socket
+import struct
+
+FRAME_HEADER = struct.Struct(">I")
+MAX_FRAME_SIZE = 64 * 1024
+MAX_RESPONSE_SIZE = 16 * 1024 * 1024
+SOCKET_NAME = "cross_word.sock"
+DEFAULT_TIMEOUT = 10.0
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+
+class DaemonError(Exception):
+    """Raised when the daemon fails to lay out a phrase."""
+
+
+def default_socket_path() -> str:
+    """
+    Get the daemon socket path.
+
+    Taken from CROSS_WORD_SOCKET if set, otherwise the socket lives in
+    $XDG_RUNTIME_DIR, or in /tmp/cross_word-UID, a directory the daemon
+    creates with mode 0700.
+    """
+    path = os.environ.get("CROSS_WORD_SOCKET")
+    if path:
+        return path
+    directory = os.environ.get("XDG_RUNTIME_DIR") or f"/tmp/cross_word-{os.getuid()}"
+    return os.path.join(directory, SOCKET_NAME)
+
+
+def encode_frame(payload: bytes, max_size: int = MAX_FRAME_SIZE) -> bytes:
+    if len(payload) > max_size:
+        raise ValueError(f"Frame of {len(payload)} bytes exceeds {max_size}")
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+class DaemonClient:
+    """
+    Blocking connection to a layout daemon.
+
+    Args:
+        path: Socket path of the daemon (default_socket_path() if omitted)
+        timeout: Socket timeout in seconds, None blocks indefinitely
+
+    Raises:
+        PermissionError: If the socket belongs to another user
+        OSError: If no daemon listens on the socket
+    """
+
+    def __init__(
+        self, path: str | None = None, timeout: float | None = DEFAULT_TIMEOUT
+    ):
+        path = path or default_socket_path()
+        # Another user could listen on a path picked in a shared directory
+        if os.stat(path).st_uid != os.getuid():
+            raise PermissionError(f"{path} belongs to another user")
+
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        try:
+            self._socket.connect(path)
+        except OSError:
+            self._socket.close()
+            raise
+        self._file = self._socket.makefile("rb")
+
+    def render(self, phrase: str) -> str:
+        """
+        Lay out a phrase in the daemon.
+
+        Returns:
+            Rendered grid, as render_grid returns it
+
+        Raises:
+            ValueError: If the phrase exceeds MAX_FRAME_SIZE bytes
+            DaemonError: If the daemon could not lay out the phrase
+            ConnectionError: If the daemon closed the connection or sent an
+                invalid response
+            TimeoutError: If the daemon did not answer within the timeout
+        """
+        self._socket.sendall(encode_frame(phrase.encode("utf-8")))
+
+        header = self._file.read(FRAME_HEADER.size)
+        if len(header) < FRAME_HEADER.size:
+            raise ConnectionError("Daemon closed the connection")
+        (length,) = FRAME_HEADER.unpack(header)
+        if length > MAX_RESPONSE_SIZE:
+            raise ConnectionError(f"Response of {length} bytes is too large")
+        payload = self._file.read(length)
+        if len(payload) < length or not length:
+            raise ConnectionError("Daemon closed the connection")
+
+        text = payload[1:].decode("utf-8")
+        if payload[0] != STATUS_OK:
+            raise DaemonError(text)
+        return text
+
+    def close(self) -> None:
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self) -> "DaemonClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def connect_daemon(
+    path: str | None = None, timeout: float | None = DEFAULT_TIMEOUT
+) -> DaemonClient | None:
+    """
+    Connect to a running daemon.
+
+    Returns:
+        Connected client, or None if no daemon of the current user can be
+        reached on the socket
+    """
+    try:
+        return DaemonClient(path, timeout)
+    except OSError:
+        return None
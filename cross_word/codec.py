@@ -0,0 +1,216 @@
+"""Compact binary encoding of grids and build_grid results.
+
+Layout of an encoded payload:
+
+    magic "CWG" | format version (1 byte) | kind (1 byte) | body
+
+A grid body is a character table followed by the cells in iteration order:
+
+    varint table size, (varint UTF-8 length, UTF-8 bytes) per character
+    zigzag varint min row, zigzag varint min column
+    varint cell count, (varint row, varint column, varint character index)
+        per cell, coordinates relative to the minimums
+
+A layout body is the merged grid body, a varint block count and the body of
+every block. Cell order is preserved, as block placement depends on it.
+"""
+
+from cross_word.cross_words import Layout
+from cross_word.utils import Grid
+
+MAGIC = b"CWG"
+FORMAT_VERSION = 1
+
+KIND_GRID = 0
+KIND_LAYOUT = 1
+
+HEADER_SIZE = len(MAGIC) + 2
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    """Append a non-negative integer as LEB128 varint."""
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(view: memoryview, position: int) -> tuple[int, int]:
+    """Read a LEB128 varint, returning (value, next_position)."""
+    value = shift = 0
+    while True:
+        byte = view[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def _zigzag(value: int) -> int:
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def _write_grid_body(out: bytearray, grid: Grid) -> None:
+    table: dict[str, int] = {}
+    for character in grid.values():
+        table.setdefault(character, len(table))
+
+    _write_varint(out, len(table))
+    for character in table:
+        encoded = character.encode("utf-8")
+        _write_varint(out, len(encoded))
+        out += encoded
+
+    min_row = min((r for (r, c) in grid), default=0)
+    min_col = min((c for (r, c) in grid), default=0)
+    _write_varint(out, _zigzag(min_row))
+    _write_varint(out, _zigzag(min_col))
+
+    _write_varint(out, len(grid))
+    for (row, col), character in grid.items():
+        _write_varint(out, row - min_row)
+        _write_varint(out, col - min_col)
+        _write_varint(out, table[character])
+
+
+def _read_grid_body(view: memoryview, position: int) -> tuple[Grid, int]:
+    table_size, position = _read_varint(view, position)
+    table = []
+    for _ in range(table_size):
+        length, position = _read_varint(view, position)
+        table.append(str(view[position : position + length], "utf-8"))
+        position += length
+
+    min_row, position = _read_varint(view, position)
+    min_col, position = _read_varint(view, position)
+    min_row, min_col = _unzigzag(min_row), _unzigzag(min_col)
+
+    cell_count, position = _read_varint(view, position)
+
+    # Grids narrower than 128 cells and with fewer than 128 distinct
+    # characters encode every cell in three single byte varints, read in
+    # bulk through strided views of the payload
+    cells = view[position : position + 3 * cell_count]
+    if len(cells) == 3 * cell_count and (not cells or max(cells) < 0x80):
+        grid = {
+            (row + min_row, col + min_col): table[index]
+            for row, col, index in zip(cells[0::3], cells[1::3], cells[2::3])
+        }
+        return grid, position + len(cells)
+
+    # Otherwise read the varints one by one, single byte ones without a call
+    values = []
+    for _ in range(3 * cell_count):
+        byte = view[position]
+        if byte < 0x80:
+            values.append(byte)
+            position += 1
+        else:
+            value, position = _read_varint(view, position)
+            values.append(value)
+
+    grid = {
+        (row + min_row, col + min_col): table[index]
+        for row, col, index in zip(values[0::3], values[1::3], values[2::3])
+    }
+    return grid, position
+
+
+def _header(kind: int) -> bytearray:
+    return bytearray(MAGIC + bytes((FORMAT_VERSION, kind)))
+
+
+def _read_header(data: bytes | bytearray | memoryview, kind: int) -> memoryview:
+    view = memoryview(data).cast("B")
+    if bytes(view[: len(MAGIC)]) != MAGIC:
+        raise ValueError("Not an encoded cross word payload")
+    if len(view) < HEADER_SIZE:
+        raise ValueError("Truncated payload")
+    if view[len(MAGIC)] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported format version {view[len(MAGIC)]}")
+    if view[len(MAGIC) + 1] != kind:
+        raise ValueError(f"Expected payload kind {kind}, got {view[len(MAGIC) + 1]}")
+    return view
+
+
+def encode_grid(grid: Grid) -> bytes:
+    """
+    Encode a grid into the compact binary format.
+
+    Args:
+        grid: Grid to encode
+
+    Returns:
+        Encoded payload
+    """
+    out = _header(KIND_GRID)
+    _write_grid_body(out, grid)
+    return bytes(out)
+
+
+def decode_grid(data: bytes | bytearray | memoryview) -> Grid:
+    """
+    Decode a grid encoded by encode_grid.
+
+    The payload is read in place, a memoryview over a larger buffer (e.g.
+    shared memory or a mapped file) is not copied.
+
+    Args:
+        data: Encoded payload
+
+    Returns:
+        Decoded grid
+    """
+    view = _read_header(data, KIND_GRID)
+    try:
+        grid, _ = _read_grid_body(view, HEADER_SIZE)
+    except IndexError:
+        raise ValueError("Truncated payload") from None
+    return grid
+
+
+def encode_layout(layout: Layout) -> bytes:
+    """
+    Encode a (merged_grid, individual_blocks) tuple into the compact binary format.
+
+    Args:
+        layout: Result of build_grid
+
+    Returns:
+        Encoded payload
+    """
+    grid, blocks = layout
+    out = _header(KIND_LAYOUT)
+    _write_grid_body(out, grid)
+    _write_varint(out, len(blocks))
+    for block in blocks:
+        _write_grid_body(out, block)
+    return bytes(out)
+
+
+def decode_layout(data: bytes | bytearray | memoryview) -> Layout:
+    """
+    Decode a (merged_grid, individual_blocks) tuple encoded by encode_layout.
+
+    Args:
+        data: Encoded payload
+
+    Returns:
+        Tuple of (merged_grid, individual_blocks)
+    """
+    view = _read_header(data, KIND_LAYOUT)
+    try:
+        grid, position = _read_grid_body(view, HEADER_SIZE)
+        block_count, position = _read_varint(view, position)
+        blocks = []
+        for _ in range(block_count):
+            block, position = _read_grid_body(view, position)
+            blocks.append(block)
+    except IndexError:
+        raise ValueError("Truncated payload") from None
+    return grid, blocks
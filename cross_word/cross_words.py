@@ -1,5 +1,13 @@
-from itertools import groupby
-
+import os
+from bisect import bisect_left, bisect_right
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import batched, groupby, islice
+from time import perf_counter
+
+from cross_word import instrumentation
 from cross_word.utils import (
     DIRECTION_ACROSS,
     DIRECTION_DOWN,
@@ -13,16 +21,124 @@ from cross_word.utils import (
     tokenize_with_end_punct,
 )
 
+# Result of a single build_grid call: (merged_grid, individual_blocks)
+Layout = tuple[Grid, list[Grid]]
 
-def find_best_crossing_position(
+# Lays out tokens, like build_grid_from_tokens. Engines run in worker
+# processes, so they must be picklable (module level functions)
+Engine = Callable[[TokenList], Layout]
+
+# Bump whenever an engine lays out some phrase differently, invalidating
+# persisted layouts (see disk_cache)
+ENGINE_VERSION = 1
+
+
+class Block(dict[tuple[int, int], str]):
+    """
+    Crossword block: its cells plus metadata precomputed for merging.
+
+    Behaves exactly like the Grid it was built from. The metadata is computed
+    once on construction, call refresh() after modifying the cells.
+
+    Attributes:
+        min_row, max_row, min_col, max_col: Bounds of the cells
+        starts_with_word: Whether the first cell holds a word character
+        multi_cell_rows: Rows of runs of more than one consecutive cell (in
+            insertion order) on the same row, where punctuation is aligned
+    """
+
+    __slots__ = (
+        "min_row",
+        "max_row",
+        "min_col",
+        "max_col",
+        "starts_with_word",
+        "multi_cell_rows",
+    )
+
+    def __init__(self, cells: Grid | Iterable[tuple[tuple[int, int], str]] = ()):
+        super().__init__(cells)
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Recompute metadata from the cells."""
+        if not self:
+            self.min_row = self.max_row = self.min_col = self.max_col = 0
+            self.starts_with_word = False
+            self.multi_cell_rows = ()
+            return
+
+        rows = [r for (r, c) in self]
+        cols = [c for (r, c) in self]
+        self.min_row, self.max_row = min(rows), max(rows)
+        self.min_col, self.max_col = min(cols), max(cols)
+        self.starts_with_word = bool(is_word(get_first_dict_item(self)[1]))
+        self.multi_cell_rows = tuple(
+            row for row, run in groupby(rows) if len(list(run)) > 1
+        )
+
+    def describe(
+        self, vertical_word: str, across_words: list[tuple[int, int, str]]
+    ) -> None:
+        """
+        Set metadata from the words placed by build_block_at, without
+        scanning the cells.
+
+        Args:
+            vertical_word: Word placed down from (0, 0)
+            across_words: (row, column, word) of words placed across, in
+                placement order, each crossing the vertical word
+        """
+        last_row = len(vertical_word) - 1
+        self.min_row, self.max_row = 0, last_row
+        self.min_col = min((col for _, col, _ in across_words), default=0)
+        self.max_col = max(
+            (col + len(word) - 1 for _, col, word in across_words), default=0
+        )
+        self.starts_with_word = bool(is_word(vertical_word))
+
+        # Every across word adds its cells but the crossing one as a run on its
+        # row; the first non-empty run follows the last vertical cell directly
+        multi_cell_rows = []
+        previous_row = last_row
+        for row, _, word in across_words:
+            run = len(word) - 1
+            if not run:
+                continue
+            if row == previous_row:
+                run += 1
+            if run > 1:
+                multi_cell_rows.append(row)
+            previous_row = None
+        self.multi_cell_rows = tuple(multi_cell_rows)
+
+
+def as_block(grid: Grid) -> Block:
+    """Get block metadata for a grid, computing it unless it is already a Block."""
+    return grid if isinstance(grid, Block) else Block(grid)
+
+
+def build_letter_index(word: str) -> dict[str, list[int]]:
+    """Map every letter of a word to the sorted positions where it occurs."""
+    index: dict[str, list[int]] = {}
+    for position, character in enumerate(word):
+        index.setdefault(character, []).append(position)
+    return index
+
+
+def iter_crossing_positions(
     grid: Grid,
     word: str,
     vertical_coords: set[tuple[int, int]],
     vertical_length: int,
     current_row_ptr: int,
-) -> tuple[bool, int, int]:
+    letter_rows: dict[str, list[int]] | None = None,
+) -> Iterator[tuple[int, int]]:
     """
-    Find optimal position to place a word crossing the vertical word.
+    Yield every valid position for a word crossing the vertical word.
+
+    Only rows where the vertical word shares a letter with the word are
+    visited, in the same (row, column offset) order as a full scan would.
 
     Args:
         grid: Current grid state
@@ -30,68 +146,158 @@ def find_best_crossing_position(
         vertical_coords: Set of vertical word coordinates
         vertical_length: Length of vertical word
         current_row_ptr: Current row pointer
+        letter_rows: Letter index of the vertical word (see build_letter_index).
+            Built from the grid when not provided
 
-    Returns:
-        Tuple of (found_position, row, column)
+    Yields:
+        Tuples of (row, column), best position first
     """
+    if letter_rows is None:
+        letter_rows = build_letter_index(
+            "".join(grid[(row, 0)] for row in range(vertical_length))
+        )
+
+    if letter_rows.keys().isdisjoint(word):
+        return
+
     max_left_shift = len(word) // 2
+    first_row = max(current_row_ptr, 1)
+    candidates: list[tuple[int, int]] = []
 
-    for row in range(current_row_ptr, vertical_length):
-        if row == 0:
+    for character, offsets in build_letter_index(word).items():
+        rows = letter_rows.get(character)
+        if rows is None:
             continue
 
-        for col_offset, character in enumerate(word):
-            if character == grid[(row, 0)]:
-                start_col = -col_offset
-                if abs(start_col) > max_left_shift:
-                    continue
+        offsets = offsets[: bisect_right(offsets, max_left_shift)]
+        if not offsets:
+            continue
+
+        for row in rows[bisect_left(rows, first_row) :]:
+            candidates.extend((row, col_offset) for col_offset in offsets)
+
+    candidates.sort()
+
+    stats = instrumentation.active
+    last_row = None
+
+    for row, col_offset in candidates:
+        if stats is not None and row != last_row:
+            stats.rows_scanned += 1
+            last_row = row
+        if can_place_word(
+            grid, word, DIRECTION_ACROSS, row, -col_offset, vertical_coords
+        ):
+            yield row, -col_offset
 
-                if can_place_word(
-                    grid, word, DIRECTION_ACROSS, row, start_col, vertical_coords
-                ):
-                    return True, row, start_col
+
+def find_best_crossing_position(
+    grid: Grid,
+    word: str,
+    vertical_coords: set[tuple[int, int]],
+    vertical_length: int,
+    current_row_ptr: int,
+    letter_rows: dict[str, list[int]] | None = None,
+) -> tuple[bool, int, int]:
+    """
+    Find optimal position to place a word crossing the vertical word.
+
+    Args:
+        grid: Current grid state
+        word: Word to place
+        vertical_coords: Set of vertical word coordinates
+        vertical_length: Length of vertical word
+        current_row_ptr: Current row pointer
+        letter_rows: Letter index of the vertical word (see build_letter_index).
+            Built from the grid when not provided
+
+    Returns:
+        Tuple of (found_position, row, column)
+    """
+    for row, col in iter_crossing_positions(
+        grid, word, vertical_coords, vertical_length, current_row_ptr, letter_rows
+    ):
+        return True, row, col
 
     return False, 0, 0
 
 
-def build_single_block(tokens: TokenList) -> tuple[Grid, TokenList]:
+def build_block_at(tokens: TokenList, start: int = 0) -> tuple[Block, int]:
     """
-    Build a single crossword block from tokens.
+    Build a single crossword block from tokens, starting at an index.
+
+    Tokens are read in place, so building all blocks of a token list takes
+    time and memory linear in its length.
 
     Args:
         tokens: List of tokens to process
+        start: Index of the vertical word of the block
 
     Returns:
-        Tuple of (grid_block, remaining_tokens)
+        Tuple of (grid_block, next_token_index)
     """
-    grid: Grid = {}
-    if not tokens:
-        return grid, []
+    grid = Block()
+    end = len(tokens)
+    if start >= end:
+        return grid, end
 
-    vertical_word = tokens[0]
+    stats = instrumentation.active
+    if stats is not None:
+        stats.blocks_built += 1
+
+    vertical_word = tokens[start]
     place_word_in_grid(grid, vertical_word, DIRECTION_DOWN, 0, 0)
+    across_words: list[tuple[int, int, str]] = []
 
     if is_any_punctuation(vertical_word):
-        return grid, tokens[1:]
+        grid.describe(vertical_word, across_words)
+        return grid, start + 1
 
     vertical_length = len(vertical_word)
     vertical_coords = {(r, 0) for r in range(vertical_length)}
+    letter_rows = build_letter_index(vertical_word)
     current_row_ptr = 0
 
-    for i in range(1, len(tokens)):
-        current_token = tokens[i]
+    index = start + 1
+    while index < end:
+        current_token = tokens[index]
 
         found_position, row, col = find_best_crossing_position(
-            grid, current_token, vertical_coords, vertical_length, current_row_ptr
+            grid,
+            current_token,
+            vertical_coords,
+            vertical_length,
+            current_row_ptr,
+            letter_rows,
         )
 
         if not found_position:
-            return grid, tokens[i:]
+            break
 
         place_word_in_grid(grid, current_token, DIRECTION_ACROSS, row, col)
+        across_words.append((row, col, current_token))
         current_row_ptr = row + 1
+        index += 1
+
+    grid.describe(vertical_word, across_words)
+    return grid, index
+
+
+def build_single_block(tokens: TokenList) -> tuple[Block, TokenList]:
+    """
+    Build a single crossword block from tokens.
+
+    Copies the remaining tokens, prefer build_block_at when building
+    consecutive blocks.
+
+    Args:
+        tokens: List of tokens to process
 
-    return grid, []
+    Returns:
+        Tuple of (grid_block, remaining_tokens)
+    """
+    block, index = build_block_at(tokens)
+    return block, tokens[index:]
 
 
 def calculate_column_offset(
@@ -117,11 +323,11 @@ def calculate_column_offset(
     if not current_block or block_index >= total_blocks - 1:
         return current_col_offset
 
-    current_value = get_first_dict_item(current_block)[1]
-    next_value = get_first_dict_item(next_block)[1]
-
     # Add extra space between word blocks
-    if is_word(current_value) and is_word(next_value):
+    if (
+        as_block(current_block).starts_with_word
+        and as_block(next_block).starts_with_word
+    ):
         return current_col_offset + 1
 
     return current_col_offset
@@ -146,12 +352,7 @@ def place_single_character_block(
     for offset in (-1, 1):
         neighbor_index = block_index + offset
         if 0 <= neighbor_index < len(blocks):
-            neighbor_block = blocks[neighbor_index]
-            grouped_rows = [
-                k
-                for k, v in groupby(neighbor_block.keys(), lambda p: p[0])
-                if len(list(v)) > 1
-            ]
+            grouped_rows = as_block(blocks[neighbor_index]).multi_cell_rows
             if grouped_rows:
                 target_row = min(grouped_rows)
                 grid[(target_row, col + col_offset)] = character
@@ -161,6 +362,72 @@ def place_single_character_block(
     grid[(row, col + col_offset)] = character
 
 
+def merge_block(
+    grid: Grid, blocks: list[Grid], block_index: int, col_offset: int
+) -> int:
+    """
+    Place one block into the merged grid.
+
+    Placement of a block depends only on itself and its direct neighbors, so
+    merging can be resumed from any block given the offset it started with.
+
+    Args:
+        grid: Merged grid to modify
+        blocks: List of all blocks
+        block_index: Index of the block to place
+        col_offset: Column offset before the block
+
+    Returns:
+        Column offset for the next block
+    """
+    block = blocks[block_index]
+    if not block:
+        return col_offset
+
+    block = as_block(block)
+    placed_offset = col_offset - block.min_col if block_index > 0 else col_offset
+
+    # Handle single-character blocks (punctuation) differently
+    if len(block) == 1:
+        place_single_character_block(grid, block, blocks, block_index, placed_offset)
+    else:
+        for (row, col), character in block.items():
+            grid[(row, col + placed_offset)] = character
+
+    return advance_column_offset(blocks, block_index, col_offset)
+
+
+def advance_column_offset(blocks: list[Grid], block_index: int, col_offset: int) -> int:
+    """
+    Get the column offset after a block, as merge_block returns it.
+
+    Only block metadata is used, the cells are not visited.
+
+    Args:
+        blocks: List of all blocks
+        block_index: Index of the block
+        col_offset: Column offset before the block
+
+    Returns:
+        Column offset for the next block
+    """
+    block = blocks[block_index]
+    if not block:
+        return col_offset
+
+    block = as_block(block)
+    if block_index > 0:
+        col_offset -= block.min_col
+
+    # Calculate offset for next block
+    if block_index < len(blocks) - 1:
+        col_offset = calculate_column_offset(
+            block, blocks[block_index + 1], col_offset, block_index, len(blocks)
+        )
+
+    return col_offset + block.max_col + 1
+
+
 def merge_blocks(blocks: list[Grid]) -> Grid:
     """
     Merge individual blocks into a single grid with proper spacing.
@@ -171,33 +438,19 @@ def merge_blocks(blocks: list[Grid]) -> Grid:
     Returns:
         Merged grid
     """
+    stats = instrumentation.active
+    if stats is not None:
+        start = perf_counter()
+
+    blocks = [as_block(block) if block else block for block in blocks]
     grid: Grid = {}
     col_offset = 0
 
-    for i, block in enumerate(blocks):
-        if not block:
-            continue
-
-        block_columns = {c for (r, c) in block}
-        min_col, max_col = min(block_columns), max(block_columns)
-
-        if i > 0:
-            col_offset -= min_col
-
-        # Handle single-character blocks (punctuation) differently
-        if len(block) == 1:
-            place_single_character_block(grid, block, blocks, i, col_offset)
-        else:
-            for (row, col), character in block.items():
-                grid[(row, col + col_offset)] = character
+    for i in range(len(blocks)):
+        col_offset = merge_block(grid, blocks, i, col_offset)
 
-        # Calculate offset for next block
-        if i < len(blocks) - 1:
-            col_offset = calculate_column_offset(
-                block, blocks[i + 1], col_offset, i, len(blocks)
-            )
-
-        col_offset += max_col + 1
+    if stats is not None:
+        stats.add_phase_time(instrumentation.PHASE_MERGE, perf_counter() - start)
 
     return grid
 
@@ -212,13 +465,152 @@ def build_grid(phrase: str) -> tuple[Grid, list[Grid]]:
     Returns:
         Tuple of (merged_grid, individual_blocks)
     """
-    tokens = tokenize_with_end_punct(phrase)
+    return build_grid_from_tokens(tokenize_with_end_punct(phrase))
+
+
+def build_grid_from_tokens(tokens: TokenList) -> tuple[Grid, list[Grid]]:
+    """
+    Build crossword grid from already tokenized phrase.
+
+    Args:
+        tokens: Tokens as produced by tokenize_with_end_punct
+
+    Returns:
+        Tuple of (merged_grid, individual_blocks)
+    """
+    stats = instrumentation.active
+    if stats is not None:
+        start = perf_counter()
+
     blocks: list[Grid] = []
-    remaining_tokens = tokens
+    index = 0
 
-    while remaining_tokens:
-        block, remaining_tokens = build_single_block(remaining_tokens)
+    while index < len(tokens):
+        block, index = build_block_at(tokens, index)
         blocks.append(block)
 
+    if stats is not None:
+        stats.add_phase_time(instrumentation.PHASE_BLOCKS, perf_counter() - start)
+
     merged_grid = merge_blocks(blocks)
     return merged_grid, blocks
+
+
+def _build_grid_or_error(
+    phrase: str | TokenList, engine: Engine = build_grid_from_tokens
+) -> Layout | Exception:
+    """Build a grid, returning the raised exception instead of propagating it."""
+    try:
+        if isinstance(phrase, str):
+            phrase = tokenize_with_end_punct(phrase)
+        return engine(phrase)
+    except Exception as error:
+        return error
+
+
+def _map_chunk[Item, Result](
+    function: Callable[[Item], Result], items: tuple[Item, ...]
+) -> list[Result]:
+    """Apply a function to one chunk of items inside a worker process."""
+    return [function(item) for item in items]
+
+
+def iter_map_chunked[Item, Result](
+    function: Callable[[Item], Result],
+    items: Iterable[Item],
+    jobs: int | None = None,
+    chunksize: int = 64,
+) -> Iterator[Result]:
+    """
+    Lazily apply a function to a stream of items over a process pool.
+
+    Items are consumed in chunks and at most two chunks per worker are in
+    flight at any time, so memory stays bounded for unbounded inputs.
+
+    Args:
+        function: Picklable function applied to every item
+        items: Input items to process
+        jobs: Number of worker processes (defaults to the CPU count).
+            With a single job items are processed in-process
+        chunksize: Number of items sent to a worker at once
+
+    Yields:
+        One result per item, in input order
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs < 1:
+        raise ValueError(f"jobs must be positive, got {jobs}")
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be positive, got {chunksize}")
+
+    if jobs == 1:
+        for item in items:
+            yield function(item)
+        return
+
+    chunks = batched(items, chunksize)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque(
+            executor.submit(_map_chunk, function, chunk)
+            for chunk in islice(chunks, 2 * jobs)
+        )
+        while pending:
+            results = pending.popleft().result()
+            chunk = next(chunks, None)
+            if chunk is not None:
+                pending.append(executor.submit(_map_chunk, function, chunk))
+            yield from results
+
+
+def iter_build_grids(
+    phrases: Iterable[str | TokenList],
+    jobs: int | None = None,
+    chunksize: int = 64,
+    engine: Engine = build_grid_from_tokens,
+) -> Iterator[Layout | Exception]:
+    """
+    Lazily build crossword grids for a stream of phrases over a process pool.
+
+    Phrases are consumed in chunks and at most two chunks per worker are in
+    flight at any time, so memory stays bounded for unbounded inputs.
+
+    Args:
+        phrases: Input phrases to process, or their tokens
+        jobs: Number of worker processes (defaults to the CPU count).
+            With a single job phrases are processed in-process
+        chunksize: Number of phrases sent to a worker at once
+        engine: Function laying out the tokens of a phrase
+
+    Yields:
+        One entry per phrase, in input order. Each entry is either the
+        (merged_grid, individual_blocks) tuple or the exception raised while
+        building that phrase
+    """
+    return iter_map_chunked(
+        partial(_build_grid_or_error, engine=engine), phrases, jobs, chunksize
+    )
+
+
+def build_grids(
+    phrases: Iterable[str],
+    jobs: int | None = None,
+    chunksize: int = 64,
+    engine: Engine = build_grid_from_tokens,
+) -> list[Layout | Exception]:
+    """
+    Build crossword grids for many phrases, spreading them over a process pool.
+
+    Args:
+        phrases: Input phrases to process
+        jobs: Number of worker processes (defaults to the CPU count).
+            With a single job phrases are processed in-process
+        chunksize: Number of phrases sent to a worker at once
+        engine: Function laying out the tokens of a phrase
+
+    Returns:
+        List with one entry per phrase, in input order. Each entry is either
+        the (merged_grid, individual_blocks) tuple or the exception raised
+        while building that phrase
+    """
+    return list(iter_build_grids(phrases, jobs, chunksize, engine))
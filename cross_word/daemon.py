@@ -0,0 +1,200 @@
+"""Layout daemon listening on a Unix domain socket.
+
+Keeps the layout engine loaded so that short-lived processes only pay for a
+socket round trip instead of interpreter startup and imports:
+
+    python -m cross_word.daemon &
+    python -m cross_word --phrase "Привет, мир!"   # uses the daemon if running
+
+Both default to the socket in $CROSS_WORD_SOCKET, or cross_word.sock in
+$XDG_RUNTIME_DIR or in a private /tmp/cross_word-UID directory.
+
+See cross_word.client for the framed protocol. Layouts are computed by a
+LayoutService, so identical concurrent phrases share one computation.
+"""
+
+import asyncio
+import os
+import signal
+import socket
+import stat
+from concurrent.futures import ProcessPoolExecutor
+
+from cross_word.client import (
+    FRAME_HEADER,
+    MAX_FRAME_SIZE,
+    MAX_RESPONSE_SIZE,
+    STATUS_ERROR,
+    STATUS_OK,
+    default_socket_path,
+    encode_frame,
+)
+from cross_word.serve import LayoutService, ServiceOverloaded
+from cross_word.utils import render_grid, tokenize_with_end_punct
+
+
+def encode_response(status: int, text: str) -> bytes:
+    return encode_frame(bytes((status,)) + text.encode("utf-8"), MAX_RESPONSE_SIZE)
+
+
+async def respond(service: LayoutService, payload: bytes) -> bytes:
+    """Lay out one request payload, returning the encoded response frame."""
+    try:
+        phrase = payload.decode("utf-8")
+    except UnicodeDecodeError:
+        return encode_response(STATUS_ERROR, "Phrase must be UTF-8")
+
+    try:
+        grid, _ = await service.layout(tokenize_with_end_punct(phrase))
+    except ServiceOverloaded:
+        return encode_response(STATUS_ERROR, "Too many pending requests")
+    except Exception as error:
+        return encode_response(STATUS_ERROR, repr(error))
+
+    try:
+        return encode_response(STATUS_OK, render_grid(grid))
+    except ValueError:
+        return encode_response(STATUS_ERROR, "Rendered grid is too large")
+
+
+async def handle_connection(
+    service: LayoutService,
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+) -> None:
+    """Answer the requests of one client connection in order."""
+    try:
+        while True:
+            try:
+                (length,) = FRAME_HEADER.unpack(
+                    await reader.readexactly(FRAME_HEADER.size)
+                )
+                if length > MAX_FRAME_SIZE:
+                    writer.write(encode_response(STATUS_ERROR, "Frame too large"))
+                    break
+                payload = await reader.readexactly(length)
+            except asyncio.IncompleteReadError:
+                break
+
+            writer.write(await respond(service, payload))
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+def remove_stale_socket(path: str) -> None:
+    """
+    Remove a socket file left behind by a daemon that is no longer running.
+
+    Raises:
+        RuntimeError: If a daemon is still listening on the socket
+        FileExistsError: If the path exists and is not a socket
+    """
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{path} exists and is not a socket")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except ConnectionRefusedError:
+            os.unlink(path)
+            return
+    raise RuntimeError(f"A daemon is already listening on {path}")
+
+
+def check_socket_directory(path: str) -> None:
+    """
+    Make sure no other user can replace the socket, creating its directory.
+
+    A missing directory is created with mode 0700. An existing one must
+    belong to the current user, or have the sticky bit set like /tmp.
+
+    Raises:
+        PermissionError: If another user controls the directory
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+
+    status = os.lstat(directory)
+    if not stat.S_ISDIR(status.st_mode) or not (
+        status.st_uid == os.getuid() or status.st_mode & stat.S_ISVTX
+    ):
+        raise PermissionError(f"{directory} is not a directory of the current user")
+
+
+async def start_daemon(service: LayoutService, path: str) -> asyncio.Server:
+    """Start listening on a socket only the current user can access."""
+    check_socket_directory(path)
+    remove_stale_socket(path)
+
+    # The socket is created with the permissions left by the umask, so it is
+    # never accessible to others, not even between binding and a chmod
+    umask = os.umask(0o177)
+    try:
+        return await asyncio.start_unix_server(
+            lambda reader, writer: handle_connection(service, reader, writer), path
+        )
+    finally:
+        os.umask(umask)
+
+
+async def run_daemon(path: str, workers: int, max_concurrency: int) -> None:
+    executor = ProcessPoolExecutor(workers) if workers else None
+    service = LayoutService(executor, max_concurrency)
+    server = await start_daemon(service, path)
+    print(f"Layout daemon listening on {path}", flush=True)
+
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signal_number, stopped.set)
+
+    try:
+        async with server:
+            await stopped.wait()
+    finally:
+        service.shutdown()
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def construct_parser():
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser("cross_word.daemon")
+    parser.add_argument(
+        "-s",
+        "--socket",
+        default=default_socket_path(),
+        help="Socket path (default: $CROSS_WORD_SOCKET, $XDG_RUNTIME_DIR/cross_word.sock "
+        "or /tmp/cross_word-UID/cross_word.sock)",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=0,
+        help="Worker processes computing layouts (0 computes in threads)",
+    )
+    parser.add_argument(
+        "-c",
+        "--max-concurrency",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Layouts computed at once",
+    )
+    return parser
+
+
+if __name__ == "__main__":
+    args = construct_parser().parse_args()
+    asyncio.run(run_daemon(args.socket, args.workers, args.max_concurrency))
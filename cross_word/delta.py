@@ -0,0 +1,223 @@
+"""Cell level differences between successive layouts.
+
+A live preview redrawing the whole rendering on every edit only needs the
+cells that changed:
+
+    delta = diff_layouts(old_layout, new_layout)
+    send(delta_record(delta))           # client: apply_delta(grid, delta)
+
+A delta turns the old grid into the new one in three steps: drop the removed
+cells, move every cell from column shift_from on by shift columns, then write
+the added and changed cells. Layouts are diffed block by block: blocks the
+two layouts share (the same objects, as IncrementalLayout keeps them, or
+equal ones) at their start and end are not visited, the shared tail only
+moves by a single column shift.
+"""
+
+from typing import NamedTuple
+
+from cross_word.cross_words import (
+    Layout,
+    advance_column_offset,
+    as_block,
+    merge_block,
+)
+from cross_word.utils import Grid, get_grid_boundaries
+
+Cell = tuple[int, int]
+Bounds = tuple[int, int, int, int]
+
+
+class GridDelta(NamedTuple):
+    """
+    Changes turning one grid into another, applied in field order.
+
+    Attributes:
+        removed: Cells to clear, old coordinates
+        shift_from: First column of the cells to move
+        shift: Columns the cells from shift_from on move by
+        added: (cell, character) of cells to write that were empty
+        changed: (cell, character) of cells to overwrite
+        old_bounds, bounds: (min_row, max_row, min_col, max_col) of the old
+            and new grid, as get_grid_boundaries returns them
+    """
+
+    removed: list[Cell]
+    shift_from: int
+    shift: int
+    added: list[tuple[Cell, str]]
+    changed: list[tuple[Cell, str]]
+    old_bounds: Bounds
+    bounds: Bounds
+
+    @property
+    def unchanged(self) -> bool:
+        """Whether the grids are equal."""
+        return not (self.removed or self.shift or self.added or self.changed)
+
+
+def diff_cells(old: Grid, new: Grid) -> tuple[list[Cell], list, list]:
+    """
+    Compare two grids cell by cell.
+
+    Returns:
+        Tuple of (removed, added, changed), sorted by cell
+    """
+    removed = sorted(old.keys() - new.keys())
+    added = sorted((cell, new[cell]) for cell in new.keys() - old.keys())
+    changed = sorted(
+        (cell, new[cell]) for cell in old.keys() & new.keys() if old[cell] != new[cell]
+    )
+    return removed, added, changed
+
+
+def diff_grids(old: Grid, new: Grid) -> GridDelta:
+    """
+    Diff two grids by scanning all their cells, see diff_layouts for layouts.
+
+    Returns:
+        Delta without column shift
+    """
+    removed, added, changed = diff_cells(old, new)
+    return GridDelta(
+        removed,
+        0,
+        0,
+        added,
+        changed,
+        get_grid_boundaries(old),
+        get_grid_boundaries(new),
+    )
+
+
+def block_offsets(blocks: list[Grid]) -> list[int]:
+    """Column offset before every block in merge_blocks, plus the final one."""
+    offsets = [0]
+    for index in range(len(blocks)):
+        offsets.append(advance_column_offset(blocks, index, offsets[-1]))
+    return offsets
+
+
+def layout_bounds(blocks: list[Grid], offsets: list[int]) -> Bounds:
+    """
+    Get the bounds of a merged grid from its blocks, without visiting cells.
+
+    Every block but punctuation holds (0, 0) and single character blocks
+    are placed on rows of their neighbors, so the rows are those of the
+    blocks. Block columns follow each other from the offset before them.
+    """
+    placed = [(index, as_block(block)) for index, block in enumerate(blocks) if block]
+    if not placed:
+        return 0, 0, 0, 0
+
+    min_row = min(block.min_row for _, block in placed)
+    max_row = max(block.max_row for _, block in placed)
+    index, last = placed[-1]
+    max_col = offsets[index] + last.max_col
+    if index > 0:
+        max_col -= last.min_col
+    first_index, first = placed[0]
+    min_col = first.min_col if first_index == 0 else offsets[first_index]
+    return min_row, max_row, min_col, max_col
+
+
+def _same_block(first: Grid, second: Grid) -> bool:
+    return first is second or first == second
+
+
+def diff_layouts(old: Layout, new: Layout) -> GridDelta:
+    """
+    Diff the merged grids of two build_grid results, block by block.
+
+    Only the blocks between the blocks both layouts start and end with are
+    merged and compared cell by cell; the rest costs a comparison per block,
+    constant for blocks shared as objects.
+
+    Args:
+        old: Previous (merged_grid, individual_blocks)
+        new: Current (merged_grid, individual_blocks)
+
+    Returns:
+        Delta turning the old merged grid into the new one
+    """
+    old_blocks, new_blocks = old[1], new[1]
+    old_offsets, new_offsets = block_offsets(old_blocks), block_offsets(new_blocks)
+    old_count, new_count = len(old_blocks), len(new_blocks)
+    shortest = min(old_count, new_count)
+
+    prefix = 0
+    while prefix < shortest and _same_block(old_blocks[prefix], new_blocks[prefix]):
+        prefix += 1
+
+    suffix = 0
+    while suffix < shortest - prefix and _same_block(
+        old_blocks[old_count - 1 - suffix], new_blocks[new_count - 1 - suffix]
+    ):
+        suffix += 1
+
+    # Placing a block depends on its neighbors, so the shared blocks next to
+    # differing ones are merged again. Shared blocks are placed alike, the
+    # ones after the differing blocks moved by the change of the offset
+    if prefix == old_count == new_count:
+        start = old_end = new_end = old_count
+    else:
+        start = max(prefix - 1, 0)
+        old_end = min(old_count - suffix + 1, old_count)
+        new_end = min(new_count - suffix + 1, new_count)
+
+    old_cells: Grid = {}
+    for index in range(start, old_end):
+        merge_block(old_cells, old_blocks, index, old_offsets[index])
+    new_cells: Grid = {}
+    for index in range(start, new_end):
+        merge_block(new_cells, new_blocks, index, new_offsets[index])
+
+    removed, added, changed = diff_cells(old_cells, new_cells)
+
+    shift_from = shift = 0
+    if old_end < old_count:
+        shift_from = old_offsets[old_end]
+        shift = new_offsets[new_end] - shift_from
+
+    return GridDelta(
+        removed,
+        shift_from,
+        shift,
+        added,
+        changed,
+        layout_bounds(old_blocks, old_offsets),
+        layout_bounds(new_blocks, new_offsets),
+    )
+
+
+def apply_delta(grid: Grid, delta: GridDelta) -> Grid:
+    """
+    Apply a delta to the grid it was computed from.
+
+    Returns:
+        New grid equal to the one the delta was computed for, its cells may
+        be in a different order
+    """
+    removed = set(delta.removed)
+    result: Grid = {}
+    for (row, col), character in grid.items():
+        if (row, col) in removed:
+            continue
+        if col >= delta.shift_from:
+            col += delta.shift
+        result[(row, col)] = character
+
+    result.update(delta.added)
+    result.update(delta.changed)
+    return result
+
+
+def delta_record(delta: GridDelta) -> dict:
+    """Convert a delta into a JSON serializable record with flat cell lists."""
+    return {
+        "removed": [[row, col] for row, col in delta.removed],
+        "shift": [delta.shift_from, delta.shift],
+        "added": [[row, col, character] for (row, col), character in delta.added],
+        "changed": [[row, col, character] for (row, col), character in delta.changed],
+        "bounds": list(delta.bounds),
+    }
@@ -0,0 +1,254 @@
+from array import array
+from collections.abc import Iterator, Mapping, MutableMapping
+
+from cross_word import instrumentation
+from cross_word.utils import DIRECTION_DOWN
+
+# Alphabet code table shared by all dense grids. Code 0 marks an empty cell
+_ALPHABET: list[str] = [""]
+_CODES: dict[str, int] = {}
+_MAX_CODE = 0xFFFF
+
+
+def encode_character(character: str) -> int:
+    """Get the alphabet code of a character, registering it if needed."""
+    code = _CODES.get(character)
+    if code is None:
+        code = len(_ALPHABET)
+        if code > _MAX_CODE:
+            raise ValueError("Dense grid alphabet is full")
+        _ALPHABET.append(character)
+        _CODES[character] = code
+    return code
+
+
+class DenseGrid(MutableMapping[tuple[int, int], str]):
+    """
+    Grid stored as a row-major array of alphabet codes.
+
+    Behaves like the dictionary based Grid (keys are (row, column) tuples,
+    values are characters), but keeps two bytes per cell of its bounding box
+    and eight per occupied cell instead of a dictionary entry per occupied
+    cell. Bounds grow on demand in every direction, so negative coordinates
+    are supported.
+
+    Iteration yields occupied cells in insertion order, like a dictionary:
+    merge_blocks places punctuation by the order of block cells.
+    """
+
+    __slots__ = (
+        "_cells",
+        "_origin_row",
+        "_origin_col",
+        "_height",
+        "_width",
+        "_rows",
+        "_cols",
+    )
+
+    def __init__(self, cells: Mapping[tuple[int, int], str] | None = None):
+        self._cells = array("H")
+        self._origin_row = 0
+        self._origin_col = 0
+        self._height = 0
+        self._width = 0
+        # Occupied cells in insertion order
+        self._rows = array("i")
+        self._cols = array("i")
+
+        if cells:
+            rows = [r for (r, c) in cells]
+            cols = [c for (r, c) in cells]
+            self._reserve(min(rows), min(cols), max(rows), max(cols))
+            self.update(cells)
+
+    def _index(self, row: int, col: int) -> int:
+        """Get buffer index of a cell, or -1 if it lies outside the buffer."""
+        row -= self._origin_row
+        col -= self._origin_col
+        if 0 <= row < self._height and 0 <= col < self._width:
+            return row * self._width + col
+        return -1
+
+    def _reserve(self, min_row: int, min_col: int, max_row: int, max_col: int) -> None:
+        """Grow the buffer so it covers the given inclusive cell range."""
+        old_min_row, old_min_col = self._origin_row, self._origin_col
+        old_height, old_width = self._height, self._width
+
+        if old_height and old_width:
+            old_max_row = old_min_row + old_height - 1
+            old_max_col = old_min_col + old_width - 1
+            if (
+                min_row >= old_min_row
+                and min_col >= old_min_col
+                and max_row <= old_max_row
+                and max_col <= old_max_col
+            ):
+                return
+
+            # Grow geometrically in the directions that overflow
+            if min_row < old_min_row:
+                min_row = min(min_row, old_min_row - old_height // 2)
+            if max_row > old_max_row:
+                max_row = max(max_row, old_max_row + old_height // 2)
+            if min_col < old_min_col:
+                min_col = min(min_col, old_min_col - old_width // 2)
+            if max_col > old_max_col:
+                max_col = max(max_col, old_max_col + old_width // 2)
+
+            min_row, min_col = min(min_row, old_min_row), min(min_col, old_min_col)
+            max_row, max_col = max(max_row, old_max_row), max(max_col, old_max_col)
+
+        height = max_row - min_row + 1
+        width = max_col - min_col + 1
+        cells = array("H", bytes(2 * height * width))
+
+        for row in range(old_height):
+            source = row * old_width
+            target = (row + old_min_row - min_row) * width + old_min_col - min_col
+            cells[target : target + old_width] = self._cells[
+                source : source + old_width
+            ]
+
+        self._cells = cells
+        self._origin_row, self._origin_col = min_row, min_col
+        self._height, self._width = height, width
+
+    def __getitem__(self, key: tuple[int, int]) -> str:
+        index = self._index(*key)
+        code = self._cells[index] if index >= 0 else 0
+        if not code:
+            raise KeyError(key)
+        return _ALPHABET[code]
+
+    def __setitem__(self, key: tuple[int, int], character: str) -> None:
+        code = encode_character(character)
+        row, col = key
+        index = self._index(row, col)
+        if index < 0:
+            self._reserve(row, col, row, col)
+            index = self._index(row, col)
+        if not self._cells[index]:
+            self._rows.append(row)
+            self._cols.append(col)
+        self._cells[index] = code
+
+    def __delitem__(self, key: tuple[int, int]) -> None:
+        row, col = key
+        index = self._index(row, col)
+        if index < 0 or not self._cells[index]:
+            raise KeyError(key)
+        self._cells[index] = 0
+
+        for position, other_row in enumerate(self._rows):
+            if other_row == row and self._cols[position] == col:
+                del self._rows[position]
+                del self._cols[position]
+                break
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            index = self._index(*key)
+        except TypeError:
+            return False
+        return index >= 0 and self._cells[index] != 0
+
+    def get(self, key: tuple[int, int], default: str | None = None) -> str | None:
+        index = self._index(*key)
+        code = self._cells[index] if index >= 0 else 0
+        return _ALPHABET[code] if code else default
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        return zip(self._rows, self._cols)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __sizeof__(self) -> int:
+        return (
+            object.__sizeof__(self)
+            + self._cells.__sizeof__()
+            + self._rows.__sizeof__()
+            + self._cols.__sizeof__()
+        )
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+    def __reduce__(self):
+        # Codes index the alphabet of this process, so pickle the characters
+        return type(self), (dict(self.items()),)
+
+    def copy(self) -> "DenseGrid":
+        """Return a shallow copy of the grid."""
+        grid = DenseGrid()
+        grid._cells = array("H", self._cells)
+        grid._origin_row, grid._origin_col = self._origin_row, self._origin_col
+        grid._height, grid._width = self._height, self._width
+        grid._rows, grid._cols = array("i", self._rows), array("i", self._cols)
+        return grid
+
+    def can_place_word(
+        self,
+        word: str,
+        direction: str,
+        start_row: int,
+        start_col: int,
+        vertical_coords: set[tuple[int, int]] | None = None,
+    ) -> bool:
+        """Array backed implementation of utils.can_place_word."""
+        stats = instrumentation.active
+        cells, width = self._cells, self._width
+        row = start_row - self._origin_row
+        col = start_col - self._origin_col
+        down = direction == DIRECTION_DOWN
+
+        for i, character in enumerate(word):
+            if down:
+                current_row, current_col = row + i, col
+            else:
+                current_row, current_col = row, col + i
+
+            if not (0 <= current_row < self._height and 0 <= current_col < width):
+                continue
+
+            code = cells[current_row * width + current_col]
+            if not code:
+                continue
+            if _ALPHABET[code] != character or (
+                not down
+                and vertical_coords
+                and (start_row, start_col + i) not in vertical_coords
+            ):
+                if stats is not None:
+                    stats.cells_probed += i + 1
+                return False
+
+        if stats is not None:
+            stats.cells_probed += len(word)
+
+        return True
+
+    def place_word(
+        self, word: str, direction: str, start_row: int, start_col: int
+    ) -> None:
+        """Array backed implementation of utils.place_word_in_grid."""
+        if not word:
+            return
+
+        down = direction == DIRECTION_DOWN
+        end_row = start_row + (len(word) - 1 if down else 0)
+        end_col = start_col + (0 if down else len(word) - 1)
+        self._reserve(start_row, start_col, end_row, end_col)
+
+        index = self._index(start_row, start_col)
+        step = self._width if down else 1
+        cells = self._cells
+        row_step, col_step = (1, 0) if down else (0, 1)
+
+        for i, character in enumerate(word):
+            if not cells[index]:
+                self._rows.append(start_row + row_step * i)
+                self._cols.append(start_col + col_step * i)
+            cells[index] = encode_character(character)
+            index += step
@@ -0,0 +1,474 @@
+"""Persistent layout cache shared across processes.
+
+Stores layouts in an SQLite database, encoded with cross_word.codec and keyed
+on a hash of the tokens, the engine and the engine and codec versions, so a
+repeated phrase costs one primary key lookup, across restarts and processes:
+
+    with DiskLayoutCache("layouts.db", search_layout) as cache:
+        grid, blocks = cache.build_grid(phrase)
+
+    python -m cross_word.disk_cache layouts.db -e cross_word.search:search_layout \
+        warm phrases.txt -j 4
+
+The database runs in WAL mode, readers do not block each other or a writer.
+Once the stored layouts exceed max_bytes the least recently used ones are
+evicted. Access times are refreshed at most every touch_interval seconds, so
+most hits do not write.
+
+A hit costs a lookup and decoding the layout, about as much as the greedy
+engine spends on building it, so the engine has no default: the cache is
+meant for slower ones. On the examples a hit took 72 us against 70 us for
+greedy layouts, 98 us for interlocked and 693 us for search layouts; measure
+an engine with:
+
+    python -m cross_word.disk_cache layouts.db -e cross_word.search:search_layout bench
+"""
+
+import sqlite3
+import sys
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from hashlib import blake2b
+from itertools import batched
+from threading import Lock
+from time import perf_counter
+from typing import NamedTuple
+
+from cross_word.codec import FORMAT_VERSION, decode_layout, encode_layout
+from cross_word.cross_words import (
+    ENGINE_VERSION,
+    Engine,
+    Layout,
+    iter_build_grids,
+)
+from cross_word.utils import TokenList, tokenize_with_end_punct
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Eviction frees space down to this fraction of max_bytes
+EVICTION_TARGET = 0.9
+# Layouts stored per transaction when warming up
+WARM_BATCH_SIZE = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS layouts (
+    key BLOB PRIMARY KEY,
+    layout BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS layouts_accessed ON layouts (accessed);
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    entries INTEGER NOT NULL,
+    bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals VALUES (0, 0, 0);
+CREATE TRIGGER IF NOT EXISTS layouts_insert AFTER INSERT ON layouts BEGIN
+    UPDATE totals SET entries = entries + 1, bytes = bytes + new.size;
+END;
+CREATE TRIGGER IF NOT EXISTS layouts_delete AFTER DELETE ON layouts BEGIN
+    UPDATE totals SET entries = entries - 1, bytes = bytes - old.size;
+END;
+"""
+
+
+class DiskCacheTiming(NamedTuple):
+    """Best seconds per phrase of a cache hit and of the engine, see benchmark."""
+
+    hit_seconds: float
+    compute_seconds: float
+
+    @property
+    def speedup(self) -> float:
+        return self.compute_seconds / self.hit_seconds if self.hit_seconds else 0.0
+
+
+class DiskCacheStats(NamedTuple):
+    """Snapshot of DiskLayoutCache counters and totals."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+    max_bytes: int
+
+
+def engine_name(engine: Engine) -> str:
+    """Qualified name of a module level engine function."""
+    return f"{engine.__module__}.{engine.__qualname__}"
+
+
+def layout_key(tokens: TokenList, engine: str = "") -> bytes:
+    """
+    Hash tokens together with what their stored layout depends on.
+
+    Args:
+        tokens: Tokens as produced by tokenize_with_end_punct
+        engine: Name of the engine laying them out, see engine_name
+    """
+    digest = blake2b(
+        f"{ENGINE_VERSION}:{FORMAT_VERSION}:{engine}".encode(), digest_size=16
+    )
+    for token in tokens:
+        digest.update(b"\0" + token.encode("utf-8"))
+    return digest.digest()
+
+
+class DiskLayoutCache:
+    """
+    SQLite backed cache of build_grid results.
+
+    Any number of processes may open the same database, also with different
+    engines. Within a process an instance is thread-safe; a layout missing
+    from the cache may be computed by several threads or processes at once,
+    the first one stored wins. Blocks are returned as plain grids.
+
+    Args:
+        path: Database file, created if missing
+        engine: Module level function laying out tokens, see cross_words.Engine;
+            one slower than the greedy build_grid_from_tokens to pay off
+        max_bytes: Size of the stored layouts that triggers eviction
+        touch_interval: Seconds after which a hit refreshes the access time
+        timeout: Seconds to wait for another process holding the write lock
+    """
+
+    def __init__(
+        self,
+        path: str,
+        engine: Engine,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        touch_interval: float = 60.0,
+        timeout: float = 30.0,
+    ):
+        if max_bytes < 1:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes}")
+
+        self.path = path
+        self.engine = engine
+        self.max_bytes = max_bytes
+        self._engine_name = engine_name(engine)
+        self._touch_interval = int(touch_interval * 1e9)
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        self._connection = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+
+    def get(self, tokens: TokenList) -> Layout | None:
+        """
+        Look up the layout of tokens.
+
+        Returns:
+            Tuple of (merged_grid, individual_blocks), or None on a miss
+        """
+        key = layout_key(tokens, self._engine_name)
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT layout, accessed FROM layouts WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+
+            self._hits += 1
+            now = time.time_ns()
+            if now - row[1] >= self._touch_interval:
+                self._connection.execute(
+                    "UPDATE layouts SET accessed = ? WHERE key = ?", (now, key)
+                )
+
+        return decode_layout(row[0])
+
+    def put(self, tokens: TokenList, layout: Layout) -> None:
+        """Store the layout of tokens, evicting old layouts if needed."""
+        self._put_many([(layout_key(tokens, self._engine_name), layout)])
+
+    def _put_many(self, entries: Iterable[tuple[bytes, Layout]]) -> int:
+        """Store layouts in one transaction, returning how many were new."""
+        now = time.time_ns()
+        rows = [
+            (key, payload, len(payload), now)
+            for key, payload in (
+                (key, encode_layout(layout)) for key, layout in entries
+            )
+        ]
+
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                inserted = connection.executemany(
+                    "INSERT INTO layouts VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (key) DO NOTHING",
+                    rows,
+                ).rowcount
+                self._evict()
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+        return inserted
+
+    def _evict(self) -> None:
+        """Drop least recently used layouts, inside a write transaction."""
+        (stored,) = self._connection.execute(
+            "SELECT bytes FROM totals WHERE id = 0"
+        ).fetchone()
+        if stored <= self.max_bytes:
+            return
+
+        excess = stored - int(self.max_bytes * EVICTION_TARGET)
+        keys = []
+        cursor = self._connection.execute(
+            "SELECT key, size FROM layouts ORDER BY accessed, key"
+        )
+        for key, size in cursor:
+            keys.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        cursor.close()
+
+        self._connection.executemany("DELETE FROM layouts WHERE key = ?", keys)
+        self._evictions += len(keys)
+
+    def build_grid(self, phrase: str) -> Layout:
+        """Cached equivalent of cross_words.build_grid, using the engine."""
+        return self.build_grid_from_tokens(tokenize_with_end_punct(phrase))
+
+    def build_grid_from_tokens(self, tokens: TokenList) -> Layout:
+        """Cached equivalent of the engine."""
+        layout = self.get(tokens)
+        if layout is None:
+            layout = self.engine(tokens)
+            self.put(tokens, layout)
+        return layout
+
+    def _missing(self, phrases: Iterable[str]) -> list[tuple[bytes, str]]:
+        """Get (key, phrase) of the distinct phrases missing from the cache."""
+        candidates: dict[bytes, str] = {}
+        for phrase in phrases:
+            key = layout_key(tokenize_with_end_punct(phrase), self._engine_name)
+            candidates.setdefault(key, phrase)
+        if not candidates:
+            return []
+
+        placeholders = ", ".join("?" * len(candidates))
+        with self._lock:
+            stored = {
+                key
+                for (key,) in self._connection.execute(
+                    f"SELECT key FROM layouts WHERE key IN ({placeholders})",
+                    list(candidates),
+                )
+            }
+        return [
+            (key, phrase) for key, phrase in candidates.items() if key not in stored
+        ]
+
+    def warm(
+        self, phrases: Iterable[str], jobs: int | None = None, chunksize: int = 64
+    ) -> int:
+        """
+        Lay out and store the phrases missing from the cache.
+
+        Phrases are looked up in batches of WARM_BATCH_SIZE as they are read,
+        laid out over a process pool (see iter_build_grids) and stored in
+        batches, one transaction each, so memory stays bounded and the lock
+        is never held while laying out. Phrases failing to lay out are
+        skipped.
+
+        Returns:
+            Number of layouts stored
+        """
+        # Keys of the phrases handed to the pool, in order
+        keys: deque[bytes] = deque()
+
+        def iter_missing() -> Iterator[str]:
+            for batch in batched(phrases, WARM_BATCH_SIZE):
+                for key, phrase in self._missing(batch):
+                    keys.append(key)
+                    yield phrase
+
+        results = iter_build_grids(iter_missing(), jobs, chunksize, self.engine)
+        entries = ((keys.popleft(), result) for result in results)
+        stored = 0
+        for batch in batched(
+            (entry for entry in entries if not isinstance(entry[1], Exception)),
+            WARM_BATCH_SIZE,
+        ):
+            stored += self._put_many(batch)
+        return stored
+
+    def benchmark(self, phrases: Iterable[str], repeat: int = 5) -> DiskCacheTiming:
+        """
+        Time cache hits against the engine on phrases, storing missing ones.
+
+        Returns:
+            Best seconds per phrase over repeat runs through all phrases
+        """
+        if repeat < 1:
+            raise ValueError(f"repeat must be positive, got {repeat}")
+
+        token_lists = [tokenize_with_end_punct(phrase) for phrase in phrases]
+        for tokens in token_lists:
+            self.build_grid_from_tokens(tokens)
+        if not token_lists:
+            return DiskCacheTiming(0.0, 0.0)
+
+        def best(function) -> float:
+            times = []
+            for _ in range(repeat):
+                start = perf_counter()
+                for tokens in token_lists:
+                    function(tokens)
+                times.append(perf_counter() - start)
+            return min(times) / len(token_lists)
+
+        return DiskCacheTiming(best(self.build_grid_from_tokens), best(self.engine))
+
+    @property
+    def stats(self) -> DiskCacheStats:
+        """Counters of this instance and totals of the database."""
+        with self._lock:
+            entries, stored = self._connection.execute(
+                "SELECT entries, bytes FROM totals WHERE id = 0"
+            ).fetchone()
+            return DiskCacheStats(
+                self._hits,
+                self._misses,
+                self._evictions,
+                entries,
+                stored,
+                self.max_bytes,
+            )
+
+    def clear(self) -> None:
+        """Drop all layouts and reset the counters."""
+        with self._lock:
+            self._connection.execute("DELETE FROM layouts")
+            self._hits = self._misses = self._evictions = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> "DiskLayoutCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.stats.entries
+
+    def __contains__(self, phrase: object) -> bool:
+        if not isinstance(phrase, str):
+            return False
+        key = layout_key(tokenize_with_end_punct(phrase), self._engine_name)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM layouts WHERE key = ?", (key,)
+            ).fetchone()
+        return row is not None
+
+
+def construct_parser():
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser("cross_word.disk_cache")
+    parser.add_argument("path", help="Cache database file")
+    parser.add_argument(
+        "-e",
+        "--engine",
+        required=True,
+        help="Engine laying out tokens, as module:function, "
+        "e.g. cross_word.search:search_layout",
+    )
+    parser.add_argument(
+        "--max-bytes",
+        type=int,
+        default=DEFAULT_MAX_BYTES,
+        help="Size of the stored layouts that triggers eviction",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    warm = commands.add_parser(
+        "warm", help="Lay out and store the phrases missing from the cache"
+    )
+    warm.add_argument(
+        "input", nargs="?", default="-", help="Phrases, one per line (stdin if '-')"
+    )
+    warm.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=0,
+        help="Number of worker processes (0 means one per CPU)",
+    )
+
+    bench = commands.add_parser(
+        "bench", help="Time cache hits against the engine (on the CLI examples)"
+    )
+    bench.add_argument(
+        "input", nargs="?", help="Phrases, one per line (the CLI examples if omitted)"
+    )
+    bench.add_argument(
+        "-r", "--repeat", type=int, default=5, help="Timed runs over the phrases"
+    )
+
+    commands.add_parser("stats", help="Print the number and size of stored layouts")
+    commands.add_parser("clear", help="Drop all stored layouts")
+    return parser
+
+
+if __name__ == "__main__":
+    parser = construct_parser()
+    args = parser.parse_args()
+
+    from cross_word.golden import load_engine
+
+    with DiskLayoutCache(args.path, load_engine(args.engine), args.max_bytes) as cache:
+        if args.command == "warm":
+            if args.jobs < 0:
+                parser.error("--jobs must not be negative")
+            file = (
+                sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+            )
+            with file:
+                phrases = (line.rstrip("\n") for line in file if line.strip())
+                stored = cache.warm(phrases, jobs=args.jobs or None)
+            print(f"Stored {stored} layouts")
+
+        if args.command == "bench":
+            if args.repeat < 1:
+                parser.error("--repeat must be positive")
+            if args.input is None:
+                from cross_word.__main__ import EXAMPLES
+
+                phrases = EXAMPLES
+            else:
+                with open(args.input, encoding="utf-8") as file:
+                    phrases = [line.rstrip("\n") for line in file if line.strip()]
+            timing = cache.benchmark(phrases, args.repeat)
+            print(
+                f"hit {timing.hit_seconds * 1e6:.1f} us, "
+                f"engine {timing.compute_seconds * 1e6:.1f} us per phrase, "
+                f"speedup {timing.speedup:.2f}x"
+            )
+
+        if args.command in ("warm", "stats"):
+            stats = cache.stats
+            print(f"{stats.entries} layouts, {stats.bytes} of {stats.max_bytes} bytes")
+
+        if args.command == "clear":
+            cache.clear()
@@ -0,0 +1,316 @@
+"""Golden output regression harness.
+
+Checks that an engine renders every phrase of golden files (results.txt and
+larger corpora in the same format) exactly as recorded, and times it:
+
+    python -m cross_word.golden results.txt
+    python -m cross_word.golden corpus.txt --engine mymodule:build_grid_from_tokens \\
+        --reference cross_word.cross_words:build_grid_from_tokens
+
+A golden file is the output of `python -m cross_word --all`: one entry per
+phrase, each a "<number>: Phrase: <phrase>" line followed by the rendered
+grid (or an "Error: ..." line) and a "---" line.
+
+Engines take the tokens of a phrase, like the engines of build_grids.
+Phrases are checked over a process pool. Every phrase is timed in the worker
+with the engine and, when given, a reference engine, so a single run proves an
+engine is output-identical and shows its speedup.
+"""
+
+import difflib
+import json
+import statistics
+import sys
+from collections.abc import Iterable, Iterator
+from functools import cache, partial
+from importlib import import_module
+from time import perf_counter
+from typing import NamedTuple, TextIO
+
+from cross_word.cross_words import Engine, iter_map_chunked
+from cross_word.utils import render_grid, tokenize_with_end_punct
+
+DEFAULT_ENGINE = "cross_word.cross_words:build_grid_from_tokens"
+
+PHRASE_MARKER = "Phrase: "
+ERROR_MARKER = "Error: "
+SEPARATOR = "---"
+
+
+class GoldenCase(NamedTuple):
+    """One recorded phrase and its expected rendering."""
+
+    number: int
+    phrase: str
+    expected: str
+
+
+class GoldenResult(NamedTuple):
+    """Outcome of checking one golden case."""
+
+    case: GoldenCase
+    actual: str
+    # Best wall-clock seconds of the engine and of the reference engine
+    seconds: float
+    reference_seconds: float | None
+
+    @property
+    def passed(self) -> bool:
+        return self.actual == self.case.expected
+
+
+def parse_golden(stream: TextIO) -> Iterator[GoldenCase]:
+    """
+    Parse golden cases from a text stream.
+
+    Args:
+        stream: Text stream in the `python -m cross_word --all` format
+
+    Yields:
+        Golden cases in file order
+
+    Raises:
+        ValueError: If the stream is not in the golden format
+    """
+    case_header = None
+    lines: list[str] = []
+
+    for line_number, line in enumerate(stream, 1):
+        line = line.rstrip("\r\n")
+
+        if case_header is None:
+            if not line.strip():
+                continue
+            number, separator, phrase = line.partition(": ")
+            if (
+                not separator
+                or not number.isdigit()
+                or not phrase.startswith(PHRASE_MARKER)
+            ):
+                raise ValueError(f"Line {line_number}: expected a phrase header")
+            case_header = int(number), phrase.removeprefix(PHRASE_MARKER)
+        elif line == SEPARATOR:
+            yield GoldenCase(*case_header, "\n".join(lines))
+            case_header = None
+            lines = []
+        else:
+            lines.append(line)
+
+    if case_header is not None:
+        raise ValueError(f"Case {case_header[0]} is not terminated by {SEPARATOR!r}")
+
+
+def format_case(number: int, phrase: str, rendered: str) -> str:
+    """Format one golden entry, as printed by `python -m cross_word --all`."""
+    return f"{number}: {PHRASE_MARKER}{phrase}\n{rendered}\n{SEPARATOR}\n"
+
+
+@cache
+def load_engine(spec: str) -> Engine:
+    """
+    Import an engine given as "module:function".
+
+    The function takes the tokens of a phrase and returns
+    (merged_grid, individual_blocks).
+    """
+    module_name, separator, function_name = spec.partition(":")
+    if not separator:
+        raise ValueError(f"Engine must be given as module:function, got {spec!r}")
+    return getattr(import_module(module_name), function_name)
+
+
+def render_with_engine(engine: Engine, phrase: str) -> str:
+    """Render a phrase like the CLI does, including raised errors."""
+    try:
+        return render_grid(engine(tokenize_with_end_punct(phrase))[0])
+    except Exception as error:
+        return f"{ERROR_MARKER}{error!r}"
+
+
+def time_engine(engine: Engine, phrase: str, repeat: int) -> tuple[str, float]:
+    """Render a phrase repeat times, returning the rendering and the best time."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        rendered = render_with_engine(engine, phrase)
+        best = min(best, perf_counter() - start)
+    return rendered, best
+
+
+def check_case(
+    case: GoldenCase, engine: str, reference: str | None, repeat: int
+) -> GoldenResult:
+    """Check and time one golden case."""
+    actual, seconds = time_engine(load_engine(engine), case.phrase, repeat)
+    reference_seconds = None
+    if reference is not None:
+        _, reference_seconds = time_engine(load_engine(reference), case.phrase, repeat)
+    return GoldenResult(case, actual, seconds, reference_seconds)
+
+
+def iter_check_golden(
+    cases: Iterable[GoldenCase],
+    engine: str = DEFAULT_ENGINE,
+    reference: str | None = None,
+    repeat: int = 3,
+    jobs: int | None = None,
+    chunksize: int = 16,
+) -> Iterator[GoldenResult]:
+    """
+    Lazily check golden cases over a process pool.
+
+    Args:
+        cases: Golden cases to check
+        engine: Engine under test, as "module:function"
+        reference: Engine to compare timings with, as "module:function"
+        repeat: Timed runs per phrase and engine, the best one is kept
+        jobs: Number of worker processes (defaults to the CPU count).
+            With a single job cases are checked in-process
+        chunksize: Number of cases sent to a worker at once
+
+    Yields:
+        One result per case, in input order
+    """
+    if repeat < 1:
+        raise ValueError(f"repeat must be positive, got {repeat}")
+
+    # Fail early on engines that cannot be imported
+    load_engine(engine)
+    if reference is not None:
+        load_engine(reference)
+
+    yield from iter_map_chunked(
+        partial(check_case, engine=engine, reference=reference, repeat=repeat),
+        cases,
+        jobs,
+        chunksize,
+    )
+
+
+def format_diff(result: GoldenResult, source: str = "golden") -> str:
+    """Unified diff between the expected and the actual rendering of a case."""
+    case = result.case
+    diff = difflib.unified_diff(
+        case.expected.splitlines(),
+        result.actual.splitlines(),
+        f"{source}:{case.number}",
+        f"actual:{case.number}",
+        lineterm="",
+    )
+    return f"{case.number}: {PHRASE_MARKER}{case.phrase}\n" + "\n".join(diff)
+
+
+def format_summary(results: list[GoldenResult]) -> str:
+    failed = sum(not result.passed for result in results)
+    total = sum(result.seconds for result in results)
+    lines = [
+        f"{len(results) - failed}/{len(results)} phrases identical, "
+        f"engine {total * 1e3:.3f} ms total"
+    ]
+
+    timed = [result for result in results if result.reference_seconds is not None]
+    if timed:
+        reference_total = sum(result.reference_seconds for result in timed)
+        speedups = [
+            result.reference_seconds / result.seconds
+            for result in timed
+            if result.seconds
+        ]
+        lines.append(
+            f"reference {reference_total * 1e3:.3f} ms total, "
+            f"speedup {reference_total / total if total else 0:.2f}x "
+            f"(median per phrase {statistics.median(speedups) if speedups else 0:.2f}x)"
+        )
+    return "\n".join(lines)
+
+
+def result_record(result: GoldenResult) -> dict:
+    return {
+        "number": result.case.number,
+        "phrase": result.case.phrase,
+        "passed": result.passed,
+        "seconds": result.seconds,
+        "reference_seconds": result.reference_seconds,
+    }
+
+
+def construct_parser():
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser("cross_word.golden")
+    parser.add_argument("files", nargs="+", help="Golden files to check")
+    parser.add_argument(
+        "-e",
+        "--engine",
+        default=DEFAULT_ENGINE,
+        help="Engine under test, as module:function",
+    )
+    parser.add_argument(
+        "--reference", help="Engine to compare timings with, as module:function"
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=3, help="Timed runs per phrase"
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=0,
+        help="Worker processes (0 uses the CPU count, 1 runs in-process)",
+    )
+    parser.add_argument(
+        "-o", "--output", help="Save per-phrase results as JSON lines to this file"
+    )
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="Rewrite the golden files with the engine output instead of checking",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = construct_parser().parse_args(argv)
+    report = open(args.output, "w", encoding="utf-8") if args.output else None
+    all_results: list[GoldenResult] = []
+
+    try:
+        for path in args.files:
+            with open(path, encoding="utf-8") as file:
+                cases = list(parse_golden(file))
+
+            results = list(
+                iter_check_golden(
+                    cases, args.engine, args.reference, args.repeat, args.jobs or None
+                )
+            )
+            all_results.extend(results)
+
+            if args.update:
+                with open(path, "w", encoding="utf-8") as file:
+                    for result in results:
+                        file.write(
+                            format_case(
+                                result.case.number, result.case.phrase, result.actual
+                            )
+                        )
+                continue
+
+            for result in results:
+                if not result.passed:
+                    print(format_diff(result, path))
+                if report is not None:
+                    report.write(json.dumps(result_record(result), ensure_ascii=False))
+                    report.write("\n")
+    finally:
+        if report is not None:
+            report.close()
+
+    print(format_summary(all_results))
+    if args.update:
+        return 0
+    return 0 if all(result.passed for result in all_results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
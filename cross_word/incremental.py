@@ -0,0 +1,102 @@
+from bisect import bisect_right
+
+from cross_word.cross_words import Layout, build_block_at, merge_block
+from cross_word.utils import Grid, TokenList, tokenize_with_end_punct
+
+
+def common_prefix_length(first: TokenList, second: TokenList) -> int:
+    """Get number of leading tokens two token lists share."""
+    length = min(len(first), len(second))
+    for i in range(length):
+        if first[i] != second[i]:
+            return i
+    return length
+
+
+class IncrementalLayout:
+    """
+    Layout of a phrase that is kept up to date while the phrase is edited.
+
+    Blocks are built left to right, so an edit can only affect the block that
+    contains the first changed token and, if that token started the block,
+    the previous block that stopped in front of it. update() rebuilds blocks
+    from there on and re-merges only the tail of the merged grid, leaving the
+    blocks before untouched (the same objects are kept).
+
+    The result always equals build_grid(phrase) for the current phrase. The
+    returned grid and blocks are owned by the layout and must not be mutated.
+    """
+
+    def __init__(self, phrase: str = ""):
+        self.tokens: TokenList = []
+        self.blocks: list[Grid] = []
+        self.grid: Grid = {}
+        # Token index each block starts at
+        self._block_starts: list[int] = []
+        # Column offset before each block and merged grid size before each block
+        self._merge_offsets: list[int] = []
+        self._merge_sizes: list[int] = []
+        # Index of the first block rebuilt by the last update
+        self.first_changed_block = 0
+
+        self.update(phrase)
+
+    def update(self, phrase: str) -> Layout:
+        """
+        Re-layout an edited phrase.
+
+        Args:
+            phrase: New version of the phrase
+
+        Returns:
+            Tuple of (merged_grid, individual_blocks)
+        """
+        tokens = tokenize_with_end_punct(phrase)
+        first_changed_token = common_prefix_length(self.tokens, tokens)
+
+        if first_changed_token == len(self.tokens) == len(tokens):
+            self.first_changed_block = len(self.blocks)
+            return self.grid, self.blocks
+
+        block_index = max(bisect_right(self._block_starts, first_changed_token) - 1, 0)
+        # The previous block stopped because it could not take this token
+        if block_index > 0 and self._block_starts[block_index] == first_changed_token:
+            block_index -= 1
+
+        self.tokens = tokens
+        self._rebuild_blocks(block_index)
+        self._remerge(max(block_index - 1, 0))
+        self.first_changed_block = block_index
+
+        return self.grid, self.blocks
+
+    def _rebuild_blocks(self, block_index: int) -> None:
+        """Rebuild blocks from block_index to the end of the tokens."""
+        start = self._block_starts[block_index] if self.blocks else 0
+        del self.blocks[block_index:]
+        del self._block_starts[block_index:]
+
+        while start < len(self.tokens):
+            block, end = build_block_at(self.tokens, start)
+            self.blocks.append(block)
+            self._block_starts.append(start)
+            start = end
+
+    def _remerge(self, block_index: int) -> None:
+        """Re-merge blocks from block_index onwards into the merged grid."""
+        col_offset = 0
+        if block_index < len(self._merge_sizes):
+            col_offset = self._merge_offsets[block_index]
+            # Blocks are merged in order into disjoint columns, so the cells of
+            # the tail are exactly the most recently inserted keys
+            size = self._merge_sizes[block_index]
+            while len(self.grid) > size:
+                self.grid.popitem()
+
+        del self._merge_offsets[block_index:]
+        del self._merge_sizes[block_index:]
+
+        for i in range(block_index, len(self.blocks)):
+            self._merge_offsets.append(col_offset)
+            self._merge_sizes.append(len(self.grid))
+            col_offset = merge_block(self.grid, self.blocks, i, col_offset)
@@ -0,0 +1,83 @@
+"""Opt-in counters and phase timers for the layout hot paths.
+
+Instrumented functions read the module level `active` collector once per call
+and skip all bookkeeping while it is None, so the cost when collection is off
+is a single attribute lookup:
+
+    with collect_stats() as stats:
+        build_grid(phrase)
+    print(stats.can_place_calls, stats.phase_seconds)
+
+Collection is process wide (not per thread) and does not cross process
+boundaries, so layouts built in worker pools are not counted.
+"""
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+PHASE_TOKENIZE = "tokenize"
+PHASE_BLOCKS = "blocks"
+PHASE_MERGE = "merge"
+PHASE_RENDER = "render"
+
+
+@dataclass(slots=True)
+class LayoutStats:
+    """Counters collected while instrumentation is active."""
+
+    # Calls to utils.can_place_word and grid cells they examined
+    can_place_calls: int = 0
+    cells_probed: int = 0
+    # Vertical word rows visited while searching for crossings
+    rows_scanned: int = 0
+    # Blocks produced by build_block_at
+    blocks_built: int = 0
+    # Wall-clock seconds spent per phase (see PHASE_* constants)
+    phase_seconds: dict[str, float] = field(default_factory=dict)
+
+    def add_phase_time(self, phase: str, seconds: float) -> None:
+        self.phase_seconds[phase] = self.phase_seconds.get(phase, 0.0) + seconds
+
+    def merge(self, other: "LayoutStats") -> None:
+        """Add counters of another collector to this one."""
+        self.can_place_calls += other.can_place_calls
+        self.cells_probed += other.cells_probed
+        self.rows_scanned += other.rows_scanned
+        self.blocks_built += other.blocks_built
+        for phase, seconds in other.phase_seconds.items():
+            self.add_phase_time(phase, seconds)
+
+
+# Collector instrumented functions report to, None when collection is off
+active: LayoutStats | None = None
+
+
+@contextmanager
+def collect_stats(
+    callback: Callable[[LayoutStats], None] | None = None,
+) -> Iterator[LayoutStats]:
+    """
+    Collect layout statistics for the duration of a with block.
+
+    Nested collectors are merged into the enclosing one when they finish.
+
+    Args:
+        callback: Function called with the collected statistics on exit
+
+    Yields:
+        Collector updated while the block runs
+    """
+    global active
+
+    previous = active
+    stats = LayoutStats()
+    active = stats
+    try:
+        yield stats
+    finally:
+        active = previous
+        if previous is not None:
+            previous.merge(stats)
+        if callback is not None:
+            callback(stats)
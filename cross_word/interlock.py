@@ -0,0 +1,269 @@
+"""Interlocking layout mode.
+
+build_grid lays every block out as one vertical word crossed by horizontal
+words. In this mode words may also run down through horizontal words placed
+before them, so blocks become interlocking crosswords and layouts get denser:
+
+    grid, blocks = build_interlocked_grid(phrase)
+
+Placement follows crossword rules: crossing cells hold the same letter, words
+never run alongside or end to end with other words, and every word adds at
+least one cell. Blocks keep to the rows of their first word (or max_rows), so
+they are merged into one strip like build_grid blocks.
+"""
+
+from collections.abc import Iterator
+from time import perf_counter
+
+from cross_word import instrumentation
+from cross_word.cross_words import Block, Layout, merge_blocks
+from cross_word.utils import (
+    DIRECTION_ACROSS,
+    DIRECTION_DOWN,
+    Grid,
+    TokenList,
+    is_any_punctuation,
+    tokenize_with_end_punct,
+)
+
+# Bit flags of the directions of the words running through a cell
+_ACROSS = 1
+_DOWN = 2
+
+
+class OccupancyIndex:
+    """
+    Spatial hash of placed letters.
+
+    Maps every occupied cell to its letter and to the directions of the words
+    through it, and every letter to the cells holding it. Placement checks
+    only look up the cells of the word and their direct neighbours, so they
+    cost O(word length) however large the grid grows.
+    """
+
+    __slots__ = (
+        "cells",
+        "_directions",
+        "_letter_cells",
+        "min_row",
+        "max_row",
+        "min_col",
+        "max_col",
+    )
+
+    def __init__(self):
+        self.cells: Grid = {}
+        self._directions: dict[tuple[int, int], int] = {}
+        self._letter_cells: dict[str, list[tuple[int, int]]] = {}
+        self.min_row = self.max_row = self.min_col = self.max_col = 0
+
+    def count_crossings(
+        self, word: str, direction: str, start_row: int, start_col: int
+    ) -> int:
+        """
+        Check a placement against the crossword rules.
+
+        Args:
+            word: Word to place
+            direction: DIRECTION_DOWN or DIRECTION_ACROSS
+            start_row: Starting row position
+            start_col: Starting column position
+
+        Returns:
+            Number of placed letters the word crosses, -1 if it cannot be placed
+        """
+        down = direction == DIRECTION_DOWN
+        row_step, col_step = (1, 0) if down else (0, 1)
+        flag = _DOWN if down else _ACROSS
+        cells, directions = self.cells, self._directions
+        length = len(word)
+
+        # Words must not touch end to end
+        if (start_row - row_step, start_col - col_step) in cells or (
+            start_row + row_step * length,
+            start_col + col_step * length,
+        ) in cells:
+            return -1
+
+        crossings = 0
+        for i, character in enumerate(word):
+            row = start_row + row_step * i
+            col = start_col + col_step * i
+            placed = cells.get((row, col))
+
+            if placed is None:
+                # New letters must not touch words running alongside
+                if (row + col_step, col + row_step) in cells or (
+                    row - col_step,
+                    col - row_step,
+                ) in cells:
+                    return -1
+            elif placed != character or directions[(row, col)] & flag:
+                return -1
+            else:
+                crossings += 1
+
+        return crossings if crossings < length else -1
+
+    def place(self, word: str, direction: str, start_row: int, start_col: int) -> None:
+        """Place a word, see utils.place_word_in_grid."""
+        down = direction == DIRECTION_DOWN
+        row_step, col_step = (1, 0) if down else (0, 1)
+        flag = _DOWN if down else _ACROSS
+
+        if not self.cells:
+            self.min_row = self.max_row = start_row
+            self.min_col = self.max_col = start_col
+
+        for i, character in enumerate(word):
+            cell = (start_row + row_step * i, start_col + col_step * i)
+            if cell not in self.cells:
+                self.cells[cell] = character
+                self._letter_cells.setdefault(character, []).append(cell)
+            self._directions[cell] = self._directions.get(cell, 0) | flag
+
+        end_row = start_row + row_step * (len(word) - 1)
+        end_col = start_col + col_step * (len(word) - 1)
+        self.min_row, self.max_row = min(self.min_row, start_row), max(
+            self.max_row, end_row
+        )
+        self.min_col, self.max_col = min(self.min_col, start_col), max(
+            self.max_col, end_col
+        )
+
+    def iter_crossing_starts(self, word: str) -> Iterator[tuple[str, int, int]]:
+        """
+        Yield placements of a word crossing at least one placed letter.
+
+        Only the alignment is guaranteed, check every placement with
+        count_crossings. A placement may be yielded more than once.
+
+        Yields:
+            Tuples of (direction, start_row, start_col)
+        """
+        for i, character in enumerate(word):
+            for row, col in self._letter_cells.get(character, ()):
+                flags = self._directions[(row, col)]
+                if flags == _ACROSS | _DOWN:
+                    continue
+                if flags & _ACROSS:
+                    yield DIRECTION_DOWN, row - i, col
+                else:
+                    yield DIRECTION_ACROSS, row, col - i
+
+    def area_with(self, word: str, direction: str, start_row: int, start_col: int):
+        """Bounding box area after placing a word."""
+        down = direction == DIRECTION_DOWN
+        end_row = start_row + (len(word) - 1 if down else 0)
+        end_col = start_col + (0 if down else len(word) - 1)
+        height = max(self.max_row, end_row) - min(self.min_row, start_row) + 1
+        width = max(self.max_col, end_col) - min(self.min_col, start_col) + 1
+        return height * width
+
+
+def build_interlocked_block_at(
+    tokens: TokenList, start: int = 0, max_rows: int | None = None
+) -> tuple[Block, int]:
+    """
+    Build a single interlocking block from tokens, starting at an index.
+
+    The first word runs down from (0, 0). Every following word is placed,
+    across or down, where it crosses the block and keeps its bounding box
+    smallest (preferring more crossings), until a word cannot be placed.
+
+    Args:
+        tokens: List of tokens to process
+        start: Index of the first word of the block
+        max_rows: Rows the block may span, at least the length of its first
+            word (the default)
+
+    Returns:
+        Tuple of (grid_block, next_token_index)
+    """
+    end = len(tokens)
+    if start >= end:
+        return Block(), end
+
+    stats = instrumentation.active
+    if stats is not None:
+        stats.blocks_built += 1
+
+    index = OccupancyIndex()
+    first_word = tokens[start]
+    index.place(first_word, DIRECTION_DOWN, 0, 0)
+
+    if is_any_punctuation(first_word):
+        return Block(index.cells), start + 1
+
+    rows = max(len(first_word), max_rows or 0)
+    position = start + 1
+
+    while position < end:
+        word = tokens[position]
+        best = None
+
+        for direction, row, col in index.iter_crossing_starts(word):
+            last_row = row + (len(word) - 1 if direction == DIRECTION_DOWN else 0)
+            if row < 0 or last_row >= rows:
+                continue
+
+            crossings = index.count_crossings(word, direction, row, col)
+            if crossings < 0:
+                continue
+
+            key = (index.area_with(word, direction, row, col), -crossings, row, col)
+            if best is None or key < best[0]:
+                best = key, direction, row, col
+
+        if best is None:
+            break
+
+        _, direction, row, col = best
+        index.place(word, direction, row, col)
+        position += 1
+
+    return Block(index.cells), position
+
+
+def build_interlocked_grid_from_tokens(
+    tokens: TokenList, max_rows: int | None = None
+) -> Layout:
+    """
+    Build interlocking crossword grid from already tokenized phrase.
+
+    Args:
+        tokens: Tokens as produced by tokenize_with_end_punct
+        max_rows: Rows a block may span, see build_interlocked_block_at
+
+    Returns:
+        Tuple of (merged_grid, individual_blocks)
+    """
+    stats = instrumentation.active
+    if stats is not None:
+        start = perf_counter()
+
+    blocks: list[Grid] = []
+    position = 0
+
+    while position < len(tokens):
+        block, position = build_interlocked_block_at(tokens, position, max_rows)
+        blocks.append(block)
+
+    if stats is not None:
+        stats.add_phase_time(instrumentation.PHASE_BLOCKS, perf_counter() - start)
+
+    return merge_blocks(blocks), blocks
+
+
+def build_interlocked_grid(phrase: str, max_rows: int | None = None) -> Layout:
+    """
+    Build interlocking crossword grid from input phrase.
+
+    Args:
+        phrase: Input phrase to process
+        max_rows: Rows a block may span, see build_interlocked_block_at
+
+    Returns:
+        Tuple of (merged_grid, individual_blocks)
+    """
+    return build_interlocked_grid_from_tokens(tokenize_with_end_punct(phrase), max_rows)
@@ -0,0 +1,194 @@
+"""Paragraph mode: sentences laid out one under another.
+
+build_grid merges all blocks into one horizontal strip, which gets very wide
+for long texts. Here the text is split into sentences after every end
+punctuation token, the sentences are laid out independently (over a process
+pool) and their grids are stacked vertically:
+
+    grid, sentence_grids = build_paragraph(text, spacing=1, jobs=4)
+
+    python -m cross_word.paragraph text.txt -j 4
+"""
+
+import sys
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from cross_word.cross_words import Engine, build_grid_from_tokens, iter_build_grids
+from cross_word.utils import (
+    Grid,
+    TokenList,
+    get_grid_boundaries,
+    is_end_punctuation,
+    tokenize_with_end_punct,
+    write_grid,
+)
+
+
+class Paragraph(NamedTuple):
+    """Text laid out sentence by sentence."""
+
+    grid: Grid
+    sentence_grids: list[Grid]
+
+
+def split_sentences(tokens: TokenList) -> list[TokenList]:
+    """
+    Split tokens into sentences, each ending with an end punctuation token.
+
+    The last sentence may lack end punctuation.
+    """
+    sentences = []
+    start = 0
+
+    for index, token in enumerate(tokens):
+        if is_end_punctuation(token):
+            sentences.append(tokens[start : index + 1])
+            start = index + 1
+
+    if start < len(tokens):
+        sentences.append(tokens[start:])
+
+    return sentences
+
+
+def stack_grids(grids: Iterable[Grid], spacing: int = 1) -> Grid:
+    """
+    Stack grids top to bottom, aligned to the left.
+
+    Args:
+        grids: Grids to stack, empty grids are skipped
+        spacing: Number of empty rows between consecutive grids
+
+    Returns:
+        New grid with the cells of every grid in order
+    """
+    if spacing < 0:
+        raise ValueError(f"spacing must not be negative, got {spacing}")
+
+    stacked: Grid = {}
+    next_row = 0
+
+    for grid in grids:
+        if not grid:
+            continue
+
+        min_row, max_row, min_col, _ = get_grid_boundaries(grid)
+        row_offset = next_row - min_row
+        for (row, col), character in grid.items():
+            stacked[(row + row_offset, col - min_col)] = character
+        next_row += max_row - min_row + 1 + spacing
+
+    return stacked
+
+
+def build_paragraph_from_tokens(
+    tokens: TokenList,
+    spacing: int = 1,
+    jobs: int | None = None,
+    chunksize: int = 16,
+    engine: Engine = build_grid_from_tokens,
+) -> Paragraph:
+    """
+    Lay out already tokenized text sentence by sentence.
+
+    Args:
+        tokens: Tokens as produced by tokenize_with_end_punct
+        spacing: Number of empty rows between sentences
+        jobs: Number of worker processes (defaults to the CPU count).
+            With a single job, or a single chunk of sentences, sentences
+            are laid out in-process
+        chunksize: Number of sentences sent to a worker at once
+        engine: Function laying out the tokens of a sentence, e.g.
+            interlock.build_interlocked_grid_from_tokens
+
+    Returns:
+        Paragraph of the stacked grid and the grid of every sentence
+
+    Raises:
+        Exception: The first exception raised by the engine
+    """
+    sentences = split_sentences(tokens)
+    # A single chunk is not worth starting a pool for
+    if len(sentences) <= chunksize and (jobs is None or jobs > 1):
+        jobs = 1
+
+    grids = []
+    for result in iter_build_grids(sentences, jobs, chunksize, engine):
+        if isinstance(result, Exception):
+            raise result
+        grids.append(result[0])
+
+    return Paragraph(stack_grids(grids, spacing), grids)
+
+
+def build_paragraph(
+    text: str,
+    spacing: int = 1,
+    jobs: int | None = None,
+    chunksize: int = 16,
+    engine: Engine = build_grid_from_tokens,
+) -> Paragraph:
+    """
+    Lay out text sentence by sentence, see build_paragraph_from_tokens.
+
+    Returns:
+        Paragraph of the stacked grid and the grid of every sentence
+    """
+    return build_paragraph_from_tokens(
+        tokenize_with_end_punct(text), spacing, jobs, chunksize, engine
+    )
+
+
+def construct_parser():
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser("cross_word.paragraph")
+    parser.add_argument(
+        "input", nargs="?", default="-", help="Text file (stdin if omitted or '-')"
+    )
+    parser.add_argument(
+        "-s",
+        "--spacing",
+        type=int,
+        default=1,
+        help="Empty rows between sentences",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=0,
+        help="Number of worker processes (0 means one per CPU)",
+    )
+    parser.add_argument(
+        "--interlock",
+        action="store_true",
+        help="Lay sentences out as interlocking crosswords",
+    )
+    return parser
+
+
+if __name__ == "__main__":
+    parser = construct_parser()
+    args = parser.parse_args()
+    if args.jobs < 0:
+        parser.error("--jobs must not be negative")
+    if args.spacing < 0:
+        parser.error("--spacing must not be negative")
+
+    if args.input == "-":
+        text = sys.stdin.read()
+    else:
+        with open(args.input, encoding="utf-8") as file:
+            text = file.read()
+
+    engine = build_grid_from_tokens
+    if args.interlock:
+        from cross_word.interlock import build_interlocked_grid_from_tokens
+
+        engine = build_interlocked_grid_from_tokens
+
+    grid, _ = build_paragraph(text, args.spacing, jobs=args.jobs or None, engine=engine)
+    write_grid(grid, sys.stdout)
+    sys.stdout.write("\n")
@@ -0,0 +1,368 @@
+from array import array
+from collections.abc import ItemsView, Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from itertools import islice
+from typing import NamedTuple
+
+from cross_word import instrumentation
+from cross_word.cross_words import Block, Layout, merge_blocks
+from cross_word.utils import DIRECTION_ACROSS, DIRECTION_DOWN, Grid, place_word_in_grid
+
+# Integers stored per placement: row, column, 1 if down else 0, word length
+_RUN_FIELDS = 4
+
+
+class Placement(NamedTuple):
+    """Word written into a grid, as passed to place_word_in_grid."""
+
+    word: str
+    direction: str
+    row: int
+    col: int
+
+
+class PlacementBlock(Mapping[tuple[int, int], str]):
+    """
+    Grid stored as the placements of its words.
+
+    The words of all placements are kept in one string and their positions in
+    one integer array, a few bytes per word instead of a dictionary entry, a
+    key tuple and a character string per cell.
+
+    Behaves like the dictionary based Grid it describes, with the cells in
+    the order placing the words one by one into a dictionary would give.
+    Lookups, iteration and can_place_word (see utils.can_place_word) work on
+    the placements directly, so reading a block never keeps more than its
+    placements. Lookups scan the placements; code doing many of them can
+    keep a dictionary of the cells for a while with materialized().
+
+    Placements sharing a cell must agree on its character, as they do when
+    words are placed after checking them with can_place_word.
+
+    The layout engine builds Block dictionaries, which merging needs; blocks
+    are converted for storage, see CompactLayout.
+    """
+
+    __slots__ = ("_text", "_runs", "_cells", "_size")
+
+    def __init__(self, placements: Iterable[Placement] = ()):
+        words = []
+        runs = array("i")
+        for word, direction, row, col in placements:
+            words.append(word)
+            runs.extend((row, col, direction == DIRECTION_DOWN, len(word)))
+
+        self._text = "".join(words)
+        self._runs = runs
+        self._cells: Grid | None = None
+        self._size: int | None = None
+
+    @classmethod
+    def from_grid(cls, grid: Grid) -> "PlacementBlock":
+        """
+        Compact a grid, keeping the order of its cells.
+
+        Raises:
+            ValueError: If a cell does not hold a single character
+        """
+        return cls(grid_placements(grid))
+
+    @property
+    def placements(self) -> Iterator[Placement]:
+        """Iterate over the placements in order."""
+        text, runs = self._text, self._runs
+        offset = 0
+        for index in range(0, len(runs), _RUN_FIELDS):
+            row, col, down, length = runs[index : index + _RUN_FIELDS]
+            yield Placement(
+                text[offset : offset + length],
+                DIRECTION_DOWN if down else DIRECTION_ACROSS,
+                row,
+                col,
+            )
+            offset += length
+
+    def iter_cells(self) -> Iterator[tuple[tuple[int, int], str]]:
+        """Iterate over (cell, character) pairs, in dictionary order."""
+        if self._cells is not None:
+            yield from self._cells.items()
+            return
+
+        seen = set()
+        for word, direction, row, col in self.placements:
+            row_step, col_step = (1, 0) if direction == DIRECTION_DOWN else (0, 1)
+            for i, character in enumerate(word):
+                cell = (row + row_step * i, col + col_step * i)
+                if cell not in seen:
+                    seen.add(cell)
+                    yield cell, character
+
+    def to_dict(self) -> Grid:
+        """Return the cells as a new dictionary, without keeping them."""
+        if self._cells is not None:
+            return dict(self._cells)
+        cells: Grid = {}
+        for placement in self.placements:
+            place_word_in_grid(cells, *placement)
+        return cells
+
+    @contextmanager
+    def materialized(self) -> Iterator["PlacementBlock"]:
+        """
+        Keep the cells in a dictionary for fast lookups inside the context.
+
+        The dictionary is dropped on exit, leaving only the placements.
+        """
+        if self._cells is not None:
+            yield self
+            return
+
+        self._cells = self.to_dict()
+        try:
+            yield self
+        finally:
+            self._cells = None
+
+    def _lookup(self, key: object) -> str | None:
+        """Get the character of a cell from the placements, None if empty."""
+        if self._cells is not None:
+            return self._cells.get(key)
+        try:
+            row, col = key
+        except (TypeError, ValueError):
+            return None
+
+        text, runs = self._text, self._runs
+        offset = 0
+        for index in range(0, len(runs), _RUN_FIELDS):
+            run_row, run_col, down, length = runs[index : index + _RUN_FIELDS]
+            if down:
+                position = row - run_row
+                on_line = col == run_col
+            else:
+                position = col - run_col
+                on_line = row == run_row
+            if on_line and 0 <= position < length:
+                return text[offset + position]
+            offset += length
+        return None
+
+    def __getitem__(self, key: tuple[int, int]) -> str:
+        character = self._lookup(key)
+        if character is None:
+            raise KeyError(key)
+        return character
+
+    def get(self, key: tuple[int, int], default: str | None = None) -> str | None:
+        character = self._lookup(key)
+        return default if character is None else character
+
+    def __contains__(self, key: object) -> bool:
+        return self._lookup(key) is not None
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        return (cell for cell, _ in self.iter_cells())
+
+    def items(self) -> ItemsView[tuple[int, int], str]:
+        return _PlacementItems(self)
+
+    def __len__(self) -> int:
+        if self._size is None:
+            self._size = sum(1 for _ in self.iter_cells())
+        return self._size
+
+    def __sizeof__(self) -> int:
+        size = object.__sizeof__(self) + self._runs.__sizeof__()
+        return size + self._text.__sizeof__()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self.placements)!r})"
+
+    def can_place_word(
+        self,
+        word: str,
+        direction: str,
+        start_row: int,
+        start_col: int,
+        vertical_coords: set[tuple[int, int]] | None = None,
+    ) -> bool:
+        """Placement based implementation of utils.can_place_word."""
+        stats = instrumentation.active
+        down = direction == DIRECTION_DOWN
+        last = len(word) - 1
+        # Line of the candidate and the span it covers along that line
+        line, first = (start_col, start_row) if down else (start_row, start_col)
+        text, runs = self._text, self._runs
+        offset = 0
+        probed = 0
+
+        for index in range(0, len(runs), _RUN_FIELDS):
+            row, col, run_down, length = runs[index : index + _RUN_FIELDS]
+            run_line, run_first = (col, row) if run_down else (row, col)
+
+            if last < 0 or not length:
+                overlap = range(0)
+            elif run_down == down:
+                # Parallel: shared cells of the same line
+                overlap = (
+                    range(
+                        max(first, run_first),
+                        min(first + last, run_first + length - 1) + 1,
+                    )
+                    if run_line == line
+                    else range(0)
+                )
+            elif first <= run_line <= first + last and (
+                run_first <= line < run_first + length
+            ):
+                # Perpendicular: at most one crossing cell
+                overlap = range(run_line, run_line + 1)
+            else:
+                overlap = range(0)
+
+            for position in overlap:
+                if run_down == down:
+                    character = text[offset + position - run_first]
+                else:
+                    character = text[offset + line - run_first]
+                cell = (position, line) if down else (line, position)
+                probed += 1
+
+                if character != word[position - first] or (
+                    not down and vertical_coords and cell not in vertical_coords
+                ):
+                    if stats is not None:
+                        stats.cells_probed += probed
+                    return False
+
+            offset += length
+
+        if stats is not None:
+            stats.cells_probed += probed
+
+        return True
+
+    def place_word(
+        self, word: str, direction: str, start_row: int, start_col: int
+    ) -> None:
+        """Placement based implementation of utils.place_word_in_grid."""
+        if not word:
+            return
+        self._text += word
+        self._runs.extend(
+            (start_row, start_col, direction == DIRECTION_DOWN, len(word))
+        )
+        self._size = None
+        if self._cells is not None:
+            place_word_in_grid(self._cells, word, direction, start_row, start_col)
+
+
+class _PlacementItems(ItemsView):
+    """Items of a placement block, read from the placements in one pass."""
+
+    def __iter__(self) -> Iterator[tuple[tuple[int, int], str]]:
+        return self._mapping.iter_cells()
+
+
+def grid_placements(grid: Grid) -> list[Placement]:
+    """
+    Split a grid into placements that recreate it, including cell order.
+
+    Cells that follow each other in iteration order and lie next to each
+    other in one direction become one placement.
+
+    Raises:
+        ValueError: If a cell does not hold a single character
+    """
+    placements = []
+    characters: list[str] = []
+    start_row = start_col = 0
+    direction = None
+
+    for (row, col), character in grid.items():
+        if len(character) != 1:
+            raise ValueError(f"Cell {(row, col)} holds {character!r}")
+
+        length = len(characters)
+        if (
+            length
+            and direction != DIRECTION_ACROSS
+            and (row, col) == (start_row + length, start_col)
+        ):
+            direction = DIRECTION_DOWN
+        elif (
+            length
+            and direction != DIRECTION_DOWN
+            and (row, col) == (start_row, start_col + length)
+        ):
+            direction = DIRECTION_ACROSS
+        else:
+            if length:
+                placements.append(
+                    Placement(
+                        "".join(characters),
+                        direction or DIRECTION_ACROSS,
+                        start_row,
+                        start_col,
+                    )
+                )
+            characters = []
+            start_row, start_col, direction = row, col, None
+
+        characters.append(character)
+
+    if characters:
+        placements.append(
+            Placement(
+                "".join(characters), direction or DIRECTION_ACROSS, start_row, start_col
+            )
+        )
+
+    return placements
+
+
+class CompactLayout:
+    """
+    build_grid result packed for long-term storage, e.g. in caches.
+
+    Stores the placements of all blocks in a single PlacementBlock and the
+    number of placements of every block. The merged grid is not stored: it is
+    rebuilt with merge_blocks, which is how build_grid produced it.
+    """
+
+    __slots__ = ("_placements", "_block_sizes")
+
+    def __init__(self, layout: Layout):
+        placements = []
+        block_sizes = array("I")
+        for block in layout[1]:
+            block_placements = grid_placements(block)
+            placements.extend(block_placements)
+            block_sizes.append(len(block_placements))
+
+        self._placements = PlacementBlock(placements)
+        self._block_sizes = block_sizes
+
+    @property
+    def blocks(self) -> list[PlacementBlock]:
+        """Blocks of the layout, as new placement blocks."""
+        placements = self._placements.placements
+        return [PlacementBlock(islice(placements, size)) for size in self._block_sizes]
+
+    def to_layout(self) -> Layout:
+        """
+        Unpack the layout.
+
+        Returns:
+            Tuple of (merged_grid, individual_blocks), equal to the packed
+            one including cell order
+        """
+        blocks = [Block(block.iter_cells()) for block in self.blocks]
+        return merge_blocks(blocks), blocks
+
+    def __sizeof__(self) -> int:
+        return (
+            object.__sizeof__(self)
+            + self._placements.__sizeof__()
+            + self._block_sizes.__sizeof__()
+        )
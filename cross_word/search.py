@@ -0,0 +1,331 @@
+from collections.abc import Iterator
+from heapq import heappop, heappush
+from itertools import count
+from time import monotonic
+
+from cross_word.cross_words import (
+    Block,
+    Layout,
+    build_block_at,
+    build_grid_from_tokens,
+    build_letter_index,
+    iter_crossing_positions,
+    merge_blocks,
+)
+from cross_word.utils import (
+    DIRECTION_ACROSS,
+    DIRECTION_DOWN,
+    Grid,
+    TokenList,
+    get_grid_boundaries,
+    is_any_punctuation,
+    place_word_in_grid,
+    tokenize_with_end_punct,
+)
+
+# Layout quality objectives, smaller is better
+OBJECTIVE_AREA = "area"
+OBJECTIVE_WIDTH = "width"
+OBJECTIVE_BLOCKS = "blocks"
+
+Score = tuple[int, int]
+
+
+def layout_score(
+    grid: Grid, objective: str = OBJECTIVE_AREA, block_count: int = 0
+) -> Score:
+    """
+    Score a merged grid, smaller is better.
+
+    Scores never decrease when blocks are appended to a layout.
+
+    Args:
+        grid: Merged grid
+        objective: OBJECTIVE_AREA (bounding box area, then width),
+            OBJECTIVE_WIDTH (width, then bounding box area) or
+            OBJECTIVE_BLOCKS (block count, then bounding box area)
+        block_count: Number of blocks merged into the grid
+
+    Returns:
+        Comparable score tuple
+    """
+    if not grid:
+        return block_count, 0
+
+    min_row, max_row, min_col, max_col = get_grid_boundaries(grid)
+    width = max_col - min_col + 1
+    area = width * (max_row - min_row + 1)
+
+    if objective == OBJECTIVE_AREA:
+        return area, width
+    if objective == OBJECTIVE_WIDTH:
+        return width, area
+    if objective == OBJECTIVE_BLOCKS:
+        return block_count, area
+    raise ValueError(f"Unknown objective {objective!r}")
+
+
+def iter_block_variants(
+    tokens: TokenList, start: int, allow_early_break: bool = True
+) -> Iterator[tuple[Block, int]]:
+    """
+    Yield alternative blocks starting at a token.
+
+    The first variant is the block build_block_at would produce. The
+    others take later valid crossings and, with allow_early_break, end the
+    block before a token that could still be crossed, so that token becomes
+    the vertical word of the next block.
+
+    Args:
+        tokens: List of tokens to process
+        start: Index of the vertical word of the block
+        allow_early_break: Whether blocks may end before running out of crossings
+
+    Yields:
+        Tuples of (grid_block, next_token_index)
+    """
+    grid: Grid = {}
+    vertical_word = tokens[start]
+    place_word_in_grid(grid, vertical_word, DIRECTION_DOWN, 0, 0)
+
+    if is_any_punctuation(vertical_word):
+        yield Block(grid), start + 1
+        return
+
+    vertical_length = len(vertical_word)
+    vertical_coords = {(r, 0) for r in range(vertical_length)}
+    letter_rows = build_letter_index(vertical_word)
+
+    def extend(index: int, current_row_ptr: int) -> Iterator[tuple[Block, int]]:
+        if index == len(tokens):
+            yield Block(grid), index
+            return
+
+        word = tokens[index]
+        found_position = False
+
+        for row, col in iter_crossing_positions(
+            grid, word, vertical_coords, vertical_length, current_row_ptr, letter_rows
+        ):
+            found_position = True
+            new_cells = [
+                (row, col + i) for i in range(len(word)) if (row, col + i) not in grid
+            ]
+            place_word_in_grid(grid, word, DIRECTION_ACROSS, row, col)
+            yield from extend(index + 1, row + 1)
+            for cell in new_cells:
+                del grid[cell]
+
+        if not found_position or allow_early_break:
+            yield Block(grid), index
+
+    yield from extend(start + 1, 0)
+
+
+def search_layout(
+    tokens: TokenList,
+    objective: str = OBJECTIVE_AREA,
+    time_budget: float = 0.05,
+    allow_early_break: bool = True,
+) -> Layout:
+    """
+    Branch-and-bound search for the smallest layout of tokens.
+
+    Starts from the greedy layout and explores alternative blocks depth first.
+    The bounding box of merged leading blocks never shrinks when more blocks
+    are appended, so branches already scoring no better than the best known
+    layout are pruned. The search stops when the time budget runs out and
+    returns the best layout found so far.
+
+    Args:
+        tokens: Tokens as produced by tokenize_with_end_punct
+        objective: OBJECTIVE_AREA or OBJECTIVE_WIDTH
+        time_budget: Wall-clock budget in seconds
+        allow_early_break: Whether blocks may end before running out of crossings
+
+    Returns:
+        Tuple of (merged_grid, individual_blocks)
+    """
+    deadline = monotonic() + time_budget
+    best_grid, best_blocks = build_grid_from_tokens(tokens)
+    best_score = layout_score(best_grid, objective, len(best_blocks))
+
+    if not tokens:
+        return best_grid, best_blocks
+
+    blocks: list[Grid] = []
+    variants = [iter_block_variants(tokens, 0, allow_early_break)]
+
+    # Invariant: variants[i] enumerates alternatives for blocks[i]
+    while variants and monotonic() < deadline:
+        variant = next(variants[-1], None)
+        if variant is None:
+            variants.pop()
+            if blocks:
+                blocks.pop()
+            continue
+
+        block, next_start = variant
+        blocks.append(block)
+        grid = merge_blocks(blocks)
+        score = layout_score(grid, objective, len(blocks))
+
+        if score >= best_score:
+            blocks.pop()
+        elif next_start == len(tokens):
+            best_grid, best_blocks, best_score = grid, list(blocks), score
+            blocks.pop()
+        else:
+            variants.append(iter_block_variants(tokens, next_start, allow_early_break))
+
+    return best_grid, best_blocks
+
+
+def iter_greedy_blocks(tokens: TokenList, start: int) -> Iterator[tuple[Block, int]]:
+    """
+    Yield the blocks build_grid_from_tokens makes from a token onwards.
+
+    Yields:
+        Tuples of (grid_block, start_token_index)
+    """
+    while start < len(tokens):
+        block, next_start = build_block_at(tokens, start)
+        yield block, start
+        start = next_start
+
+
+def iter_token_layouts(
+    tokens: TokenList,
+    objective: str = OBJECTIVE_AREA,
+    allow_early_break: bool = True,
+) -> Iterator[Layout]:
+    """
+    Lazily yield distinct layouts of tokens, the greedy one first.
+
+    The greedy layout costs exactly a build_grid_from_tokens call. The others
+    are derived from layouts already yielded, k-best style: keep the blocks
+    before some position, swap in the next variant of the block there (every
+    valid crossing, see iter_block_variants) and complete the rest greedily.
+    Every sequence of block variants has exactly one such parent, so all
+    layouts are eventually reached, and every yielded layout adds at most one
+    candidate per block. Candidates are queued by score and a layout is only
+    yielded after the ones derived from it that score better: each is the
+    best layout found so far, not necessarily the best overall.
+
+    Args:
+        tokens: Tokens as produced by tokenize_with_end_punct
+        objective: OBJECTIVE_AREA, OBJECTIVE_WIDTH or OBJECTIVE_BLOCKS
+        allow_early_break: Whether blocks may end before running out of crossings
+
+    Yields:
+        Tuples of (merged_grid, individual_blocks) with distinct merged grids
+    """
+    grid, blocks = build_grid_from_tokens(tokens)
+    yield grid, blocks
+    if not tokens:
+        return
+
+    seen = {frozenset(grid.items())}
+    order = count()
+    # Entries are (score, order, merged_grid, blocks, block starts, position
+    # of the swapped block, its remaining variants), variants is None once
+    # the layouts derived from the entry are queued
+    queue = []
+
+    def push(blocks: list[Grid], starts: list[int], position: int, variants) -> None:
+        variant = next(variants, None)
+        if variant is None:
+            return
+        block, next_start = variant
+        child_blocks = blocks[:position] + [block]
+        child_starts = starts[: position + 1]
+        for block, start in iter_greedy_blocks(tokens, next_start):
+            child_blocks.append(block)
+            child_starts.append(start)
+        child_grid = merge_blocks(child_blocks)
+        heappush(
+            queue,
+            (
+                layout_score(child_grid, objective, len(child_blocks)),
+                next(order),
+                child_grid,
+                child_blocks,
+                child_starts,
+                position,
+                variants,
+            ),
+        )
+
+    def branch(blocks: list[Grid], starts: list[int], first: int) -> None:
+        # Blocks from first on were completed greedily, their first variant
+        # is the block already in place
+        for position in range(first, len(blocks)):
+            variants = iter_block_variants(tokens, starts[position], allow_early_break)
+            next(variants)
+            push(blocks, starts, position, variants)
+
+    branch(blocks, [start for _, start in iter_greedy_blocks(tokens, 0)], 0)
+
+    while queue:
+        score, _, grid, blocks, starts, position, variants = heappop(queue)
+        if variants is not None:
+            # Derive from the layout before yielding it, so derived layouts
+            # scoring better come first
+            push(blocks, starts, position, variants)
+            branch(blocks, starts, position + 1)
+            heappush(queue, (score, next(order), grid, blocks, starts, position, None))
+            continue
+
+        key = frozenset(grid.items())
+        if key not in seen:
+            seen.add(key)
+            yield grid, list(blocks)
+
+
+def iter_layouts(
+    phrase: str,
+    objective: str = OBJECTIVE_AREA,
+    allow_early_break: bool = True,
+) -> Iterator[Layout]:
+    """
+    Lazily yield distinct crossword layouts of a phrase.
+
+    The first layout is the one build_grid returns, the others follow
+    roughly in order of score (see iter_token_layouts), so
+    itertools.islice(iter_layouts(phrase), k) gives the greedy layout and
+    k - 1 good alternatives, each built on demand in polynomial time.
+
+    Args:
+        phrase: Input phrase to process
+        objective: OBJECTIVE_AREA, OBJECTIVE_WIDTH or OBJECTIVE_BLOCKS
+        allow_early_break: Whether blocks may end before running out of crossings
+
+    Yields:
+        Tuples of (merged_grid, individual_blocks)
+    """
+    return iter_token_layouts(
+        tokenize_with_end_punct(phrase), objective, allow_early_break
+    )
+
+
+def build_compact_grid(
+    phrase: str,
+    objective: str = OBJECTIVE_AREA,
+    time_budget: float = 0.05,
+    allow_early_break: bool = True,
+) -> Layout:
+    """
+    Build the smallest crossword grid found within a time budget.
+
+    Args:
+        phrase: Input phrase to process
+        objective: OBJECTIVE_AREA or OBJECTIVE_WIDTH
+        time_budget: Wall-clock budget in seconds
+        allow_early_break: Whether blocks may end before running out of crossings
+
+    Returns:
+        Tuple of (merged_grid, individual_blocks), never worse than build_grid
+    """
+    return search_layout(
+        tokenize_with_end_punct(phrase), objective, time_budget, allow_early_break
+    )
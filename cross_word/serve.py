@@ -0,0 +1,368 @@
+"""Asyncio HTTP layout service.
+
+Runs the layout engine behind a small stdlib-only HTTP/1.1 server:
+
+    python -m cross_word.serve --port 8000 --workers 4
+
+Endpoints:
+    GET  /layout?phrase=...&format=json|text
+    POST /layout?format=json|text   (body: the phrase, or {"phrase": ...})
+    GET  /health
+
+Concurrent requests for phrases with the same tokens share one computation,
+at most max_concurrency layouts are computed at once, and requests beyond
+max_pending waiting ones are rejected with 503.
+"""
+
+import asyncio
+import json
+import os
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from cross_word.cross_words import Layout, build_grid_from_tokens
+from cross_word.utils import render_grid, tokenize_with_end_punct
+
+MAX_LINE_SIZE = 8192
+MAX_HEADERS = 100
+MAX_BODY_SIZE = 64 * 1024
+
+
+class ServiceOverloaded(Exception):
+    """Raised when too many requests are already waiting for a layout."""
+
+
+class HTTPError(Exception):
+    """Raised to answer a request with an error status."""
+
+    def __init__(self, status: HTTPStatus, message: str | None = None):
+        super().__init__(message or status.phrase)
+        self.status = status
+
+
+class LayoutService:
+    """
+    Computes layouts in an executor, coalescing identical concurrent requests.
+
+    Args:
+        executor: Executor running the layout function (a thread pool if omitted)
+        max_concurrency: Maximum number of layouts computed at once
+        max_pending: Maximum number of requests waiting for a layout
+        build_function: Function building a layout from tokens
+    """
+
+    def __init__(
+        self,
+        executor: Executor | None = None,
+        max_concurrency: int = 4,
+        max_pending: int = 1024,
+        build_function: Callable[[list[str]], Layout] = build_grid_from_tokens,
+    ):
+        self.executor = executor or ThreadPoolExecutor(max_concurrency)
+        self.max_pending = max_pending
+        self.build_function = build_function
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._inflight: dict[tuple[str, ...], asyncio.Task[Layout]] = {}
+        self.pending = 0
+        self.computed = 0
+        self.coalesced = 0
+
+    async def layout(self, tokens: list[str]) -> Layout:
+        """
+        Get layout for tokens, sharing a computation already in flight.
+
+        The computation runs in a task of its own, so a cancelled request
+        does not cancel it for the requests sharing it.
+
+        Raises:
+            ServiceOverloaded: If max_pending requests are already waiting
+        """
+        key = tuple(tokens)
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        if self.pending >= self.max_pending:
+            raise ServiceOverloaded()
+
+        task = asyncio.create_task(self._compute(list(tokens)))
+        self._inflight[key] = task
+        self.pending += 1
+        task.add_done_callback(partial(self._finish, key))
+        return await asyncio.shield(task)
+
+    async def _compute(self, tokens: list[str]) -> Layout:
+        async with self._semaphore:
+            layout = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self.build_function, tokens
+            )
+        self.computed += 1
+        return layout
+
+    def _finish(self, key: tuple[str, ...], task: asyncio.Task) -> None:
+        self.pending -= 1
+        del self._inflight[key]
+        # Mark the exception as retrieved when nobody waits for it anymore
+        if not task.cancelled():
+            task.exception()
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def format_layout(phrase: str, tokens: list[str], layout: Layout) -> dict:
+    grid, blocks = layout
+    return {
+        "phrase": phrase,
+        "tokens": tokens,
+        "blocks": len(blocks),
+        "cells": [[row, col, character] for (row, col), character in grid.items()],
+        "rendered": render_grid(grid),
+    }
+
+
+def encode_response(
+    status: HTTPStatus, body: str, content_type: str, keep_alive: bool
+) -> bytes:
+    payload = body.encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        f"Content-Type: {content_type}; charset=utf-8\r\n"
+        f"Content-Length: {len(payload)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    )
+    return head.encode("ascii") + payload
+
+
+async def read_line(reader: asyncio.StreamReader, status: HTTPStatus) -> bytes:
+    """Read one line, answering with status if it is longer than MAX_LINE_SIZE."""
+    try:
+        line = await reader.readline()
+    except ValueError:
+        # The stream limit was exceeded before a line break was found
+        raise HTTPError(status) from None
+    if len(line) > MAX_LINE_SIZE:
+        raise HTTPError(status)
+    return line
+
+
+async def read_request(
+    reader: asyncio.StreamReader,
+) -> tuple[str, str, str, dict[str, str], bytes] | None:
+    """
+    Read one HTTP request.
+
+    Returns:
+        Tuple of (method, target, version, headers, body), or None on EOF
+    """
+    request_line = await read_line(reader, HTTPStatus.REQUEST_URI_TOO_LONG)
+    if not request_line:
+        return None
+
+    try:
+        method, target, version = request_line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line") from None
+
+    headers: dict[str, str] = {}
+    while True:
+        line = await read_line(reader, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+        if line in (b"\r\n", b"\n", b""):
+            break
+        if len(headers) >= MAX_HEADERS:
+            raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        length = -1
+    if length < 0:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+    if length > MAX_BODY_SIZE:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+    body = await reader.readexactly(length) if length else b""
+
+    return method.upper(), target, version.upper(), headers, body
+
+
+def wants_keep_alive(version: str, headers: dict[str, str]) -> bool:
+    """Whether the connection stays open: by default since HTTP/1.1 only."""
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.0":
+        return connection == "keep-alive"
+    return connection != "close"
+
+
+def extract_phrase(method: str, query: dict[str, list[str]], body: bytes) -> str:
+    if method == "GET":
+        phrases = query.get("phrase")
+        if not phrases:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Missing phrase parameter")
+        return phrases[0]
+
+    if method != "POST":
+        raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED)
+
+    try:
+        text = body.decode("utf-8")
+    except UnicodeDecodeError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be UTF-8") from None
+
+    if text.lstrip().startswith("{"):
+        try:
+            phrase = json.loads(text).get("phrase")
+        except (json.JSONDecodeError, AttributeError):
+            phrase = None
+        if not isinstance(phrase, str):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, 'Expected {"phrase": "..."}')
+        return phrase
+
+    return text
+
+
+async def handle_request(
+    service: LayoutService, method: str, target: str, body: bytes
+) -> tuple[HTTPStatus, str, str]:
+    """Process one request, returning (status, body, content_type)."""
+    url = urlsplit(target)
+    query = parse_qs(url.query)
+
+    if url.path == "/health":
+        return HTTPStatus.OK, "ok", "text/plain"
+    if url.path != "/layout":
+        raise HTTPError(HTTPStatus.NOT_FOUND)
+
+    output_format = query.get("format", ["json"])[0]
+    if output_format not in ("json", "text"):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "format must be json or text")
+
+    phrase = extract_phrase(method, query, body)
+    tokens = tokenize_with_end_punct(phrase)
+
+    try:
+        layout = await service.layout(tokens)
+    except ServiceOverloaded:
+        raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, "Too many pending requests")
+
+    if output_format == "text":
+        return HTTPStatus.OK, render_grid(layout[0]), "text/plain"
+
+    document = format_layout(phrase, tokens, layout)
+    return HTTPStatus.OK, json.dumps(document, ensure_ascii=False), "application/json"
+
+
+async def handle_connection(
+    service: LayoutService,
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+) -> None:
+    """Serve requests of one keep-alive connection."""
+    try:
+        while True:
+            keep_alive = False
+            try:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                method, target, version, headers, body = request
+                keep_alive = wants_keep_alive(version, headers)
+                status, text, content_type = await handle_request(
+                    service, method, target, body
+                )
+            except HTTPError as error:
+                status, text, content_type = error.status, str(error), "text/plain"
+            except asyncio.IncompleteReadError:
+                break
+            except Exception:
+                status = HTTPStatus.INTERNAL_SERVER_ERROR
+                text, content_type = status.phrase, "text/plain"
+
+            writer.write(encode_response(status, text, content_type, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(
+    service: LayoutService, host: str = "127.0.0.1", port: int = 8000
+) -> asyncio.Server:
+    """Start listening; the caller owns the returned server."""
+    return await asyncio.start_server(
+        lambda reader, writer: handle_connection(service, reader, writer),
+        host,
+        port,
+        limit=MAX_LINE_SIZE * 2,
+    )
+
+
+async def serve(
+    host: str, port: int, workers: int, max_concurrency: int, max_pending: int
+) -> None:
+    executor = ProcessPoolExecutor(workers) if workers else None
+    service = LayoutService(executor, max_concurrency, max_pending)
+    server = await start_server(service, host, port)
+
+    address = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"Serving layouts on {address}", flush=True)
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.shutdown()
+
+
+def construct_parser():
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser("cross_word.serve")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind")
+    parser.add_argument("-p", "--port", type=int, default=8000, help="Port to bind")
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes computing layouts (0 computes in threads)",
+    )
+    parser.add_argument(
+        "-c",
+        "--max-concurrency",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Layouts computed at once",
+    )
+    parser.add_argument(
+        "--max-pending",
+        type=int,
+        default=1024,
+        help="Requests waiting for a layout before answering 503",
+    )
+    return parser
+
+
+if __name__ == "__main__":
+    args = construct_parser().parse_args()
+    try:
+        asyncio.run(
+            serve(
+                args.host,
+                args.port,
+                args.workers,
+                args.max_concurrency,
+                args.max_pending,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,186 @@
+"""Bounded memory layout of very large documents.
+
+build_grid keeps the whole text, its tokens, all blocks and the merged grid
+in memory before rendering anything. Here every stage is a generator:
+
+    chunks -> iter_tokens -> iter_blocks -> iter_merged_blocks -> iter_band_lines
+
+Blocks are merged into the same strip build_grid produces, and the strip is
+rendered in bands of at most max_width columns, wrapped between blocks and
+separated by an empty line. A band is printed as soon as the first block
+that does not fit is built, so memory is bounded by the band width and the
+largest block, not by the document:
+
+    python -m cross_word.streaming book.txt -w 40
+"""
+
+import sys
+from collections.abc import Iterable, Iterator
+from functools import partial
+from typing import TextIO
+
+from cross_word.cross_words import Block, build_block_at, merge_block
+from cross_word.utils import Grid, iter_grid_lines, iter_tokens
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_WIDTH = 40
+
+
+def iter_blocks(tokens: Iterable[str]) -> Iterator[Block]:
+    """
+    Build consecutive blocks from a stream of tokens, like build_grid.
+
+    A block takes at most as many tokens as its vertical word has letters,
+    so only that many tokens are read ahead.
+    """
+    tokens = iter(tokens)
+    buffer: list[str] = []
+
+    for token in tokens:
+        buffer.append(token)
+        while buffer and len(buffer) > len(buffer[0]):
+            block, used = build_block_at(buffer)
+            del buffer[:used]
+            yield block
+
+    while buffer:
+        block, used = build_block_at(buffer)
+        del buffer[:used]
+        yield block
+
+
+def iter_merged_blocks(blocks: Iterable[Grid]) -> Iterator[Grid]:
+    """
+    Merge a stream of blocks, like merge_blocks.
+
+    Placing a block depends only on its direct neighbors, so blocks are
+    merged through a window of three with a running column offset.
+
+    Yields:
+        Cells of every block at their position in the merged grid, the
+        merged grid being all of them in order
+    """
+    window: list[Grid] = []
+    col_offset = 0
+
+    for block in blocks:
+        window.append(block)
+        if len(window) < 2:
+            continue
+        if len(window) > 3:
+            del window[0]
+
+        placed: Grid = {}
+        col_offset = merge_block(placed, window, len(window) - 2, col_offset)
+        yield placed
+
+    if window:
+        placed = {}
+        merge_block(placed, window, len(window) - 1, col_offset)
+        yield placed
+
+
+def iter_band_lines(
+    placed_blocks: Iterable[Grid], max_width: int | None = DEFAULT_MAX_WIDTH
+) -> Iterator[str]:
+    """
+    Render merged blocks in bands of at most max_width columns.
+
+    Bands end between blocks, a block wider than max_width gets a band of
+    its own. Bands are separated by an empty line. With max_width None the
+    whole strip is one band, rendered like render_grid, once all blocks
+    are merged.
+
+    Yields:
+        Lines of the rendering, without line breaks
+    """
+    if max_width is not None and max_width < 1:
+        raise ValueError(f"max_width must be positive, got {max_width}")
+
+    band: Grid = {}
+    band_min_col = 0
+
+    for placed in placed_blocks:
+        if not placed:
+            continue
+
+        cols = [col for _, col in placed]
+        if not band:
+            band_min_col = min(cols)
+        elif max_width is not None and max(cols) - band_min_col >= max_width:
+            yield from iter_grid_lines(band)
+            yield ""
+            band = {}
+            band_min_col = min(cols)
+
+        band.update(placed)
+
+    yield from iter_grid_lines(band)
+
+
+def iter_document_lines(
+    chunks: Iterable[str], max_width: int | None = DEFAULT_MAX_WIDTH
+) -> Iterator[str]:
+    """
+    Lay out a document arriving in chunks, rendering it in bands.
+
+    Args:
+        chunks: Consecutive pieces of the text
+        max_width: Columns per band, see iter_band_lines
+
+    Yields:
+        Lines of the rendering, without line breaks
+    """
+    return iter_band_lines(
+        iter_merged_blocks(iter_blocks(iter_tokens(chunks))), max_width
+    )
+
+
+def write_document(
+    stream: TextIO,
+    out: TextIO,
+    max_width: int | None = DEFAULT_MAX_WIDTH,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> None:
+    """Lay out a text stream chunk by chunk, writing lines as they are ready."""
+    chunks = iter(partial(stream.read, chunk_size), "")
+    for line in iter_document_lines(chunks, max_width):
+        out.write(line + "\n")
+
+
+def construct_parser():
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser("cross_word.streaming")
+    parser.add_argument(
+        "input", nargs="?", default="-", help="Text file (stdin if omitted or '-')"
+    )
+    parser.add_argument(
+        "-w",
+        "--max-width",
+        type=int,
+        default=DEFAULT_MAX_WIDTH,
+        help="Columns per band, 0 renders one band like render_grid",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Characters read at once",
+    )
+    return parser
+
+
+if __name__ == "__main__":
+    parser = construct_parser()
+    args = parser.parse_args()
+    if args.max_width < 0:
+        parser.error("--max-width must not be negative")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be positive")
+
+    if args.input == "-":
+        write_document(sys.stdin, sys.stdout, args.max_width or None, args.chunk_size)
+    else:
+        with open(args.input, encoding="utf-8") as file:
+            write_document(file, sys.stdout, args.max_width or None, args.chunk_size)
@@ -1,4 +1,9 @@
 import re
+from collections.abc import Iterable, Iterator
+from time import perf_counter
+from typing import TextIO
+
+from cross_word import instrumentation
 
 # Type aliases for better readability
 Grid = dict[tuple[int, int], str]
@@ -14,7 +19,13 @@ DIRECTION_DOWN = "down"
 DIRECTION_ACROSS = "across"
 
 WORD_PATTERN = re.compile(r"[\wА-Яа-яЁё]")
-TOKENIZE_PATTERN = re.compile(r"[А-Яа-яЁё\w0-9-]+|[^\s]")
+# Single-pass tokenizer. A word (starting with a letter or digit, may contain
+# hyphens) captures the end punctuation that follows it, if any. Anything else
+# (hyphen-led runs and single non-space characters) is an "other" token
+TOKENIZE_PATTERN = re.compile(
+    r"(\w[\w-]*)(?:\s*([%s]))?|(-[\w-]*|\S)"
+    % re.escape("".join(sorted(END_PUNCTUATION)))
+)
 
 
 def tokenize_with_end_punct(phrase: str) -> TokenList:
@@ -27,27 +38,54 @@ def tokenize_with_end_punct(phrase: str) -> TokenList:
     Returns:
         List of tokens with punctuation properly attached to words
     """
-    raw_tokens = TOKENIZE_PATTERN.findall(phrase)
-    tokens: TokenList = []
-    i = 0
-
-    while i < len(raw_tokens):
-        current_token = raw_tokens[i]
-
-        if is_word(current_token):
-            # Check if next token is end punctuation to attach
-            if i + 1 < len(raw_tokens) and is_end_punctuation(raw_tokens[i + 1]):
-                tokens.append((current_token + raw_tokens[i + 1]).upper())
-                i += 2
-                continue
-            tokens.append(current_token.upper())
-        else:
-            tokens.append(current_token)
-        i += 1
+    stats = instrumentation.active
+    if stats is not None:
+        start = perf_counter()
+
+    tokens = [
+        (word + end_punctuation).upper() if word else other
+        for word, end_punctuation, other in TOKENIZE_PATTERN.findall(phrase)
+    ]
+
+    if stats is not None:
+        stats.add_phase_time(instrumentation.PHASE_TOKENIZE, perf_counter() - start)
 
     return tokens
 
 
+def iter_tokens(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Tokenize text arriving in chunks, like tokenize_with_end_punct.
+
+    Tokens and their end punctuation may be split across chunks. Only the
+    last token of the text read so far may still grow, so just the text from
+    its start on is kept in memory.
+
+    Args:
+        chunks: Consecutive pieces of the input text
+
+    Yields:
+        Tokens with punctuation properly attached to words
+    """
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        last = None
+        for match in TOKENIZE_PATTERN.finditer(buffer):
+            if last is not None:
+                yield _match_token(last)
+            last = match
+        buffer = buffer[last.start() :] if last is not None else ""
+
+    for match in TOKENIZE_PATTERN.finditer(buffer):
+        yield _match_token(match)
+
+
+def _match_token(match: re.Match) -> str:
+    word, end_punctuation, other = match.groups("")
+    return (word + end_punctuation).upper() if word else other
+
+
 def is_word(token: str) -> bool:
     """Check if a token is a word (contains letters or numbers)."""
     return WORD_PATTERN.match(token)
@@ -85,6 +123,16 @@ def can_place_word(
     Returns:
         True if word can be placed without conflicts
     """
+    stats = instrumentation.active
+    if stats is not None:
+        stats.can_place_calls += 1
+
+    if not isinstance(grid, dict):
+        # Alternative grid implementations may provide their own check
+        fast_check = getattr(grid, "can_place_word", None)
+        if fast_check is not None:
+            return fast_check(word, direction, start_row, start_col, vertical_coords)
+
     row_step, col_step = (1, 0) if direction == DIRECTION_DOWN else (0, 1)
 
     for i, character in enumerate(word):
@@ -92,15 +140,18 @@ def can_place_word(
         current_col = start_col + col_step * i
 
         if (current_row, current_col) in grid:
-            if grid[(current_row, current_col)] != character:
-                return False
-            if (
+            if grid[(current_row, current_col)] != character or (
                 direction == DIRECTION_ACROSS
                 and vertical_coords
                 and (current_row, current_col) not in vertical_coords
             ):
+                if stats is not None:
+                    stats.cells_probed += i + 1
                 return False
 
+    if stats is not None:
+        stats.cells_probed += len(word)
+
     return True
 
 
@@ -117,6 +168,13 @@ def place_word_in_grid(
         start_row: Starting row position
         start_col: Starting column position
     """
+    if not isinstance(grid, dict):
+        # Alternative grid implementations may provide their own placement
+        fast_place = getattr(grid, "place_word", None)
+        if fast_place is not None:
+            fast_place(word, direction, start_row, start_col)
+            return
+
     row_step, col_step = (1, 0) if direction == DIRECTION_DOWN else (0, 1)
 
     for i, character in enumerate(word):
@@ -134,6 +192,77 @@ def get_grid_boundaries(grid: Grid) -> tuple[int, int, int, int]:
     return min(rows), max(rows), min(cols), max(cols)
 
 
+def iter_grid_lines(grid: Grid) -> Iterator[str]:
+    """
+    Yield printable lines of a grid, top to bottom.
+
+    Only occupied cells are visited: they are grouped by row once, and each
+    line is assembled from characters and the gaps between them, so the cost
+    does not depend on how many cells of the bounding box are empty.
+
+    Args:
+        grid: Grid to render
+
+    Yields:
+        Lines of the grid representation, without line breaks
+    """
+    if not grid:
+        return
+
+    rows: dict[int, list[tuple[int, str]]] = {}
+    for (row, col), character in grid.items():
+        rows.setdefault(row, []).append((col, character))
+
+    min_row, max_row = min(rows), max(rows)
+    min_col = min(col for cells in rows.values() for col, _ in cells)
+
+    for row in range(min_row, max_row + 1):
+        cells = rows.pop(row, None)
+        if not cells:
+            yield ""
+            continue
+
+        cells.sort()
+        # Every cell takes one character plus a separating space
+        first_col = cells[0][0]
+        if row == min_row and first_col != min_col:
+            parts = [ZERO_WIDTH_SPACE + " " * (2 * (first_col - min_col) - 1)]
+        else:
+            parts = [" " * (2 * (first_col - min_col))]
+
+        previous_col = first_col
+        for col, character in cells:
+            if col != first_col:
+                parts.append(" " * (2 * (col - previous_col) - 1))
+            parts.append(character)
+            previous_col = col
+
+        yield "".join(parts).rstrip()
+
+
+def write_grid(grid: Grid, stream: TextIO) -> None:
+    """
+    Write printable representation of a grid to a text stream row by row.
+
+    Writes the same text as render_grid returns, without a trailing newline.
+
+    Args:
+        grid: Grid to render
+        stream: Text stream to write to
+    """
+    stats = instrumentation.active
+    if stats is not None:
+        start = perf_counter()
+
+    for index, line in enumerate(iter_grid_lines(grid)):
+        if index:
+            stream.write("\n")
+        stream.write(line)
+
+    if stats is not None:
+        stats.add_phase_time(instrumentation.PHASE_RENDER, perf_counter() - start)
+
+
 def render_grid(grid: Grid) -> str:
     """
     Convert grid dictionary to printable string representation.
@@ -144,21 +273,16 @@ def render_grid(grid: Grid) -> str:
     Returns:
         String representation of the grid
     """
-    if not grid:
-        return ""
+    stats = instrumentation.active
+    if stats is not None:
+        start = perf_counter()
 
-    min_row, max_row, min_col, max_col = get_grid_boundaries(grid)
-    lines = []
+    rendered = "\n".join(iter_grid_lines(grid))
 
-    for row in range(min_row, max_row + 1):
-        line = []
-        for col in range(min_col, max_col + 1):
-            line.append(grid.get((row, col), " "))
-        if row == min_row and line[0] == " ":
-            line[0] = ZERO_WIDTH_SPACE
-        lines.append(" ".join(line).rstrip())
-
-    return "\n".join(lines)
+    if stats is not None:
+        stats.add_phase_time(instrumentation.PHASE_RENDER, perf_counter() - start)
+
+    return rendered
 
 
 def get_first_dict_item[Key, Value](dictionary: dict[Key, Value]) -> tuple[Key, Value]:
@@ -0,0 +1,60 @@
+import sys
+import os
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+np = pytest.importorskip("numpy")
+
+from cross_word.arrays import export_grids, import_grids
+from cross_word.cross_words import build_grid, build_grids
+from cross_word.dense_grid import DenseGrid
+
+PHRASES = [
+    "Циферки — самое важное",
+    "Смешно тебе? А мне нет",
+    "",
+    "Лошадь может дожить до конца своей жизни",
+]
+
+
+class TestArrayExport:
+    """Tests for the NumPy batch export"""
+
+    def test_round_trip(self):
+        layouts = build_grids(PHRASES, jobs=1)
+        batch = export_grids(layouts)
+        assert batch.codes.shape[0] == len(PHRASES)
+        assert batch.codes.dtype == np.uint16
+        assert import_grids(batch) == [grid for grid, _ in layouts]
+
+    def test_shapes_and_origins(self):
+        grid = {(-1, 2): "А", (0, 2): "Б", (0, 3): "В"}
+        batch = export_grids([grid, {}])
+        assert batch.alphabet == ("", "А", "Б", "В")
+        assert batch.origins.tolist() == [[-1, 2], [0, 0]]
+        assert batch.shapes.tolist() == [[2, 2], [0, 0]]
+        assert batch.codes[0].tolist() == [[1, 0], [2, 3]]
+        assert not batch.codes[1].any()
+
+    def test_shared_alphabet(self):
+        first = export_grids([build_grid("КОТ")])
+        second = export_grids([{(0, 0): "Т", (0, 1): "О"}], first.alphabet)
+        assert second.alphabet == first.alphabet
+        assert [first.alphabet[code] for code in second.codes[0, 0]] == ["Т", "О"]
+        with pytest.raises(ValueError):
+            export_grids([{(0, 0): "Я"}], first.alphabet)
+
+    def test_accepts_dense_grids(self):
+        grid = build_grid("Живи здесь сейчас")[0]
+        batch = export_grids([DenseGrid(grid)])
+        assert import_grids(batch) == [grid]
+
+    def test_rejects_multi_character_cells(self):
+        with pytest.raises(ValueError):
+            export_grids([{(0, 0): "АБ"}])
+
+    def test_empty_batch(self):
+        batch = export_grids([])
+        assert batch.codes.shape == (0, 0, 0)
+        assert import_grids(batch) == []
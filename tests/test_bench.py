@@ -0,0 +1,50 @@
+import sys
+import os
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from cross_word.bench import (
+    BENCH_FORMAT_VERSION,
+    compare_reports,
+    run_benchmarks,
+    synthetic_corpus,
+)
+
+
+def make_report(samples):
+    return {
+        "version": BENCH_FORMAT_VERSION,
+        "results": {"examples/build_grid": {"phrases": 18, "samples": samples}},
+    }
+
+
+class TestBench:
+    """Tests for the benchmark module"""
+
+    def test_synthetic_corpus_is_reproducible(self):
+        assert synthetic_corpus(20) == synthetic_corpus(20)
+        assert len(synthetic_corpus(20)) == 20
+
+    def test_run_benchmarks_report(self):
+        report = run_benchmarks([5], repeat=2)
+        assert report["version"] == BENCH_FORMAT_VERSION
+        assert "synthetic-5/merge_blocks" in report["results"]
+        assert len(report["results"]["examples/build_grid"]["samples"]) == 2
+
+    def test_significant_slowdown_is_regression(self):
+        baseline = make_report([1.0, 1.01, 0.99, 1.0, 1.02])
+        current = make_report([1.5, 1.51, 1.49, 1.5, 1.52])
+        (comparison,) = compare_reports(baseline, current)
+        assert comparison.regression
+        assert comparison.ratio == pytest.approx(1.5, rel=0.01)
+
+    def test_noise_is_not_regression(self):
+        baseline = make_report([1.0, 1.3, 0.8, 1.1, 0.9])
+        current = make_report([1.2, 0.9, 1.3, 1.0, 1.1])
+        (comparison,) = compare_reports(baseline, current)
+        assert not comparison.regression
+
+    def test_unknown_baseline_version(self):
+        with pytest.raises(ValueError):
+            compare_reports({"version": -1}, make_report([1.0]))
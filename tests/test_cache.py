@@ -0,0 +1,58 @@
+import sys
+import os
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from cross_word.cache import CacheStats, LayoutCache
+from cross_word.cross_words import build_grid
+
+
+class TestLayoutCache:
+    """Tests for the in-process LRU layout cache"""
+
+    def test_normalized_phrases_share_entry(self):
+        cache = LayoutCache(maxsize=4)
+        first = cache.build_grid("Живи здесь сейчас")
+        second = cache.build_grid("  живи   ЗДЕСЬ\tсейчас ")
+        assert first == second == build_grid("Живи здесь сейчас")
+        assert cache.stats == CacheStats(
+            hits=1, misses=1, evictions=0, size=1, maxsize=4
+        )
+
+    def test_lru_eviction(self):
+        cache = LayoutCache(maxsize=2)
+        cache.build_grid("А")
+        cache.build_grid("Б")
+        cache.build_grid("А")
+        cache.build_grid("В")
+        assert "А" in cache and "В" in cache and "Б" not in cache
+        assert cache.stats.evictions == 1
+
+    def test_results_are_copies(self):
+        cache = LayoutCache()
+        grid, blocks = cache.build_grid("Привет, мир!")
+        grid.clear()
+        blocks[0][(100, 100)] = "X"
+        blocks.clear()
+        assert cache.build_grid("Привет, мир!") == build_grid("Привет, мир!")
+
+    def test_clear(self):
+        cache = LayoutCache()
+        cache.build_grid("А")
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.stats.misses == 0
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            LayoutCache(maxsize=0)
+
+    def test_compact_entries(self):
+        cache = LayoutCache(maxsize=4, compact=True)
+        phrase = "Развлекаюсь, наблюдая за хаосом"
+        miss = cache.build_grid(phrase)
+        hit = cache.build_grid(phrase)
+        assert miss == hit == build_grid(phrase)
+        assert list(hit[0].items()) == list(miss[0].items())
+        assert cache.stats.hits == 1
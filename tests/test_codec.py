@@ -0,0 +1,52 @@
+import sys
+import os
+import pickle
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from cross_word.codec import decode_grid, decode_layout, encode_grid, encode_layout
+from cross_word.cross_words import build_grid
+
+
+class TestCodec:
+    """Tests for the binary grid codec"""
+
+    @pytest.mark.parametrize(
+        "grid",
+        [
+            {},
+            {(0, 0): "A"},
+            {(-5, 300): "Ё", (1000, -70_000): "—", (0, 0): "​"},
+        ],
+    )
+    def test_grid_round_trip(self, grid):
+        decoded = decode_grid(encode_grid(grid))
+        assert list(decoded.items()) == list(grid.items())
+
+    def test_layout_round_trip_keeps_order(self):
+        grid, blocks = build_grid("Люди с голубыми глазами, видят лучше слепых!")
+        decoded_grid, decoded_blocks = decode_layout(encode_layout((grid, blocks)))
+        assert list(decoded_grid.items()) == list(grid.items())
+        assert [list(b.items()) for b in decoded_blocks] == [
+            list(b.items()) for b in blocks
+        ]
+
+    def test_decode_from_memoryview_slice(self):
+        layout = build_grid("Смешно тебе? А мне нет")
+        payload = encode_layout(layout)
+        buffer = bytearray(b"xx" + payload + b"yy")
+        assert decode_layout(memoryview(buffer)[2:-2]) == layout
+
+    def test_smaller_than_pickle(self):
+        layout = build_grid("Эйнштейн не мог говорить до рождения")
+        assert len(encode_layout(layout)) * 3 < len(pickle.dumps(layout)) * 2
+
+    def test_rejects_invalid_payloads(self):
+        payload = encode_grid({(0, 0): "A"})
+        with pytest.raises(ValueError):
+            decode_grid(b"nope" + payload)
+        with pytest.raises(ValueError):
+            decode_layout(payload)
+        with pytest.raises(ValueError):
+            decode_grid(payload[:-1])
@@ -1,13 +1,21 @@
 import sys
 import os
+import io
+import time
 import pytest
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from cross_word.cross_words import (
+    Block,
     build_grid,
+    build_grids,
     tokenize_with_end_punct,
+    build_block_at,
+    build_grid_from_tokens,
     build_single_block,
+    build_letter_index,
+    find_best_crossing_position,
     merge_blocks,
 )
 from cross_word.utils import (
@@ -16,6 +24,7 @@ from cross_word.utils import (
     DIRECTION_DOWN,
     DIRECTION_ACROSS,
     render_grid,
+    write_grid,
 )
 
 
@@ -45,6 +54,12 @@ class TestTokenization:
     def test_tokenize_with_numbers(self):
         assert tokenize_with_end_punct("Version 2.0!") == ["VERSION", "2.", "0!"]
 
+    def test_tokenize_attaches_punctuation_across_spaces(self):
+        assert tokenize_with_end_punct("Нет ! Да\t?") == ["НЕТ!", "ДА?"]
+
+    def test_tokenize_keeps_hyphen_led_tokens(self):
+        assert tokenize_with_end_punct("-нет! и -") == ["-нет", "!", "И", "-"]
+
 
 class TestGridPlacement:
     """Tests for word placement and grid operations"""
@@ -120,10 +135,89 @@ class TestBlockBuilding:
         assert remaining == ["!", "WORLD"]
         assert len(grid) == 5  # Only "HELLO" placed
 
+    def test_build_block_at_index(self):
+        tokens = ["HELLO", "!", "WORLD", "LOW"]
+        assert build_block_at(tokens, 1) == ({(0, 0): "!"}, 2)
+        grid, end = build_block_at(tokens, 2)
+        assert end == 4 and len(grid) == 7
+        assert build_block_at(tokens, 4) == ({}, 4)
+
+
+class TestCrossingSearch:
+    """Tests for find_best_crossing_position and its letter index"""
+
+    def make_vertical(self, word):
+        grid = {}
+        place_word_in_grid(grid, word, DIRECTION_DOWN, 0, 0)
+        return grid, {(r, 0) for r in range(len(word))}
+
+    def test_build_letter_index(self):
+        assert build_letter_index("АБРАКАДАБРА") == {
+            "А": [0, 3, 5, 7, 10],
+            "Б": [1, 8],
+            "Р": [2, 9],
+            "К": [4],
+            "Д": [6],
+        }
+
+    def test_first_match_from_row_pointer(self):
+        grid, coords = self.make_vertical("TESTER")
+        index = build_letter_index("TESTER")
+        assert find_best_crossing_position(grid, "SET", coords, 6, 0, index) == (
+            True,
+            1,
+            -1,
+        )
+        assert find_best_crossing_position(grid, "SET", coords, 6, 2, index) == (
+            True,
+            2,
+            0,
+        )
+
+    def test_index_matches_full_scan(self):
+        grid, coords = self.make_vertical("TESTER")
+        for word in ("RESET", "STREET", "XYZ", "TT"):
+            for row_ptr in range(7):
+                assert find_best_crossing_position(
+                    grid, word, coords, 6, row_ptr, build_letter_index("TESTER")
+                ) == find_best_crossing_position(grid, word, coords, 6, row_ptr)
+
+    def test_no_shared_letters(self):
+        grid, coords = self.make_vertical("TEST")
+        assert find_best_crossing_position(grid, "ABC", coords, 4, 0) == (
+            False,
+            0,
+            0,
+        )
+
 
 class TestBlockMerging:
     """Tests for merge_blocks function"""
 
+    def test_block_metadata(self):
+        block, _ = build_single_block(["TEST", "EXAMPLE", "TO"])
+        assert isinstance(block, Block)
+        assert (block.min_row, block.max_row) == (0, 3)
+        assert (block.min_col, block.max_col) == (0, 6)
+        assert block.starts_with_word
+        # "TO" adds a single cell next to the vertical word
+        assert block.multi_cell_rows == (1,)
+        assert not Block({(0, 0): ","}).starts_with_word
+        assert Block().multi_cell_rows == ()
+
+    def test_block_metadata_matches_cells(self):
+        phrase = "Развлекаюсь, наблюдая за хаосом! Я ищу то, что скрыто в тени."
+        for block in build_grid(phrase)[1]:
+            scanned = Block(block)
+            for name in Block.__slots__:
+                assert getattr(block, name) == getattr(scanned, name), name
+
+    def test_merge_plain_dicts_like_blocks(self):
+        _, blocks = build_grid("Развлекаюсь, наблюдая за хаосом!")
+        merged = merge_blocks(blocks)
+        plain = merge_blocks([dict(block) for block in blocks])
+        assert list(plain.items()) == list(merged.items())
+
     def test_merge_empty_blocks(self):
         assert merge_blocks([]) == {}
 
@@ -165,6 +259,30 @@ class TestGridBuilding:
         assert "," in grid.values() or "!" in grid.values()
 
 
+class TestBatchBuilding:
+    """Tests for build_grids function"""
+
+    PHRASES = ["Привет, мир!", "Живи здесь сейчас", "", "TEST EXAMPLE"]
+
+    def test_in_process_matches_build_grid(self):
+        results = build_grids(self.PHRASES, jobs=1)
+        assert results == [build_grid(phrase) for phrase in self.PHRASES]
+
+    def test_process_pool_keeps_input_order(self):
+        results = build_grids(self.PHRASES * 3, jobs=2, chunksize=2)
+        assert results == [build_grid(phrase) for phrase in self.PHRASES * 3]
+
+    def test_failing_phrase_does_not_lose_batch(self):
+        results = build_grids(["TEST", None, "CODE"], jobs=1)
+        assert results[0] == build_grid("TEST")
+        assert isinstance(results[1], TypeError)
+        assert results[2] == build_grid("CODE")
+
+    def test_invalid_jobs(self):
+        with pytest.raises(ValueError):
+            build_grids(["TEST"], jobs=0)
+
+
 class TestGridRendering:
     """Tests for render_grid function"""
 
@@ -189,6 +307,22 @@ class TestGridRendering:
         assert len(lines) == 4
         assert "E X" in lines[1]  # Horizontal word
 
+    def test_render_first_row_and_gaps(self):
+        grid = {(0, 2): "A", (0, 5): "B", (2, 0): "C", (3, 1): ","}
+        assert render_grid(grid) == "\u200b   A     B\n\nC\n  ,"
+
+    def test_write_grid_matches_render(self):
+        grid, _ = build_grid("Люди с голубыми глазами, видят лучше слепых!")
+        stream = io.StringIO()
+        write_grid(grid, stream)
+        assert stream.getvalue() == render_grid(grid)
+
+    def test_render_wide_sparse_grid(self):
+        grid = {(0, 0): "A", (0, 100_000): "B", (1, 50_000): "C"}
+        lines = render_grid(grid).splitlines()
+        assert lines[0] == "A" + " " * 199_999 + "B"
+        assert lines[1] == " " * 100_000 + "C"
+
 
 class TestEdgeCases:
     """Tests for various edge cases"""
@@ -214,3 +348,33 @@ class TestPerformance:
         # Should handle reasonably large input quickly
         phrase = " ".join(["TEST"] * 100)
         build_grid(phrase)
+
+    def test_block_cursor_reads_tokens_in_place(self):
+        class Tokens(list):
+            reads = 0
+
+            def __getitem__(self, index):
+                assert not isinstance(index, slice), "tokens must not be copied"
+                Tokens.reads += 1
+                return super().__getitem__(index)
+
+        tokens = Tokens(tokenize_with_end_punct("КОТ ТОК, КИТ ТИК! " * 2000))
+        _, blocks = build_grid_from_tokens(tokens)
+        assert sum(len(block) for block in blocks) > len(tokens)
+        # A token is read once as a candidate and once more as a vertical word
+        assert Tokens.reads <= 2 * len(tokens)
+
+    def test_build_grid_scales_linearly(self):
+        tokens = tokenize_with_end_punct("Развлекаюсь, наблюдая за хаосом! " * 5000)
+
+        def best_time(count):
+            samples = []
+            for _ in range(3):
+                start = time.perf_counter()
+                build_grid_from_tokens(tokens[:count])
+                samples.append(time.perf_counter() - start)
+            return min(samples)
+
+        small, large = best_time(len(tokens) // 4), best_time(len(tokens))
+        # Linear would be 4x, copying the remaining tokens per block is ~16x
+        assert large < small * 8
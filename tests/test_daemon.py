@@ -0,0 +1,159 @@
+import sys
+import os
+import asyncio
+import shutil
+import socket
+import tempfile
+import threading
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from cross_word import daemon
+from cross_word.__main__ import run_on_daemon, run_on_string
+from cross_word.client import (
+    MAX_FRAME_SIZE,
+    DaemonClient,
+    DaemonError,
+    connect_daemon,
+    default_socket_path,
+)
+from cross_word.cross_words import build_grid, build_grid_from_tokens
+from cross_word.daemon import (
+    check_socket_directory,
+    remove_stale_socket,
+    start_daemon,
+)
+from cross_word.serve import LayoutService
+from cross_word.utils import render_grid
+
+
+@pytest.fixture
+def socket_path():
+    # Unix socket paths are limited to about a hundred bytes
+    directory = tempfile.mkdtemp(prefix="cw")
+    yield os.path.join(directory, "daemon.sock")
+    shutil.rmtree(directory)
+
+
+def run_with_daemon(path, client_function, **service_options):
+    async def main():
+        service = LayoutService(**service_options)
+        server = await start_daemon(service, path)
+        try:
+            return await asyncio.to_thread(client_function)
+        finally:
+            server.close()
+            await server.wait_closed()
+            service.shutdown()
+
+    return asyncio.run(main())
+
+
+class TestLayoutDaemon:
+    """Tests for the Unix socket daemon and its client"""
+
+    def test_renders_over_one_connection(self, socket_path):
+        phrases = ["Привет, мир!", "Живи здесь сейчас", ""]
+
+        def client_function():
+            assert os.stat(socket_path).st_mode & 0o777 == 0o600
+            with DaemonClient(socket_path) as client:
+                return [client.render(phrase) for phrase in phrases]
+
+        assert run_with_daemon(socket_path, client_function) == [
+            render_grid(build_grid(phrase)[0]) for phrase in phrases
+        ]
+
+    def test_errors_are_reported(self, socket_path):
+        def failing_build(tokens):
+            raise ValueError("boom")
+
+        def client_function():
+            with DaemonClient(socket_path) as client:
+                with pytest.raises(DaemonError, match="boom"):
+                    client.render("кот")
+                # The connection stays usable after an error
+                with pytest.raises(DaemonError):
+                    client.render("кит")
+
+        run_with_daemon(socket_path, client_function, build_function=failing_build)
+
+    def test_cli_output_matches_in_process(self, socket_path, capsys):
+        phrase = "Развлекаюсь, наблюдая за хаосом"
+        assert run_with_daemon(socket_path, lambda: run_on_daemon(phrase, socket_path))
+        from_daemon = capsys.readouterr().out
+
+        run_on_string(phrase, dry=False)
+        assert from_daemon == capsys.readouterr().out
+
+    def test_falls_back_without_daemon(self, socket_path, capsys):
+        assert connect_daemon(socket_path) is None
+        assert not run_on_daemon("кот", socket_path)
+        assert capsys.readouterr().out == ""
+
+    def test_stale_socket_is_replaced(self, socket_path):
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(socket_path)
+        stale.close()
+        assert connect_daemon(socket_path) is None
+
+        def client_function():
+            with pytest.raises(RuntimeError):
+                remove_stale_socket(socket_path)
+            with DaemonClient(socket_path) as client:
+                return client.render("кот")
+
+        assert run_with_daemon(socket_path, client_function) == render_grid(
+            build_grid_from_tokens(["КОТ"])[0]
+        )
+
+    def test_falls_back_on_failures(self, socket_path, capsys, monkeypatch):
+        phrase = "Развлекаюсь, наблюдая за хаосом"
+        assert not run_on_daemon("кот " * MAX_FRAME_SIZE, socket_path)
+
+        # Responses over the limit are reported as errors by the daemon
+        monkeypatch.setattr(daemon, "MAX_RESPONSE_SIZE", 8)
+        assert not run_with_daemon(
+            socket_path, lambda: run_on_daemon(phrase, socket_path)
+        )
+        assert capsys.readouterr().out == ""
+
+    def test_falls_back_when_connection_is_closed(self, socket_path):
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(socket_path)
+        listener.listen()
+
+        def accept_and_close():
+            connection, _ = listener.accept()
+            connection.close()
+
+        thread = threading.Thread(target=accept_and_close)
+        thread.start()
+        try:
+            assert not run_on_daemon("кот", socket_path)
+        finally:
+            thread.join()
+            listener.close()
+
+    def test_times_out_on_silent_daemon(self, socket_path):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+            listener.bind(socket_path)
+            listener.listen()
+            client = connect_daemon(socket_path, timeout=0.05)
+            with client, pytest.raises(TimeoutError):
+                client.render("кот")
+
+    def test_default_socket_path(self, monkeypatch):
+        monkeypatch.delenv("CROSS_WORD_SOCKET", raising=False)
+        monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+        assert default_socket_path() == "/run/user/1000/cross_word.sock"
+        monkeypatch.delenv("XDG_RUNTIME_DIR")
+        assert default_socket_path() == (
+            f"/tmp/cross_word-{os.getuid()}/cross_word.sock"
+        )
+
+    def test_socket_directory_is_private(self, socket_path):
+        path = os.path.join(os.path.dirname(socket_path), "private", "daemon.sock")
+        check_socket_directory(path)
+        assert os.stat(os.path.dirname(path)).st_mode & 0o777 == 0o700
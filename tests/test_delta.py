@@ -0,0 +1,118 @@
+import sys
+import os
+import json
+import random
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from cross_word.cross_words import build_grid
+from cross_word.delta import (
+    apply_delta,
+    block_offsets,
+    delta_record,
+    diff_grids,
+    diff_layouts,
+    layout_bounds,
+)
+from cross_word.incremental import IncrementalLayout
+from cross_word.utils import get_grid_boundaries
+
+TEXT = (
+    "Циферки — самое важное. Я крайне разочарован! Смешно тебе? А мне нет, "
+    "развлекаюсь, наблюдая за хаосом. Эйнштейн не мог говорить до рождения"
+)
+
+
+def check(old, new):
+    delta = diff_layouts(old, new)
+    assert apply_delta(old[0], delta) == new[0]
+    assert delta.old_bounds == get_grid_boundaries(old[0])
+    assert delta.bounds == get_grid_boundaries(new[0])
+    return delta
+
+
+class TestDiffLayouts:
+    """Tests for cell level deltas between layouts"""
+
+    @pytest.mark.parametrize(
+        "old, new",
+        [
+            ("", ""),
+            ("", "Привет, мир!"),
+            ("Привет, мир!", ""),
+            ("Привет, мир!", "Привет, мир!"),
+            ("Привет, мир!", "Привет, мир?"),
+            ("Смешно тебе? А мне нет", "Смешно тебе! А мне нет"),
+            (TEXT, TEXT.replace("важное", "главное")),
+            (TEXT, TEXT.replace(" хаосом", "")),
+            (TEXT, "Ну, " + TEXT),
+        ],
+    )
+    def test_applies_to_old_grid(self, old, new):
+        check(build_grid(old), build_grid(new))
+
+    def test_random_edits(self):
+        rng = random.Random(7)
+        words = TEXT.split() + [",", "!", "—", "?"]
+        for _ in range(200):
+            old = rng.sample(words, rng.randint(0, 12))
+            new = list(old)
+            position = rng.randint(0, len(new))
+            new[position : position + rng.randint(0, 2)] = rng.sample(
+                words, rng.randint(0, 2)
+            )
+            check(build_grid(" ".join(old)), build_grid(" ".join(new)))
+
+    def test_identical_layouts_are_unchanged(self):
+        layout = build_grid(TEXT)
+        delta = check(layout, build_grid(TEXT))
+        assert delta.unchanged
+        assert diff_grids(layout[0], dict(layout[0])).unchanged
+
+    def test_tail_shifts_instead_of_changing(self):
+        text = TEXT * 5
+        middle = text.index("самое", len(text) // 2)
+        edited = text[:middle] + "очень " + text[middle:]
+        old, new = build_grid(text), build_grid(edited)
+
+        delta = check(old, new)
+        assert delta.shift > 0
+        cells = len(delta.removed) + len(delta.added) + len(delta.changed)
+        assert cells < len(new[0]) // 10
+        assert len(diff_grids(old[0], new[0]).changed) > cells
+
+    def test_incremental_layout_shares_blocks(self):
+        layout = IncrementalLayout(TEXT * 3)
+        old = dict(layout.grid), list(layout.blocks)
+        new = layout.update(TEXT * 3 + " Конец")
+        delta = check(old, (new[0], list(new[1])))
+        assert delta.shift == 0 and not delta.removed
+        assert len(delta.added) + len(delta.changed) < 20
+
+    def test_bounds_from_blocks(self):
+        for phrase in ["", "!", ", мир", TEXT]:
+            grid, blocks = build_grid(phrase)
+            assert layout_bounds(blocks, block_offsets(blocks)) == (
+                get_grid_boundaries(grid)
+            )
+
+
+class TestDiffGrids:
+    """Tests for diffing plain grids"""
+
+    def test_cells(self):
+        old = {(0, 0): "А", (0, 1): "Б", (1, 0): "В"}
+        new = {(0, 0): "А", (0, 1): "Г", (2, 2): "Д"}
+        delta = diff_grids(old, new)
+        assert delta.removed == [(1, 0)]
+        assert delta.added == [((2, 2), "Д")]
+        assert delta.changed == [((0, 1), "Г")]
+        assert (delta.old_bounds, delta.bounds) == ((0, 1, 0, 1), (0, 2, 0, 2))
+        assert apply_delta(old, delta) == new
+
+    def test_record_is_json(self):
+        old, new = build_grid("Привет, мир!"), build_grid("Привет, миры!")
+        record = json.loads(json.dumps(delta_record(diff_layouts(old, new))))
+        assert set(record) == {"removed", "shift", "added", "changed", "bounds"}
+        assert record["bounds"] == list(get_grid_boundaries(new[0]))
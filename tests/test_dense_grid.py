@@ -0,0 +1,112 @@
+import sys
+import os
+import multiprocessing
+import pickle
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from cross_word.cross_words import build_grid, merge_blocks
+from cross_word.dense_grid import DenseGrid
+from cross_word.utils import (
+    can_place_word,
+    place_word_in_grid,
+    DIRECTION_DOWN,
+    DIRECTION_ACROSS,
+    render_grid,
+)
+
+
+class TestDenseGrid:
+    """Tests for the array backed DenseGrid"""
+
+    def test_mapping_behaviour(self):
+        grid = DenseGrid()
+        grid[(0, 0)] = "А"
+        grid[(-3, -2)] = "Б"
+        grid[(5, 7)] = "В"
+        assert len(grid) == 3
+        assert grid[(-3, -2)] == "Б"
+        assert (5, 7) in grid and (1, 1) not in grid
+        assert grid.get((100, 100)) is None
+        assert list(grid) == [(0, 0), (-3, -2), (5, 7)]
+
+        del grid[(0, 0)]
+        assert len(grid) == 2
+        with pytest.raises(KeyError):
+            grid[(0, 0)]
+
+    def test_place_word_matches_dict(self):
+        grid, dense = {}, DenseGrid()
+        for target in (grid, dense):
+            place_word_in_grid(target, "TEST", DIRECTION_DOWN, -2, 0)
+            place_word_in_grid(target, "SET", DIRECTION_ACROSS, 0, -1)
+        assert dense == grid
+        assert DenseGrid(grid) == grid
+
+    @pytest.mark.parametrize(
+        "word,direction,row,col",
+        [
+            ("EXAMPLE", DIRECTION_ACROSS, 1, 0),
+            ("XXXX", DIRECTION_ACROSS, 0, 0),
+            ("SET", DIRECTION_ACROSS, 2, 0),
+            ("SET", DIRECTION_ACROSS, 1, -1),
+            ("TEST", DIRECTION_DOWN, 0, 0),
+            ("BEST", DIRECTION_DOWN, 0, 0),
+            ("FAR", DIRECTION_ACROSS, 40, -40),
+        ],
+    )
+    def test_can_place_matches_dict(self, word, direction, row, col):
+        grid = {}
+        place_word_in_grid(grid, "TEST", DIRECTION_DOWN, 0, 0)
+        place_word_in_grid(grid, "ESTATE", DIRECTION_ACROSS, 1, 0)
+        vertical_coords = {(r, 0) for r in range(4)}
+        dense = DenseGrid(grid)
+
+        assert can_place_word(
+            dense, word, direction, row, col, vertical_coords
+        ) == can_place_word(grid, word, direction, row, col, vertical_coords)
+
+    @pytest.mark.parametrize(
+        "phrase",
+        [
+            "Истина где-то между строк отчета",
+            "Развлекаюсь, наблюдая за хаосом",
+            "Циферки — самое важное. Я крайне разочарован!",
+            "Смешно тебе? А мне нет",
+        ],
+    )
+    def test_merge_matches_dict_blocks(self, phrase):
+        grid, blocks = build_grid(phrase)
+        assert merge_blocks([DenseGrid(block) for block in blocks]) == grid
+        assert render_grid(DenseGrid(grid)) == render_grid(grid)
+
+    def test_keeps_insertion_order(self):
+        grid, _ = build_grid("Развлекаюсь, наблюдая за хаосом")
+        dense = DenseGrid(grid)
+        assert list(dense.items()) == list(grid.items())
+
+        del dense[(0, 0)]
+        dense[(0, 0)] = "Р"
+        assert list(dense)[-1] == (0, 0) and len(dense) == len(grid)
+        assert list(dense.copy()) == list(dense)
+
+    def test_pickles_characters_not_codes(self):
+        grid, _ = build_grid("Развлекаюсь, наблюдая за хаосом")
+        dense = DenseGrid(grid)
+        copy = pickle.loads(pickle.dumps(dense))
+        assert isinstance(copy, DenseGrid)
+        assert list(copy.items()) == list(grid.items())
+
+        # A spawned worker starts with its own, empty alphabet
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(1, mp_context=context) as pool:
+            assert pool.submit(render_grid, dense).result() == render_grid(grid)
+            returned = pool.submit(DenseGrid.copy, DenseGrid({(0, 0): "Ж"})).result()
+        assert list(returned.items()) == [((0, 0), "Ж")]
+
+    def test_smaller_than_dict(self):
+        grid, _ = build_grid("Люди с голубыми глазами видят лучше слепых")
+        dict_size = sys.getsizeof(grid) + sum(sys.getsizeof(key) for key in grid)
+        assert sys.getsizeof(DenseGrid(grid)) * 3 < dict_size
@@ -0,0 +1,163 @@
+import sys
+import os
+import sqlite3
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from cross_word import disk_cache
+from cross_word.cross_words import build_grid, build_grid_from_tokens
+from cross_word.disk_cache import (
+    DiskCacheStats,
+    DiskCacheTiming,
+    DiskLayoutCache,
+    layout_key,
+)
+from cross_word.interlock import (
+    build_interlocked_grid,
+    build_interlocked_grid_from_tokens,
+)
+from cross_word.utils import tokenize_with_end_punct
+
+PHRASES = [
+    "Циферки — самое важное",
+    "Живи здесь сейчас",
+    "Смешно тебе? А мне нет",
+    "Эйнштейн не мог говорить до рождения",
+]
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "layouts.db")
+
+
+class TestDiskLayoutCache:
+    """Tests for the SQLite layout cache"""
+
+    def test_hits_survive_reopening(self, path):
+        with DiskLayoutCache(path, build_grid_from_tokens) as cache:
+            assert cache.build_grid("Живи здесь сейчас") == build_grid(
+                "Живи здесь сейчас"
+            )
+
+        with DiskLayoutCache(path, build_grid_from_tokens) as cache:
+            grid, blocks = cache.build_grid("  живи   ЗДЕСЬ сейчас ")
+            expected_grid, expected_blocks = build_grid("Живи здесь сейчас")
+            assert list(grid.items()) == list(expected_grid.items())
+            assert blocks == expected_blocks
+            stats = cache.stats
+            assert (stats.hits, stats.misses, stats.entries) == (1, 0, 1)
+
+    def test_shared_between_connections(self, path):
+        with (
+            DiskLayoutCache(path, build_grid_from_tokens) as writer,
+            DiskLayoutCache(path, build_grid_from_tokens) as reader,
+        ):
+            writer.build_grid("Привет, мир!")
+            assert "Привет, мир!" in reader
+            assert reader.get(tokenize_with_end_punct("Привет, мир!")) == (
+                build_grid("Привет, мир!")
+            )
+            (mode,) = reader._connection.execute("PRAGMA journal_mode").fetchone()
+            assert mode == "wal"
+
+    def test_engines_are_kept_apart(self, path):
+        phrase = "Молоко кот окно нос"
+        with (
+            DiskLayoutCache(path, build_grid_from_tokens) as greedy,
+            DiskLayoutCache(path, build_interlocked_grid_from_tokens) as interlocked,
+        ):
+            greedy.build_grid(phrase)
+            assert phrase not in interlocked
+            assert interlocked.build_grid(phrase) == build_interlocked_grid(phrase)
+            assert len(greedy) == len(interlocked) == 2
+
+    def test_key_depends_on_engine_version(self, monkeypatch):
+        tokens = tokenize_with_end_punct("Живи здесь сейчас")
+        key = layout_key(tokens)
+        assert layout_key(tokens, "other:engine") != key
+        monkeypatch.setattr(disk_cache, "ENGINE_VERSION", disk_cache.ENGINE_VERSION + 1)
+        assert layout_key(tokens) != key
+
+    def test_evicts_least_recently_used(self, path):
+        with DiskLayoutCache(path, build_grid_from_tokens) as probe:
+            probe.build_grid(PHRASES[0])
+            entry_size = probe.stats.bytes
+
+        # Room for about three layouts, refreshing access times on every hit
+        with DiskLayoutCache(
+            path, build_grid_from_tokens, max_bytes=3 * entry_size, touch_interval=0
+        ) as cache:
+            cache.clear()
+            for phrase in PHRASES[:3]:
+                cache.build_grid(phrase)
+            cache.build_grid(PHRASES[0])
+            cache.build_grid(PHRASES[3])
+
+            stats = cache.stats
+            assert stats.evictions >= 1 and stats.bytes <= stats.max_bytes
+            assert PHRASES[0] in cache and PHRASES[3] in cache
+            assert PHRASES[1] not in cache
+
+    def test_totals_track_table(self, path):
+        with DiskLayoutCache(path, build_grid_from_tokens, max_bytes=2000) as cache:
+            for phrase in PHRASES * 2:
+                cache.build_grid(phrase)
+            entries, size = cache._connection.execute(
+                "SELECT count(*), total(size) FROM layouts"
+            ).fetchone()
+            stats = cache.stats
+            assert (stats.entries, stats.bytes) == (entries, size)
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_warm(self, path, jobs):
+        with DiskLayoutCache(path, build_grid_from_tokens) as cache:
+            cache.build_grid(PHRASES[0])
+            assert cache.warm(PHRASES + ["живи здесь  сейчас"], jobs, chunksize=1) == 3
+            assert cache.warm(PHRASES, jobs) == 0
+
+            for phrase in PHRASES:
+                assert cache.build_grid(phrase) == build_grid(phrase)
+            assert cache.stats == DiskCacheStats(
+                hits=4,
+                misses=1,
+                evictions=0,
+                entries=4,
+                bytes=cache.stats.bytes,
+                max_bytes=disk_cache.DEFAULT_MAX_BYTES,
+            )
+
+    def test_warm_in_batches(self, path, monkeypatch):
+        monkeypatch.setattr(disk_cache, "WARM_BATCH_SIZE", 2)
+        phrases = PHRASES + ["кот"] + PHRASES + ["", "живи здесь  сейчас"]
+        with DiskLayoutCache(path, build_grid_from_tokens) as cache:
+            assert cache.warm(phrases, jobs=1) == 6
+            assert len(cache) == 6
+            for phrase in phrases:
+                assert cache.build_grid(phrase) == build_grid(phrase)
+
+    def test_benchmark(self, path):
+        with DiskLayoutCache(path, build_grid_from_tokens) as cache:
+            timing = cache.benchmark(PHRASES, repeat=1)
+            assert isinstance(timing, DiskCacheTiming)
+            assert timing.hit_seconds > 0 and timing.compute_seconds > 0
+            assert len(cache) == len(PHRASES)
+            assert cache.benchmark([]) == DiskCacheTiming(0.0, 0.0)
+            with pytest.raises(ValueError):
+                cache.benchmark(PHRASES, repeat=0)
+
+    def test_clear(self, path):
+        with DiskLayoutCache(path, build_grid_from_tokens) as cache:
+            cache.build_grid("Живи здесь сейчас")
+            cache.clear()
+            assert len(cache) == 0 and cache.stats.bytes == 0
+            assert "Живи здесь сейчас" not in cache and 42 not in cache
+
+    def test_invalid_arguments(self, path):
+        with pytest.raises(ValueError):
+            DiskLayoutCache(path, build_grid_from_tokens, max_bytes=0)
+        with pytest.raises(sqlite3.OperationalError):
+            DiskLayoutCache(
+                os.path.join(path, "missing", "layouts.db"), build_grid_from_tokens
+            )
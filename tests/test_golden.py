@@ -0,0 +1,70 @@
+import sys
+import os
+import io
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from cross_word.golden import (
+    GoldenCase,
+    format_case,
+    format_diff,
+    iter_check_golden,
+    main,
+    parse_golden,
+)
+
+RESULTS_PATH = os.path.join(os.path.dirname(__file__), "..", "results.txt")
+
+
+def load_results():
+    with open(RESULTS_PATH, encoding="utf-8") as file:
+        return list(parse_golden(file))
+
+
+class TestGolden:
+    """Tests for the golden output harness"""
+
+    def test_results_match_engine(self):
+        cases = load_results()
+        assert len(cases) == 18
+        failures = [
+            format_diff(result)
+            for result in iter_check_golden(cases, repeat=1, jobs=1)
+            if not result.passed
+        ]
+        assert not failures, "\n".join(failures)
+
+    def test_parallel_check_keeps_order(self):
+        cases = load_results()
+        results = list(iter_check_golden(cases, repeat=1, jobs=2, chunksize=4))
+        assert [result.case for result in results] == cases
+        assert all(result.passed and result.seconds > 0 for result in results)
+
+    def test_parse_round_trip(self):
+        text = format_case(1, "А Б", "А\n\nБ") + format_case(2, "", "")
+        assert list(parse_golden(io.StringIO(text))) == [
+            GoldenCase(1, "А Б", "А\n\nБ"),
+            GoldenCase(2, "", ""),
+        ]
+
+    def test_parse_rejects_unterminated_case(self):
+        with pytest.raises(ValueError):
+            list(parse_golden(io.StringIO("1: Phrase: КОТ\nК\n")))
+
+    def test_mismatch_is_reported(self, tmp_path, capsys):
+        path = tmp_path / "golden.txt"
+        path.write_text(format_case(1, "КОТ", "К\nО\nX"), encoding="utf-8")
+        assert main([str(path), "-j", "1", "-r", "1"]) == 1
+        output = capsys.readouterr().out
+        assert "-X" in output and "+Т" in output
+        assert "0/1 phrases identical" in output
+
+    def test_reference_timing(self):
+        (result,) = iter_check_golden(
+            [GoldenCase(1, "КОТ", "К\nО\nТ")],
+            reference="cross_word.search:search_layout",
+            repeat=1,
+            jobs=1,
+        )
+        assert result.passed and result.reference_seconds > 0
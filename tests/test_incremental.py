@@ -0,0 +1,52 @@
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from cross_word.cross_words import build_grid
+from cross_word.incremental import IncrementalLayout
+
+
+def assert_same_layout(layout, expected):
+    grid, blocks = layout
+    expected_grid, expected_blocks = expected
+    assert list(grid.items()) == list(expected_grid.items())
+    assert blocks == expected_blocks
+
+
+class TestIncrementalLayout:
+    """Tests for IncrementalLayout"""
+
+    def test_typing_phrase(self):
+        phrase = "Люди с голубыми глазами, видят лучше слепых!"
+        layout = IncrementalLayout()
+        for end in range(len(phrase) + 1):
+            assert_same_layout(layout.update(phrase[:end]), build_grid(phrase[:end]))
+
+    def test_edit_keeps_leading_blocks(self):
+        layout = IncrementalLayout("Развлекаюсь, наблюдая за хаосом")
+        leading_blocks = list(layout.blocks[:-1])
+
+        layout.update("Развлекаюсь, наблюдая за хаосами")
+        assert all(a is b for a, b in zip(layout.blocks, leading_blocks))
+        assert layout.first_changed_block == len(leading_blocks)
+
+    def test_unchanged_phrase(self):
+        layout = IncrementalLayout("Живи здесь сейчас")
+        blocks = layout.blocks
+        layout.update("живи  здесь сейчас")
+        assert layout.blocks is blocks
+        assert layout.first_changed_block == len(blocks)
+
+    def test_random_edits_match_build_grid(self):
+        rng = random.Random(7)
+        layout = IncrementalLayout()
+        text = ""
+        for _ in range(300):
+            position = rng.randint(0, len(text))
+            if text and rng.random() < 0.3:
+                text = text[:position] + text[position + 1 :]
+            else:
+                text = text[:position] + rng.choice("АБВОЕИ ,.—?") + text[position:]
+            assert_same_layout(layout.update(text), build_grid(text))
@@ -0,0 +1,76 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from cross_word import instrumentation
+from cross_word.cross_words import build_block_at, build_grid
+from cross_word.dense_grid import DenseGrid
+from cross_word.instrumentation import (
+    PHASE_BLOCKS,
+    PHASE_MERGE,
+    PHASE_RENDER,
+    PHASE_TOKENIZE,
+    LayoutStats,
+    collect_stats,
+)
+from cross_word.utils import DIRECTION_ACROSS, can_place_word, render_grid
+
+
+class TestInstrumentation:
+    """Tests for opt-in layout statistics"""
+
+    def test_off_by_default(self):
+        assert instrumentation.active is None
+        build_grid("Живи здесь сейчас")
+        assert instrumentation.active is None
+
+    def test_collects_counters_and_phases(self):
+        with collect_stats() as stats:
+            grid, blocks = build_grid("Смешно тебе? А мне нет")
+            render_grid(grid)
+
+        assert stats.blocks_built == len(blocks)
+        assert stats.can_place_calls > 0
+        assert stats.cells_probed >= stats.can_place_calls
+        assert stats.rows_scanned > 0
+        assert set(stats.phase_seconds) == {
+            PHASE_TOKENIZE,
+            PHASE_BLOCKS,
+            PHASE_MERGE,
+            PHASE_RENDER,
+        }
+        assert instrumentation.active is None
+
+    def test_cells_probed(self):
+        grid = {(0, 0): "T", (1, 0): "E", (2, 0): "S", (3, 0): "T"}
+        coords = set(grid)
+        for target in (grid, DenseGrid(grid)):
+            with collect_stats() as stats:
+                can_place_word(target, "XEX", DIRECTION_ACROSS, 1, -1, coords)
+                can_place_word(target, "AXE", DIRECTION_ACROSS, 0, 0, coords)
+            assert stats.can_place_calls == 2
+            assert stats.cells_probed == 3 + 1
+
+    def test_rows_scanned_counts_visited_rows(self):
+        with collect_stats() as stats:
+            build_block_at(["АБАБАБАБА", "ААА"])
+        # The first candidate row fits, the other three are never visited
+        assert (stats.rows_scanned, stats.can_place_calls) == (1, 1)
+
+    def test_callback_and_nesting(self):
+        received = []
+        with collect_stats() as outer:
+            with collect_stats(callback=received.append) as inner:
+                build_grid("Лови момент жизни")
+
+        assert received == [inner]
+        assert inner.blocks_built > 0
+        assert outer.blocks_built == inner.blocks_built
+        assert outer.can_place_calls == inner.can_place_calls
+
+    def test_merge(self):
+        first = LayoutStats(can_place_calls=1, phase_seconds={PHASE_MERGE: 1.0})
+        first.merge(LayoutStats(can_place_calls=2, phase_seconds={PHASE_MERGE: 0.5}))
+        assert first.can_place_calls == 3
+        assert first.phase_seconds == {PHASE_MERGE: 1.5}
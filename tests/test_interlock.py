@@ -0,0 +1,134 @@
+import sys
+import os
+import time
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from cross_word.cross_words import build_grid, merge_blocks
+from cross_word.interlock import (
+    OccupancyIndex,
+    build_interlocked_block_at,
+    build_interlocked_grid,
+    build_interlocked_grid_from_tokens,
+)
+from cross_word.utils import DIRECTION_ACROSS, DIRECTION_DOWN, tokenize_with_end_punct
+
+PHRASES = [
+    "Привет, мир!",
+    "Циферки — самое важное",
+    "Смешно тебе? А мне нет",
+    "Эйнштейн не мог говорить до рождения",
+    "Лошадь может дожить до конца своей жизни",
+]
+
+
+def grid_runs(grid):
+    """Words read off a grid: runs of two or more cells in both directions."""
+    runs = []
+    for row_step, col_step in ((0, 1), (1, 0)):
+        for row, col in grid:
+            if (row - row_step, col - col_step) in grid:
+                continue
+            characters = []
+            while (row, col) in grid:
+                characters.append(grid[(row, col)])
+                row, col = row + row_step, col + col_step
+            if len(characters) > 1:
+                runs.append("".join(characters))
+    return runs
+
+
+def area(grid):
+    rows = [row for row, _ in grid]
+    cols = [col for _, col in grid]
+    return (max(rows) - min(rows) + 1) * (max(cols) - min(cols) + 1)
+
+
+class TestOccupancyIndex:
+    """Tests for the crossword rules checked by OccupancyIndex"""
+
+    def setup_method(self):
+        self.index = OccupancyIndex()
+        self.index.place("КОТ", DIRECTION_DOWN, 0, 0)
+
+    def test_crossing(self):
+        assert self.index.count_crossings("ОКНО", DIRECTION_ACROSS, 1, 0) == 1
+        assert self.index.count_crossings("ОКНО", DIRECTION_ACROSS, 1, -3) == 1
+        assert self.index.count_crossings("ОКНО", DIRECTION_ACROSS, 1, -1) == -1
+
+    def test_rejects_touching_words(self):
+        # Alongside the word
+        assert self.index.count_crossings("ДОМ", DIRECTION_DOWN, 0, 1) == -1
+        # End to end with it
+        assert self.index.count_crossings("ДОМ", DIRECTION_DOWN, 3, 0) == -1
+        assert self.index.count_crossings("ДОМ", DIRECTION_ACROSS, 0, 1) == -1
+
+    def test_rejects_overlapping_parallel_words(self):
+        assert self.index.count_crossings("ОТ", DIRECTION_DOWN, 1, 0) == -1
+
+    def test_rejects_words_adding_no_cells(self):
+        assert self.index.count_crossings("О", DIRECTION_ACROSS, 1, 0) == -1
+
+    def test_bounds_and_candidates(self):
+        self.index.place("ОКНО", DIRECTION_ACROSS, 1, -3)
+        assert (self.index.min_row, self.index.max_row) == (0, 2)
+        assert (self.index.min_col, self.index.max_col) == (-3, 0)
+        assert self.index.area_with("НОС", DIRECTION_DOWN, 0, -3) == 12
+        # The crossed О at (1, 0) takes no more words
+        assert set(self.index.iter_crossing_starts("НОС")) == {
+            (DIRECTION_DOWN, 0, -3),
+            (DIRECTION_DOWN, 1, -1),
+        }
+
+
+class TestInterlockedGrid:
+    """Tests for the interlocking layout mode"""
+
+    def test_words_run_down_through_across_words(self):
+        tokens = tokenize_with_end_punct("Молоко кот окно нос")
+        block, next_start = build_interlocked_block_at(tokens)
+        assert next_start == 4
+        assert sorted(grid_runs(block)) == ["КОТ", "МОЛОКО", "НОС", "ОКНО"]
+        # НОС runs down through ОКНО, away from the first word
+        assert [block[(row, 2)] for row in range(3, 6)] == list("НОС")
+
+    @pytest.mark.parametrize("phrase", PHRASES)
+    def test_every_word_is_readable(self, phrase):
+        grid, blocks = build_interlocked_grid(phrase)
+        assert merge_blocks(blocks) == grid
+
+        tokens = tokenize_with_end_punct(phrase)
+        runs = sorted(run for block in blocks for run in grid_runs(block))
+        assert runs == sorted(token for token in tokens if len(token) > 1)
+
+    @pytest.mark.parametrize("max_rows", [None, 8])
+    def test_blocks_keep_to_rows(self, max_rows):
+        tokens = tokenize_with_end_punct(" ".join(PHRASES))
+        position = 0
+        while position < len(tokens):
+            rows = max(len(tokens[position]), max_rows or 0)
+            block, position = build_interlocked_block_at(tokens, position, max_rows)
+            assert block.min_row == 0 and block.max_row < rows
+
+    def test_denser_than_greedy(self):
+        phrase = " ".join(PHRASES) * 5
+        grid, _ = build_interlocked_grid(phrase)
+        assert area(grid) < area(build_grid(phrase)[0])
+
+    def test_empty(self):
+        assert build_interlocked_grid("") == ({}, [])
+        assert build_interlocked_block_at([], 0) == ({}, 0)
+
+    def test_scales_linearly(self):
+        tokens = tokenize_with_end_punct(" ".join(PHRASES) * 500)
+
+        def best_time(count):
+            samples = []
+            for _ in range(3):
+                start = time.perf_counter()
+                build_interlocked_grid_from_tokens(tokens[:count])
+                samples.append(time.perf_counter() - start)
+            return min(samples)
+
+        assert best_time(len(tokens)) < best_time(len(tokens) // 4) * 8
@@ -0,0 +1,68 @@
+import sys
+import os
+import io
+import json
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from cross_word.__main__ import read_phrases, stream_phrases
+from cross_word.cross_words import build_grid
+from cross_word.utils import render_grid
+
+
+class TestStreaming:
+    """Tests for the --input streaming mode"""
+
+    def test_read_text_lines(self):
+        stream = io.StringIO("Привет, мир!\n\n  \nЖиви здесь\r\n")
+        assert list(read_phrases(stream, "text")) == [
+            (1, "Привет, мир!", None),
+            (4, "Живи здесь", None),
+        ]
+
+    def test_read_jsonl_lines(self):
+        stream = io.StringIO('{"id": "x", "phrase": "Мир"}\n"Живи"\n{"phrase": "А"}\n')
+        assert list(read_phrases(stream, "jsonl")) == [
+            ("x", "Мир", None),
+            (2, "Живи", None),
+            (3, "А", None),
+        ]
+
+    def test_malformed_jsonl_lines_do_not_stop_input(self):
+        lines = ['"Мир"', "{broken", "42", '{"id": "x", "phrase": "Живи здесь"}']
+        out = io.StringIO()
+        stream_phrases(
+            io.StringIO("\n".join(lines)),
+            out,
+            input_format="jsonl",
+            output_format="json",
+            jobs=2,
+        )
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert [record["id"] for record in records] == [1, 2, 3, "x"]
+        assert "Line 2: invalid JSON" in records[1]["error"]
+        assert "Line 3: expected" in records[2]["error"]
+        assert records[3]["rendered"] == render_grid(build_grid("Живи здесь")[0])
+
+    def test_stream_text_output(self):
+        out = io.StringIO()
+        stream_phrases(io.StringIO("Живи здесь сейчас\n"), out)
+        grid, _ = build_grid("Живи здесь сейчас")
+        assert out.getvalue() == (
+            f"1: Phrase: Живи здесь сейчас\n{render_grid(grid)}\n---\n"
+        )
+
+    def test_stream_json_output_with_workers(self):
+        phrases = ["Лови момент жизни", "Смешно? А мне нет"] * 5
+        out = io.StringIO()
+        stream_phrases(
+            io.StringIO("\n".join(phrases)),
+            out,
+            output_format="json",
+            jobs=2,
+            flush_every=3,
+        )
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert [record["id"] for record in records] == list(range(1, 11))
+        for record, phrase in zip(records, phrases):
+            assert record["rendered"] == render_grid(build_grid(phrase)[0])
@@ -0,0 +1,97 @@
+import sys
+import os
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from cross_word.cross_words import build_grid
+from cross_word.interlock import (
+    build_interlocked_grid,
+    build_interlocked_grid_from_tokens,
+)
+from cross_word.paragraph import (
+    Paragraph,
+    build_paragraph,
+    split_sentences,
+    stack_grids,
+)
+from cross_word.utils import ZERO_WIDTH_SPACE, render_grid, tokenize_with_end_punct
+
+TEXT = (
+    "Циферки — самое важное. Я крайне разочарован! Смешно тебе? А мне нет. "
+    "Развлекаюсь, наблюдая за хаосом"
+)
+SENTENCES = [
+    "Циферки — самое важное.",
+    "Я крайне разочарован!",
+    "Смешно тебе?",
+    "А мне нет.",
+    "Развлекаюсь, наблюдая за хаосом",
+]
+
+
+class TestParagraph:
+    """Tests for the paragraph layout mode"""
+
+    def test_split_sentences(self):
+        tokens = tokenize_with_end_punct(TEXT)
+        assert split_sentences(tokens) == [
+            tokenize_with_end_punct(sentence) for sentence in SENTENCES
+        ]
+        assert split_sentences(["—", "?", "ДА"]) == [["—", "?"], ["ДА"]]
+        assert split_sentences([]) == []
+
+    def test_stack_grids(self):
+        first = {(0, 0): "А", (0, 1): "Б"}
+        second = {(5, -3): "В", (6, -3): "Г"}
+        stacked = stack_grids([first, {}, second], spacing=2)
+        assert list(stacked.items()) == [
+            ((0, 0), "А"),
+            ((0, 1), "Б"),
+            ((3, 0), "В"),
+            ((4, 0), "Г"),
+        ]
+        assert render_grid(stacked) == "А Б\n\n\nВ\nГ"
+        with pytest.raises(ValueError):
+            stack_grids([first], spacing=-1)
+
+    @pytest.mark.parametrize("spacing", [0, 1, 3])
+    def test_sentences_are_stacked(self, spacing):
+        grid, sentence_grids = build_paragraph(TEXT, spacing, jobs=1)
+        assert sentence_grids == [build_grid(sentence)[0] for sentence in SENTENCES]
+
+        # Only the top line of the stacked grid keeps its zero width space
+        expected = [render_grid(sentence_grid) for sentence_grid in sentence_grids]
+        assert render_grid(grid).replace(ZERO_WIDTH_SPACE, " ") == (
+            "\n" * (spacing + 1)
+        ).join(expected).replace(ZERO_WIDTH_SPACE, " ")
+
+    def test_workers_match_in_process(self):
+        text = TEXT * 10
+        assert build_paragraph(text, jobs=2, chunksize=3) == build_paragraph(
+            text, jobs=1
+        )
+
+    def test_engine(self):
+        _, sentence_grids = build_paragraph(
+            TEXT, jobs=2, chunksize=1, engine=build_interlocked_grid_from_tokens
+        )
+        assert sentence_grids == [
+            build_interlocked_grid(sentence)[0] for sentence in SENTENCES
+        ]
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            build_paragraph(TEXT, jobs=0)
+        with pytest.raises(ValueError):
+            build_paragraph(TEXT, chunksize=0)
+
+    def test_empty(self):
+        assert build_paragraph("", jobs=1) == Paragraph({}, [])
+
+    def test_engine_errors_propagate(self):
+        def failing_engine(tokens):
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            build_paragraph(TEXT, jobs=1, engine=failing_engine)
@@ -0,0 +1,146 @@
+import sys
+import os
+import gc
+import random
+import tracemalloc
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from cross_word.__main__ import EXAMPLES
+from cross_word.cross_words import Block, build_grid
+from cross_word.placement import (
+    CompactLayout,
+    Placement,
+    PlacementBlock,
+    grid_placements,
+)
+from cross_word.utils import (
+    DIRECTION_ACROSS,
+    DIRECTION_DOWN,
+    can_place_word,
+    place_word_in_grid,
+    render_grid,
+)
+
+
+def traced_size(factory):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        value = factory()
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0], value
+    finally:
+        tracemalloc.stop()
+
+
+class TestPlacementBlock:
+    """Tests for the placement-list grid representation"""
+
+    def test_placements_of_block(self):
+        _, (block, *_) = build_grid("Развлекаюсь, наблюдая за хаосом")
+        assert grid_placements(block) == [
+            Placement("РАЗВЛЕКАЮСЬ", DIRECTION_DOWN, 0, 0),
+        ]
+        _, blocks = build_grid("Смешно тебе? А мне нет")
+        # The crossing cell splits the across word
+        assert len(grid_placements(blocks[0])) == 3
+
+    @pytest.mark.parametrize("phrase", EXAMPLES)
+    def test_from_grid_keeps_cells_and_order(self, phrase):
+        grid, blocks = build_grid(phrase)
+        for original in [grid, *blocks]:
+            block = PlacementBlock.from_grid(original)
+            assert list(block.iter_cells()) == list(original.items())
+            assert list(block.to_dict().items()) == list(original.items())
+            assert render_grid(block) == render_grid(original)
+
+    def test_lookups_read_placements(self):
+        block = PlacementBlock([Placement("КОТ", DIRECTION_DOWN, 0, 0)])
+        assert can_place_word(block, "ТОК", DIRECTION_ACROSS, 1, -1)
+        assert not can_place_word(block, "ОКО", DIRECTION_ACROSS, 1, -1)
+
+        assert block[(1, 0)] == "О" and len(block) == 3
+        assert (2, 0) in block and (3, 0) not in block and "x" not in block
+        assert block.get((0, 1)) is None
+        assert block._cells is None
+        assert block == {(0, 0): "К", (1, 0): "О", (2, 0): "Т"}
+
+        with block.materialized():
+            assert block._cells is not None and block[(2, 0)] == "Т"
+        assert block._cells is None
+
+    def test_render_keeps_memory_compact(self):
+        grid, _ = build_grid(" ".join(EXAMPLES * 3))
+        block = PlacementBlock.from_grid(grid)
+        compact_size, _ = traced_size(lambda: PlacementBlock.from_grid(grid))
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            assert render_grid(block) == render_grid(grid)
+            assert len(block) == len(grid) and (0, 0) in block
+            gc.collect()
+            retained = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        assert retained < compact_size // 2
+
+    def test_place_word(self):
+        block = PlacementBlock()
+        reference = {}
+        for arguments in [
+            ("КОТ", DIRECTION_DOWN, 0, 0),
+            ("ТОК", DIRECTION_ACROSS, 2, 0),
+        ]:
+            place_word_in_grid(block, *arguments)
+            place_word_in_grid(reference, *arguments)
+            assert list(block.items()) == list(reference.items())
+        assert len(list(block.placements)) == 2
+
+    def test_can_place_word_matches_dict(self):
+        rng = random.Random(7)
+        for phrase in EXAMPLES:
+            grid = build_grid(phrase)[0]
+            block = PlacementBlock.from_grid(grid)
+            characters = list(grid.values()) + ["Ж"]
+            cells = list(grid)
+            rows = [row for row, _ in cells]
+            cols = [col for _, col in cells]
+
+            for _ in range(200):
+                word = "".join(rng.choices(characters, k=rng.randint(1, 6)))
+                direction = rng.choice([DIRECTION_ACROSS, DIRECTION_DOWN])
+                row = rng.randint(min(rows) - 3, max(rows) + 1)
+                col = rng.randint(min(cols) - 3, max(cols) + 1)
+                vertical = set(rng.sample(cells, 4)) if rng.random() < 0.5 else None
+                assert can_place_word(
+                    grid, word, direction, row, col, vertical
+                ) == can_place_word(block, word, direction, row, col, vertical)
+
+            assert block._cells is None
+
+
+class TestCompactLayout:
+    """Tests for packed layout storage"""
+
+    @pytest.mark.parametrize("phrase", EXAMPLES + [""])
+    def test_round_trip(self, phrase):
+        grid, blocks = build_grid(phrase)
+        unpacked_grid, unpacked_blocks = CompactLayout((grid, blocks)).to_layout()
+        assert list(unpacked_grid.items()) == list(grid.items())
+        assert all(isinstance(block, Block) for block in unpacked_blocks)
+        assert [list(block.items()) for block in unpacked_blocks] == [
+            list(block.items()) for block in blocks
+        ]
+
+    def test_order_of_magnitude_smaller(self):
+        phrases = EXAMPLES * 20
+        layouts_size, _ = traced_size(lambda: [build_grid(p) for p in phrases])
+        layouts = [build_grid(p) for p in phrases]
+        compact_size, _ = traced_size(
+            lambda: [CompactLayout(layout) for layout in layouts]
+        )
+        assert compact_size * 8 < layouts_size
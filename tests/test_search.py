@@ -0,0 +1,135 @@
+import sys
+import os
+import pytest
+from itertools import islice
+from time import monotonic
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from cross_word.__main__ import EXAMPLES
+from cross_word.cross_words import build_grid, build_single_block, merge_blocks
+from cross_word import search
+from cross_word.search import (
+    OBJECTIVE_AREA,
+    OBJECTIVE_BLOCKS,
+    OBJECTIVE_WIDTH,
+    build_compact_grid,
+    iter_block_variants,
+    iter_layouts,
+    layout_score,
+)
+from cross_word.utils import tokenize_with_end_punct
+
+PHRASES = [
+    "Циферки — самое важное",
+    "Смешно тебе? А мне нет",
+    "Эйнштейн не мог говорить до рождения",
+    "Лошадь может дожить до конца своей жизни",
+]
+
+
+class TestLayoutSearch:
+    """Tests for the branch-and-bound layout search"""
+
+    def test_layout_score(self):
+        grid = {(0, 0): "A", (2, 0): "B", (1, 3): "C"}
+        assert layout_score(grid, OBJECTIVE_AREA) == (12, 4)
+        assert layout_score(grid, OBJECTIVE_WIDTH) == (4, 12)
+        assert layout_score(grid, OBJECTIVE_BLOCKS, 2) == (2, 12)
+        with pytest.raises(ValueError):
+            layout_score(grid, "height")
+
+    def test_first_variant_is_greedy_block(self):
+        tokens = tokenize_with_end_punct("Живи здесь сейчас")
+        block, next_start = next(iter_block_variants(tokens, 0))
+        greedy_block, remaining = build_single_block(tokens)
+        assert list(block.items()) == list(greedy_block.items())
+        assert next_start == len(tokens) - len(remaining)
+
+    @pytest.mark.parametrize("phrase", PHRASES)
+    @pytest.mark.parametrize("objective", [OBJECTIVE_AREA, OBJECTIVE_WIDTH])
+    def test_never_worse_than_greedy(self, phrase, objective):
+        grid, blocks = build_compact_grid(phrase, objective, time_budget=0.2)
+        assert merge_blocks(blocks) == grid
+        assert layout_score(grid, objective) <= layout_score(
+            build_grid(phrase)[0], objective
+        )
+
+    def test_finds_smaller_layout(self):
+        phrase = "Эйнштейн не мог говорить до рождения"
+        grid, _ = build_compact_grid(phrase, time_budget=1.0)
+        assert layout_score(grid) < layout_score(build_grid(phrase)[0])
+
+    def test_zero_budget_returns_greedy(self):
+        phrase = "Лошадь может дожить до конца своей жизни"
+        assert build_compact_grid(phrase, time_budget=0) == build_grid(phrase)
+
+    def test_without_early_break(self):
+        phrase = "Смешно тебе? А мне нет"
+        grid, blocks = build_compact_grid(phrase, allow_early_break=False)
+        assert merge_blocks(blocks) == grid
+        assert layout_score(grid) <= layout_score(build_grid(phrase)[0])
+
+
+class TestIterLayouts:
+    """Tests for the lazy alternative layouts generator"""
+
+    @pytest.mark.parametrize("phrase", PHRASES)
+    @pytest.mark.parametrize(
+        "objective", [OBJECTIVE_AREA, OBJECTIVE_WIDTH, OBJECTIVE_BLOCKS]
+    )
+    def test_greedy_first_then_distinct_layouts(self, phrase, objective):
+        layouts = list(islice(iter_layouts(phrase, objective), 8))
+        assert layouts[0] == build_grid(phrase)
+
+        assert len({frozenset(grid.items()) for grid, _ in layouts}) == len(layouts)
+        for grid, blocks in layouts:
+            assert merge_blocks(blocks) == grid
+
+    @pytest.mark.parametrize("phrase", PHRASES[:2])
+    def test_yields_every_layout(self, phrase):
+        tokens = tokenize_with_end_punct(phrase)
+        expected = set()
+
+        def enumerate_layouts(blocks, start):
+            if start == len(tokens):
+                expected.add(frozenset(merge_blocks(blocks).items()))
+                return
+            for block, next_start in iter_block_variants(tokens, start):
+                enumerate_layouts(blocks + [block], next_start)
+
+        enumerate_layouts([], 0)
+        layouts = [frozenset(grid.items()) for grid, _ in iter_layouts(phrase)]
+        assert len(layouts) == len(set(layouts))
+        assert set(layouts) == expected
+
+    def test_long_phrase_alternatives_are_cheap(self):
+        phrase = " ".join(EXAMPLES)
+        assert len(tokenize_with_end_punct(phrase)) >= 30
+        start = monotonic()
+        layouts = list(islice(iter_layouts(phrase), 5))
+        assert monotonic() - start < 2.0
+        assert len(layouts) == 5
+
+    def test_first_layout_does_not_search(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(
+            search,
+            "iter_block_variants",
+            lambda *args: calls.append(args) or iter_block_variants(*args),
+        )
+        layouts = iter_layouts("Эйнштейн не мог говорить до рождения")
+        next(layouts)
+        assert not calls
+        next(layouts)
+        assert calls
+
+    def test_best_alternative_matches_exhaustive_search(self):
+        phrase = "Смешно тебе? А мне нет"
+        layouts = list(iter_layouts(phrase))
+        best = min(layout_score(grid) for grid, _ in layouts)
+        assert layout_score(layouts[1][0]) == best
+        assert layout_score(build_compact_grid(phrase, time_budget=1.0)[0]) == best
+
+    def test_empty_phrase(self):
+        assert list(iter_layouts("")) == [({}, [])]
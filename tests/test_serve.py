@@ -0,0 +1,230 @@
+import sys
+import os
+import asyncio
+import json
+import threading
+import time
+from urllib.parse import quote
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from cross_word.cross_words import build_grid, build_grid_from_tokens
+from cross_word.serve import (
+    MAX_LINE_SIZE,
+    HTTPError,
+    LayoutService,
+    read_request,
+    start_server,
+)
+from cross_word.utils import render_grid
+
+
+async def request(port, method, target, body=b""):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        f"{method} {target} HTTP/1.1\r\nHost: test\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), payload.decode("utf-8")
+
+
+async def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+def run_with_server(scenario, **service_options):
+    async def main():
+        service = LayoutService(**service_options)
+        server = await start_server(service, port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await scenario(service, port)
+        finally:
+            server.close()
+            await server.wait_closed()
+            service.shutdown()
+
+    return asyncio.run(main())
+
+
+class TestLayoutService:
+    """Tests for the asyncio HTTP layout service"""
+
+    def test_get_json_layout(self):
+        phrase = "Привет, мир!"
+
+        async def scenario(service, port):
+            return await request(port, "GET", f"/layout?phrase={quote(phrase)}")
+
+        status, body = run_with_server(scenario)
+        document = json.loads(body)
+        assert status == 200
+        assert document["tokens"] == ["ПРИВЕТ", ",", "МИР!"]
+        assert document["rendered"] == render_grid(build_grid(phrase)[0])
+
+    def test_post_text_layout(self):
+        phrase = "Живи здесь сейчас"
+
+        async def scenario(service, port):
+            plain = await request(port, "POST", "/layout?format=text", phrase.encode())
+            wrapped = await request(
+                port,
+                "POST",
+                "/layout?format=text",
+                json.dumps({"phrase": phrase}).encode(),
+            )
+            return plain, wrapped
+
+        plain, wrapped = run_with_server(scenario)
+        assert plain == wrapped == (200, render_grid(build_grid(phrase)[0]))
+
+    def test_errors(self):
+        async def scenario(service, port):
+            return [
+                await request(port, "GET", "/missing"),
+                await request(port, "GET", "/layout"),
+                await request(port, "DELETE", "/layout"),
+                await request(port, "GET", "/layout?phrase=a&format=xml"),
+            ]
+
+        statuses = [status for status, _ in run_with_server(scenario)]
+        assert statuses == [404, 400, 405, 400]
+
+    def test_coalesces_identical_requests(self):
+        calls = []
+        lock = threading.Lock()
+        release = threading.Event()
+
+        def slow_build(tokens):
+            with lock:
+                calls.append(tokens)
+            release.wait(5)
+            return build_grid_from_tokens(tokens)
+
+        async def scenario(service, port):
+            phrases = ["Лови момент жизни", "лови  МОМЕНТ жизни"] * 4
+            tasks = [
+                asyncio.create_task(
+                    request(port, "GET", f"/layout?phrase={quote(p)}&format=text")
+                )
+                for p in phrases
+            ]
+            await wait_until(lambda: service.coalesced == len(phrases) - 1)
+            release.set()
+            return await asyncio.gather(*tasks)
+
+        responses = run_with_server(scenario, build_function=slow_build)
+        assert len(calls) == 1
+        assert {response for response in responses} == {
+            (200, render_grid(build_grid("Лови момент жизни")[0]))
+        }
+
+    def test_rejects_when_overloaded(self):
+        release = threading.Event()
+
+        def slow_build(tokens):
+            release.wait(5)
+            return build_grid_from_tokens(tokens)
+
+        async def scenario(service, port):
+            tasks = [
+                asyncio.create_task(request(port, "GET", f"/layout?phrase=word{i}"))
+                for i in range(4)
+            ]
+            # Requests beyond max_pending are answered without waiting
+            await wait_until(lambda: sum(task.done() for task in tasks) == 2)
+            release.set()
+            return await asyncio.gather(*tasks)
+
+        responses = run_with_server(
+            scenario, build_function=slow_build, max_concurrency=1, max_pending=2
+        )
+        statuses = sorted(status for status, _ in responses)
+        assert statuses == [200, 200, 503, 503]
+
+    def test_cancelled_request_does_not_fail_shared_ones(self):
+        release = threading.Event()
+
+        def slow_build(tokens):
+            release.wait(5)
+            return build_grid_from_tokens(tokens)
+
+        async def main():
+            service = LayoutService(build_function=slow_build)
+            tokens = ["ЛОВИ", "МОМЕНТ", "ЖИЗНИ"]
+            try:
+                leader = asyncio.create_task(service.layout(tokens))
+                await wait_until(lambda: service.pending == 1)
+                follower = asyncio.create_task(service.layout(tokens))
+                await wait_until(lambda: service.coalesced == 1)
+
+                leader.cancel()
+                await asyncio.sleep(0)
+                release.set()
+                layout = await follower
+                assert leader.cancelled()
+                return layout, service.pending, service.computed
+            finally:
+                release.set()
+                service.shutdown()
+
+        layout, pending, computed = asyncio.run(main())
+        assert layout == build_grid_from_tokens(["ЛОВИ", "МОМЕНТ", "ЖИЗНИ"])
+        assert (pending, computed) == (0, 1)
+
+    def test_malformed_requests(self):
+        async def raw(port, data):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(data)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            head, _, payload = response.partition(b"\r\n\r\n")
+            return int(head.split()[1]), payload.decode("utf-8")
+
+        async def scenario(service, port):
+            return [
+                await raw(
+                    port,
+                    b"POST /layout HTTP/1.1\r\nContent-Length: -5\r\n\r\n",
+                ),
+                await raw(port, b"GET /health HTTP/1.1\r\nX: " + b"a" * 9000 + b"\r\n"),
+                await raw(port, b"GET /" + b"a" * 9000 + b" HTTP/1.1\r\n"),
+            ]
+
+        responses = run_with_server(scenario)
+        assert [status for status, _ in responses] == [400, 431, 414]
+        assert all("Error" not in body for _, body in responses)
+
+    def test_line_beyond_stream_limit(self):
+        async def read(data):
+            reader = asyncio.StreamReader(limit=MAX_LINE_SIZE * 2)
+            reader.feed_data(data)
+            reader.feed_eof()
+            try:
+                await read_request(reader)
+            except HTTPError as error:
+                return error.status
+
+        head = b"GET /health HTTP/1.1\r\nX: "
+        assert asyncio.run(read(head + b"a" * 40000)) == 431
+
+    def test_http_1_0_closes_by_default(self):
+        async def scenario(service, port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"GET /health HTTP/1.0\r\n\r\n")
+            await writer.drain()
+            # Without keep-alive the server closes, so read() returns
+            response = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+            return response
+
+        response = run_with_server(scenario)
+        assert b"Connection: close" in response and response.endswith(b"ok")
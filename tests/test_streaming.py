@@ -0,0 +1,115 @@
+import sys
+import os
+import io
+import tracemalloc
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from cross_word.cross_words import build_grid
+from cross_word.streaming import (
+    iter_band_lines,
+    iter_blocks,
+    iter_document_lines,
+    iter_merged_blocks,
+    write_document,
+)
+from cross_word.utils import (
+    get_grid_boundaries,
+    iter_tokens,
+    render_grid,
+    tokenize_with_end_punct,
+)
+
+TEXT = (
+    "Циферки — самое важное. Я крайне разочарован! Смешно тебе?А мне нет "
+    "слово  ! - -abc x—y ? Развлекаюсь, наблюдая за хаосом. Эйнштейн не мог "
+    "говорить до рождения"
+)
+
+
+def split(text, size):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+class TestStreaming:
+    """Tests for the bounded memory streaming pipeline"""
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+    def test_chunked_tokenizer(self, size):
+        assert list(iter_tokens(split(TEXT, size))) == tokenize_with_end_punct(TEXT)
+
+    def test_tokenizer_edge_cases(self):
+        assert list(iter_tokens([])) == []
+        assert list(iter_tokens(["   ", "", "\n"])) == []
+        assert list(iter_tokens(["мир", "  ", "\n", "!"])) == ["МИР!"]
+
+    def test_blocks_and_merge_match_build_grid(self):
+        text = TEXT * 3
+        grid, blocks = build_grid(text)
+        streamed = list(iter_blocks(iter_tokens(split(text, 5))))
+        assert streamed == blocks
+
+        placed = list(iter_merged_blocks(streamed))
+        merged = {}
+        for cells in placed:
+            merged.update(cells)
+        assert list(merged.items()) == list(grid.items())
+
+    @pytest.mark.parametrize("text", ["", "А", "Привет, мир!", TEXT])
+    def test_single_band_renders_like_render_grid(self, text):
+        lines = iter_document_lines(split(text, 4), max_width=None)
+        assert "\n".join(lines) == render_grid(build_grid(text)[0])
+
+    def test_bands_wrap_between_blocks(self):
+        text = TEXT * 3
+        placed = list(iter_merged_blocks(build_grid(text)[1]))
+        lines = list(iter_band_lines(placed, max_width=20))
+        bands = "\n".join(lines).split("\n\n")
+        assert len(bands) > 1
+
+        # Every band renders a run of whole blocks no wider than the limit
+        position = 0
+        for band in bands:
+            grid = {}
+            while position < len(placed) and render_grid(grid) != band:
+                grid.update(placed[position])
+                position += 1
+            assert render_grid(grid) == band
+            _, _, min_col, max_col = get_grid_boundaries(grid)
+            assert max_col - min_col < 20 or len(grid) == len(placed[position - 1])
+        assert position == len(placed)
+
+    def test_first_lines_before_input_is_read(self):
+        consumed = []
+
+        def chunks():
+            for chunk in split(TEXT * 50, 100):
+                consumed.append(chunk)
+                yield chunk
+
+        lines = iter_document_lines(chunks(), max_width=30)
+        next(lines)
+        assert len(consumed) < 5
+        list(lines)
+        assert len(consumed) == len(split(TEXT * 50, 100))
+
+    def test_memory_does_not_grow_with_document(self):
+        def peak(copies):
+            tracemalloc.start()
+            for _ in iter_document_lines((TEXT + " ") for _ in range(copies)):
+                pass
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return peak
+
+        assert peak(400) < peak(100) * 1.5
+
+    def test_write_document(self):
+        out = io.StringIO()
+        write_document(io.StringIO(TEXT), out, max_width=None, chunk_size=3)
+        assert out.getvalue() == render_grid(build_grid(TEXT)[0]) + "\n"
+
+    def test_invalid_width(self):
+        with pytest.raises(ValueError):
+            list(iter_band_lines([], max_width=0))